@@ -0,0 +1,132 @@
+"""Microbenchmark for the RX framer.
+
+Compares `PacketFramer` with the previous bytearray splitter on clean,
+noisy, 1-byte fragmented and frame-free input. The previous splitter
+dropped a trailing 0xAA at the end of a read, losing every frame whose
+prefix was split across reads (all of them when fed one byte at a time);
+the baseline here carries that one-line fix so both sides yield the same
+frames and the timings compare like with like.
+
+Usage: python benchmarks/bench_framer.py [--frames N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "kocom_wallpad"))
+
+from protocol import PACKET_LEN, PACKET_PREFIX, PacketFramer  # noqa: E402
+
+
+class LegacySplitter:
+    """The previous bytearray based `_split_buf` implementation (boundary fixed)."""
+
+    def __init__(self) -> None:
+        self._rx_buf = bytearray()
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        self._rx_buf.extend(chunk)
+        packets: list[bytes] = []
+        buf = self._rx_buf
+        while True:
+            start = buf.find(PACKET_PREFIX)
+            if start < 0:
+                # 원래 구현은 여기서 전부 비워 읽기 경계에 걸친 프리픽스를 잃었음
+                if buf and buf[-1] == PACKET_PREFIX[0]:
+                    del buf[:-1]
+                else:
+                    buf.clear()
+                break
+            if start > 0:
+                del buf[:start]
+            if len(buf) < PACKET_LEN:
+                break
+            candidate = bytes(buf[:PACKET_LEN])
+            if not candidate.endswith(b"\x0d\x0d"):
+                del buf[0]
+                continue
+            packets.append(candidate)
+            del buf[:PACKET_LEN]
+        return packets
+
+
+def make_frame(rng: random.Random) -> bytes:
+    body = bytes([0x30, 0xBC, 0x00, 0x0E, rng.randrange(1, 6), 0x01, 0x00, 0x00])
+    body += bytes(rng.choice((0x00, 0xFF)) for _ in range(8))
+    return PACKET_PREFIX + body + bytes([sum(body) % 256]) + b"\x0d\x0d"
+
+
+def make_streams(n: int) -> dict[str, list[bytes]]:
+    rng = random.Random(1)
+    frames = [make_frame(rng) for _ in range(n)]
+    clean = [b"".join(frames[i:i + 8]) for i in range(0, n, 8)]
+
+    noisy_parts: list[bytes] = []
+    for f in frames:
+        noisy_parts.append(bytes(rng.randrange(256) for _ in range(rng.randrange(0, 12))))
+        noisy_parts.append(f)
+    noisy_raw = b"".join(noisy_parts)
+    noisy = [noisy_raw[i:i + 256] for i in range(0, len(noisy_raw), 256)]
+
+    joined = b"".join(frames)
+    fragmented = [joined[i:i + 1] for i in range(len(joined))]
+
+    # 프리픽스가 반복되지만 서픽스가 없는 병적인 입력
+    garbage = [(PACKET_PREFIX * 2048)[:4000] for _ in range(max(1, n // 200))]
+    return {"clean": clean, "noisy": noisy, "fragmented": fragmented, "garbage": garbage}
+
+
+def time_legacy(chunks: list[bytes]) -> tuple[float, list[bytes]]:
+    legacy = LegacySplitter()
+    out: list[bytes] = []
+    t0 = time.perf_counter()
+    for c in chunks:
+        out.extend(legacy.feed(c))
+    return time.perf_counter() - t0, out
+
+
+def time_framer(chunks: list[bytes]) -> tuple[float, list[bytes]]:
+    framer = PacketFramer()
+    out: list[bytes] = []
+    t0 = time.perf_counter()
+    for c in chunks:
+        for view in framer.feed(c):
+            # 컨트롤러와 같은 조건: 내부 버퍼를 가리키는 프레임만 복사
+            out.append(view if type(view) is bytes else bytes(view))
+    return time.perf_counter() - t0, out
+
+
+def run(name: str, chunks: list[bytes], repeat: int) -> None:
+    # 번갈아 실행해 시간에 따른 기계 부하 변화가 한쪽에만 몰리지 않게 함
+    t_legacy = t_new = float("inf")
+    for _ in range(repeat):
+        t, legacy_frames = time_legacy(chunks)
+        t_legacy = min(t_legacy, t)
+        t, frames = time_framer(chunks)
+        t_new = min(t_new, t)
+    n_legacy, n_new = len(legacy_frames), len(frames)
+    assert frames == legacy_frames, (name, n_new, n_legacy)
+    nbytes = sum(len(c) for c in chunks)
+    print(
+        f"{name:<11} frames={n_new:<7} legacy_frames={n_legacy:<7} bytes={nbytes:<9} "
+        f"legacy={t_legacy * 1e3:8.2f}ms framer={t_new * 1e3:8.2f}ms "
+        f"x{t_legacy / t_new if t_new else float('inf'):.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for name, chunks in make_streams(args.frames).items():
+        run(name, chunks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
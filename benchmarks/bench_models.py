@@ -0,0 +1,123 @@
+"""Memory/throughput benchmark for DeviceKey/DeviceState.
+
+Replays a synthetic 24-hour bus capture (status frames for every room and
+device type at a fixed frame rate) and builds keys/states the way the
+controller handlers do, once with the previous dataclass models and once
+with the current ones.
+
+Usage: python benchmarks/bench_models.py [--hours 24] [--rate 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Tuple, Union
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.kocom_wallpad.const import DeviceType, SubType  # noqa: E402
+from custom_components.kocom_wallpad.models import DeviceKey, DeviceState  # noqa: E402
+
+
+@dataclass(frozen=True)
+class LegacyDeviceKey:
+    device_type: DeviceType
+    room_index: int
+    device_index: int
+    sub_type: SubType
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self.device_type.value}-{self.room_index}_{self.device_index}-{self.sub_type.value}"
+
+    @property
+    def key(self) -> Tuple[int, int, int, int]:
+        return (self.device_type.value, self.room_index, self.device_index, self.sub_type.value)
+
+
+@dataclass
+class LegacyDeviceState:
+    key: LegacyDeviceKey
+    platform: str
+    attribute: dict[str, Any]
+    state: Union[dict[str, Any], bool, int, float, str]
+
+
+# (device type, channels, sub types) per status frame
+BUS_MIX = [
+    (DeviceType.LIGHT, 8, (SubType.NONE,)),
+    (DeviceType.OUTLET, 8, (SubType.NONE,)),
+    (DeviceType.THERMOSTAT, 1, (SubType.NONE, SubType.HOTTEMP, SubType.HEATTEMP, SubType.ERRCODE)),
+    (DeviceType.VENTILATION, 1, (SubType.NONE, SubType.CO2, SubType.ERRCODE)),
+    (DeviceType.AIRQUALITY, 1, (SubType.PM10, SubType.PM25, SubType.CO2, SubType.VOC, SubType.TEMP, SubType.HUMIDITY)),
+]
+ROOMS = 6
+
+
+def capture(hours: float, rate: float):
+    """Yield (device type, room, channels, sub types) for every frame of the capture."""
+    n = int(hours * 3600 * rate)
+    i = 0
+    while i < n:
+        for room in range(ROOMS):
+            for dev_type, channels, subs in BUS_MIX:
+                if i >= n:
+                    return
+                yield dev_type, room, channels, subs
+                i += 1
+
+
+def replay(key_cls, state_cls, hours: float, rate: float, **state_kw) -> tuple[float, int, dict]:
+    registry: dict = {}
+    by_uid: dict = {}
+    t0 = time.perf_counter()
+    n_states = 0
+    for dev_type, room, channels, subs in capture(hours, rate):
+        for ch in range(channels):
+            for sub in subs:
+                key = key_cls(device_type=dev_type, room_index=room, device_index=ch, sub_type=sub)
+                dev = state_cls(key=key, platform="sensor", attribute={}, state=True, **state_kw)
+                registry[key.key] = dev
+                by_uid[key.unique_id] = dev
+                n_states += 1
+    return time.perf_counter() - t0, n_states, registry
+
+
+def retained_bytes(key_cls, state_cls, **state_kw) -> int:
+    tracemalloc.start()
+    snap0 = tracemalloc.take_snapshot()
+    registry: dict = {}
+    for dev_type, channels, subs in BUS_MIX:
+        for room in range(ROOMS):
+            for ch in range(channels):
+                for sub in subs:
+                    key = key_cls(device_type=dev_type, room_index=room, device_index=ch, sub_type=sub)
+                    registry[key.key] = state_cls(key=key, platform="sensor", attribute={}, state=True, **state_kw)
+    snap1 = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(s.size_diff for s in snap1.compare_to(snap0, "filename"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--rate", type=float, default=4.0, help="status frames per second")
+    args = parser.parse_args()
+
+    legacy_t, n, _ = replay(LegacyDeviceKey, LegacyDeviceState, args.hours, args.rate)
+    new_t, _, _ = replay(DeviceKey, DeviceState, args.hours, args.rate, packet=b"")
+    legacy_mem = retained_bytes(LegacyDeviceKey, LegacyDeviceState)
+    new_mem = retained_bytes(DeviceKey, DeviceState, packet=b"")
+
+    print(f"capture: {args.hours:g}h @ {args.rate:g} frames/s -> {n} device states")
+    print(f"legacy  : {legacy_t:7.2f}s  {n / legacy_t:10.0f} states/s  registry {legacy_mem / 1024:8.1f} KiB")
+    print(f"current : {new_t:7.2f}s  {n / new_t:10.0f} states/s  registry {new_mem / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Per-frame cost of matching confirmations with many outstanding waiters.
+
+Compares the previous linear `_pendings` list scan with the key-indexed
+pending table. Every frame is for a key with exactly one waiter whose
+predicate does not match, so nothing is removed and the waiter count stays
+constant during the run.
+
+Usage: python benchmarks/bench_pendings.py [--frames N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.kocom_wallpad.const import DeviceType, SubType  # noqa: E402
+from custom_components.kocom_wallpad.gateway import _PendingTable, _PendingWaiter  # noqa: E402
+from custom_components.kocom_wallpad.models import DeviceKey, DeviceState  # noqa: E402
+
+
+def legacy_notify(pendings: list[_PendingWaiter], dev: DeviceState) -> None:
+    hit = []
+    for p in pendings:
+        try:
+            if p.key.key == dev.key.key and p.predicate(dev):
+                hit.append(p)
+        except Exception:
+            continue
+    for p in hit:
+        if not p.future.done():
+            p.future.set_result(dev)
+        pendings.remove(p)
+
+
+def make_keys(n: int) -> list[DeviceKey]:
+    return [
+        DeviceKey(DeviceType.LIGHT, room, idx, SubType.NONE)
+        for room in range(n // 8 + 1)
+        for idx in range(8)
+    ][:n]
+
+
+async def run(n_waiters: int, n_frames: int) -> tuple[float, float]:
+    loop = asyncio.get_running_loop()
+    keys = make_keys(n_waiters)
+    states = [DeviceState(key=k, platform="light", attribute={}, state=False) for k in keys]
+
+    def never(_dev: DeviceState) -> bool:
+        return False
+
+    legacy = [_PendingWaiter(k, never, loop) for k in keys]
+    t0 = time.perf_counter()
+    for i in range(n_frames):
+        legacy_notify(legacy, states[i % n_waiters])
+    t_legacy = (time.perf_counter() - t0) / n_frames
+
+    table = _PendingTable()
+    for k in keys:
+        table.add(k, never, 60.0)
+    t0 = time.perf_counter()
+    for i in range(n_frames):
+        table.notify(states[i % n_waiters])
+    t_table = (time.perf_counter() - t0) / n_frames
+    for waiters in list(table._by_key.values()):
+        for w in list(waiters):
+            w.future.cancel()
+            table.discard(w)
+    table._arm(loop)
+    return t_legacy, t_table
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+    for n in (1, 10, 100, 500, 1000):
+        t_legacy, t_table = await run(n, args.frames)
+        print(f"waiters={n:<5} legacy={t_legacy * 1e6:8.2f}us/frame table={t_table * 1e6:6.2f}us/frame")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,215 @@
+"""Protocol codec: import time, round-trip checks and encode/decode throughput.
+
+Imports the `protocol` package on its own (no Home Assistant on the path is
+needed for that part) and compares its import time against the HA-side
+controller in fresh interpreters. Every encoder is then checked by decoding
+the frame it produced, and status frames built from random payloads are
+decoded back; any mismatch aborts with an AssertionError.
+
+Usage: python benchmarks/bench_protocol.py [--repeat 5] [--ops 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PKG_DIR = os.path.join(ROOT, "custom_components", "kocom_wallpad")
+sys.path.insert(0, PKG_DIR)
+
+import protocol  # noqa: E402
+from protocol import (  # noqa: E402
+    AIRCONDITIONER_FAN_MAP,
+    AIRCONDITIONER_HVAC_MAP,
+    CAPTURE_RX,
+    CAPTURE_TX,
+    DEVICE_TYPE_MAP,
+    VENTILATION_PRESET_MAP,
+    WALLPAD_CODE,
+    DeviceKey,
+    CaptureRing,
+    DeviceType,
+    PacketFrame,
+    PacketFramer,
+    SubType,
+    build_frame,
+    decode,
+    encode_command,
+    is_valid,
+    read_capture,
+)
+
+REV_DT_MAP = {v: k for k, v in DEVICE_TYPE_MAP.items()}
+
+_IMPORT_SNIPPET = """
+import sys, time
+sys.path[:0] = {paths!r}
+t0 = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t0
+print(dt, int(any(m == "homeassistant" or m.startswith("homeassistant.") for m in sys.modules)))
+"""
+
+
+def import_time(module: str, paths: list[str], repeat: int) -> tuple[float, bool]:
+    """Best-of-`repeat` cold import time in a fresh interpreter."""
+    best, uses_ha = float("inf"), False
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SNIPPET.format(paths=paths, module=module)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        best = min(best, float(out[0]))
+        uses_ha = out[1] == "1"
+    return best, uses_ha
+
+
+def key(dev_type: DeviceType, room: int = 0, index: int = 0) -> DeviceKey:
+    return DeviceKey(dev_type, room, index, SubType.NONE)
+
+
+def status_frame(dev_type: DeviceType, room: int, command: int, data: bytes) -> PacketFrame:
+    """A frame as the device sends it to the wallpad."""
+    raw = build_frame((WALLPAD_CODE, 0x00), (REV_DT_MAP[dev_type], room), command, data)
+    assert is_valid(raw)
+    return PacketFrame(raw)
+
+
+def check_round_trips(rnd: random.Random) -> int:
+    checks = 0
+
+    # 조명/콘센트: 명령 프레임과 상태 프레임 모두 채널이 그대로 돌아와야 함
+    for dev_type in (DeviceType.LIGHT, DeviceType.OUTLET):
+        for _ in range(200):
+            room = rnd.randrange(8)
+            channels = [rnd.random() < 0.5 for _ in range(8)]
+            raw = encode_command(key(dev_type, room), "turn_on", channels=channels)
+            frame = PacketFrame(raw)
+            assert is_valid(raw) and frame.peer == (REV_DT_MAP[dev_type], room)
+            assert decode(frame).channels == tuple(channels)
+            data = bytes(0xFF if on else 0x00 for on in channels)
+            assert decode(status_frame(dev_type, room, 0x00, data)).channels == tuple(channels)
+            checks += 2
+
+    thermostat = key(DeviceType.THERMOSTAT, 2)
+    for temp in range(5, 41):
+        status = decode(PacketFrame(encode_command(thermostat, "set_temperature", target_temp=temp)))
+        assert status.heating and status.target_temp == temp
+        checks += 1
+    assert not decode(PacketFrame(encode_command(thermostat, "set_hvac", hvac_mode="off"))).heating
+    assert decode(PacketFrame(encode_command(thermostat, "set_preset", preset_mode="away"))).away
+    checks += 2
+
+    aircon = key(DeviceType.AIRCONDITIONER, 1)
+    for mode in [*AIRCONDITIONER_HVAC_MAP.values(), "off"]:
+        assert decode(PacketFrame(encode_command(aircon, "set_hvac", hvac_mode=mode))).hvac_mode == mode
+        checks += 1
+    for fan in AIRCONDITIONER_FAN_MAP.values():
+        assert decode(PacketFrame(encode_command(aircon, "set_fan", fan_mode=fan))).fan_mode == fan
+        checks += 1
+    assert decode(PacketFrame(encode_command(aircon, "set_temperature", target_temp=24))).target_temp == 24
+    checks += 1
+
+    vent = key(DeviceType.VENTILATION)
+    for preset in VENTILATION_PRESET_MAP.values():
+        status = decode(PacketFrame(encode_command(vent, "set_preset", preset_mode=preset)))
+        assert status.on and status.preset_mode == preset
+        checks += 1
+    for speed in (0x00, 0x40, 0x80, 0xC0):
+        status = decode(PacketFrame(encode_command(vent, "set_percentage", speed=speed)))
+        assert status.speed == speed and status.on == (speed != 0)
+        checks += 1
+
+    # 가스 밸브는 잠금 명령(0x02)만 존재
+    assert decode(PacketFrame(encode_command(key(DeviceType.GASVALVE), "turn_off"))).open is False
+    checks += 1
+
+    # 엘리베이터 호출은 기기 -> 월패드 방향의 프레임
+    frame = PacketFrame(encode_command(key(DeviceType.ELEVATOR, 3), "turn_on"))
+    assert frame.peer == (REV_DT_MAP[DeviceType.ELEVATOR], 3) and frame.dev_type == DeviceType.ELEVATOR
+    checks += 1
+
+    # 조회 응답은 상태 프레임으로 정규화
+    for dev_type in REV_DT_MAP:
+        raw = encode_command(key(dev_type, 1), "query")
+        assert raw[9] == protocol.CMD_QUERY
+        reply = status_frame(dev_type, 1, protocol.CMD_QUERY, bytes(8))
+        assert reply.command == protocol.CMD_STATUS
+        checks += 1
+
+    for _ in range(500):
+        data = bytes(rnd.randrange(256) for _ in range(8))
+        status = decode(status_frame(DeviceType.AIRQUALITY, 0, 0x00, data))
+        assert (status.pm10, status.pm25, status.temperature, status.humidity) == (data[0], data[1], data[6], data[7])
+        assert status.co2 == int.from_bytes(data[2:4], "big") and status.voc == int.from_bytes(data[4:6], "big")
+        checks += 1
+
+    # 잡음 사이에 섞인 프레임이 프레이머를 거쳐 그대로 나와야 함
+    frames = [encode_command(key(DeviceType.LIGHT, r), "turn_on", channels=[True] * 8) for r in range(50)]
+    stream = b"".join(bytes(rnd.randrange(256) for _ in range(rnd.randrange(4))) + f for f in frames)
+    framer = PacketFramer()
+    out = [bytes(v) for i in range(0, len(stream), 7) for v in framer.feed(stream[i:i + 7])]
+    assert out == frames, (len(out), len(frames))
+    checks += 1
+
+    # 캡처 링: 가득 찬 뒤에도 최근 프레임만 시간 순서대로 남고 파일로 왕복되어야 함
+    ring = CaptureRing(32)
+    for i, f in enumerate(frames):
+        ring.add(CAPTURE_TX if i % 3 == 0 else CAPTURE_RX, memoryview(f), float(i))
+    _, records = read_capture(ring.to_bytes())
+    assert [r.raw for r in records] == frames[-32:]
+    assert [r.timestamp for r in records] == [float(i) for i in range(len(frames) - 32, len(frames))]
+    assert [r.direction for r in records] == [CAPTURE_TX if i % 3 == 0 else CAPTURE_RX for i in range(len(frames) - 32, len(frames))]
+    checks += 1
+    return checks
+
+
+def throughput(ops: int) -> tuple[float, float]:
+    frames = [
+        status_frame(DeviceType.THERMOSTAT, r % 8, 0x00, bytes([0x11, 0x00, 22, 45, 21, 50, 0, 0])).raw
+        for r in range(64)
+    ]
+    t0 = time.perf_counter()
+    for i in range(ops):
+        decode(PacketFrame(frames[i & 63]))
+    t_decode = time.perf_counter() - t0
+
+    keys = [key(DeviceType.THERMOSTAT, r) for r in range(8)]
+    t0 = time.perf_counter()
+    for i in range(ops):
+        encode_command(keys[i & 7], "set_temperature", target_temp=22)
+    t_encode = time.perf_counter() - t0
+    return ops / t_decode, ops / t_encode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ops", type=int, default=50000)
+    args = parser.parse_args()
+
+    t_proto, proto_ha = import_time("protocol", [PKG_DIR], args.repeat)
+    assert not proto_ha, "protocol pulled in homeassistant"
+    print(f"import protocol   {t_proto * 1000:8.2f} ms (homeassistant loaded: {proto_ha})")
+    try:
+        t_ctrl, _ = import_time("custom_components.kocom_wallpad.controller", [ROOT], args.repeat)
+    except subprocess.CalledProcessError:
+        print("import controller        n/a (homeassistant not installed)")
+    else:
+        print(f"import controller {t_ctrl * 1000:8.2f} ms x{t_ctrl / t_proto:.0f}")
+
+    checks = check_round_trips(random.Random(0))
+    print(f"round trips ok: {checks} checks")
+
+    dec, enc = throughput(args.ops)
+    print(f"decode {dec:10.0f} frames/s")
+    print(f"encode {enc:10.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
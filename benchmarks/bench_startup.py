@@ -0,0 +1,116 @@
+"""Startup restore time: per-entity restore data vs. the snapshot store.
+
+Builds a house with `--rooms` rooms of 8 lights, a thermostat per room and a
+few shared devices (200+ entities by default). The legacy path mirrors the
+previous `_async_put_entity_dispatch_packet` loop: decode the restore-state
+JSON, then for every entity re-parse its hex packet and replace the
+controller storage. The snapshot path is a real `Store` round trip followed
+by `async_get_entity_registry()` on a fresh gateway.
+
+Usage: python benchmarks/bench_startup.py [--rooms 24] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.kocom_wallpad.gateway import KocomGateway  # noqa: E402
+
+
+class _Entry:
+    entry_id = "bench"
+    data: dict = {}
+    options: dict = {}
+
+
+def frame(code: int, room: int, cmd: int, data: list[int]) -> bytes:
+    body = bytes([0x30, 0xBC, 0x00, 0x01, 0x00, code, room, cmd, *data])
+    return b"\xaa\x55" + body + bytes([sum(body) % 256]) + b"\x0d\x0d"
+
+
+def house(rooms: int) -> list[bytes]:
+    packets = []
+    for room in range(rooms):
+        packets.append(frame(0x0E, room, 0x00, [0xFF] * 8))
+        packets.append(frame(0x36, room, 0x00, [0x11, 0x00, 22, 45, 21, 50, 0, 0]))
+    packets.append(frame(0x48, 0, 0x00, [0x11, 0x01, 0x40, 0, 0x04, 0x00, 0, 0]))
+    packets.append(frame(0x2C, 0, 0x02, [0] * 8))
+    return packets
+
+
+def new_gateway(hass: HomeAssistant) -> KocomGateway:
+    return KocomGateway(hass, _Entry(), "bench", 0, discovery=False)
+
+
+def legacy_restore(gw: KocomGateway, restore_json: str) -> None:
+    states = json.loads(restore_json)
+    for item in states:
+        extra = item["extra_data"]
+        packet = extra.get("packet")
+        if not packet:
+            continue
+        gw._force_register_uids.add(item["uid"])
+        gw.controller._dispatch_packet(bytes.fromhex(packet))
+        gw._force_register_uids.discard(item["uid"])
+        gw.controller._device_storage = extra.get("device_storage", {})
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        source = new_gateway(hass)
+        for packet in house(args.rooms):
+            source.controller._dispatch_packet(packet)
+        devices = [dev for devs in source.registry.by_platform.values() for dev in devs.values()]
+
+        # 이전 방식: 엔티티마다 packet + device_storage 사본을 저장
+        restore_json = json.dumps([
+            {
+                "uid": dev.key.unique_id,
+                "extra_data": {
+                    "packet": dev.packet.hex(),
+                    "device_storage": source.controller._device_storage,
+                },
+            }
+            for dev in devices
+        ])
+        await source.snapshot.async_save(source._snapshot_data())
+        snapshot_path = os.path.join(config_dir, ".storage", "kocom_wallpad.bench.snapshot")
+
+        t_legacy = t_snapshot = 0.0
+        for _ in range(args.repeat):
+            gw = new_gateway(hass)
+            t0 = time.perf_counter()
+            legacy_restore(gw, restore_json)
+            t_legacy += time.perf_counter() - t0
+            assert len(gw.registry._states) == len(devices)
+
+            gw = new_gateway(hass)
+            t0 = time.perf_counter()
+            await gw.async_get_entity_registry()
+            t_snapshot += time.perf_counter() - t0
+            assert len(gw.registry._states) == len(devices)
+
+        print(f"entities={len(devices)} packets={len(source.controller.last_packets)}")
+        print(f"restore data: legacy={len(restore_json)} bytes snapshot={os.path.getsize(snapshot_path)} bytes")
+        print(f"legacy   {t_legacy / args.repeat * 1000:8.2f} ms")
+        print(f"snapshot {t_snapshot / args.repeat * 1000:8.2f} ms (including file read)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,419 @@
+"""End-to-end benchmark suite for the RX and TX hot paths, with baselines.
+
+Measures:
+
+- feed_<type>:     frames/s through `KocomController.feed` for every device
+                   type handler (duplicate-frame cache off, so every frame
+                   reaches the handler, the registry and the dispatcher)
+- feed_realistic:  frames/s for a poll-cycle mix (mostly repeated status,
+                   queries, some changes and a little noise) in TCP-sized reads
+- feed_fragmented: the same mix fed one byte at a time
+- feed_garbage:    MB/s of random bytes with no frames in them
+- upsert_changed / upsert_same: µs per `EntityRegistry.upsert`
+- encode:          `generate_command` calls/s over a mix of actions
+- rtt_idle / rtt_busy: command round trip (ms) through `_sender_loop` to the
+                   bus simulator and back, with a quiet bus and with the
+                   wallpad polling continuously
+- order:           not a metric; commands queued behind a busy device must
+                   reach the simulator in the order they were issued (the
+                   last one wins), otherwise the run aborts
+
+Results are saved with `--save FILE` and compared with `--compare FILE`;
+the comparison exits with status 1 if any metric regressed by more than
+`--threshold` percent.
+
+Usage: python benchmarks/bench_suite.py [--quick] [--only feed,encode,order]
+           [--save baseline.json] [--compare baseline.json] [--threshold 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+
+from homeassistant.components.climate.const import HVACMode  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.kocom_wallpad.gateway import KocomGateway  # noqa: E402
+from custom_components.kocom_wallpad.models import DeviceState  # noqa: E402
+from custom_components.kocom_wallpad.protocol import (  # noqa: E402
+    CMD_QUERY,
+    DEVICE_TYPE_MAP,
+    WALLPAD_CODE,
+    DeviceKey,
+    DeviceType,
+    SubType,
+    build_frame,
+)
+from simulator import BusSimulator, FaultConfig, HouseConfig  # noqa: E402
+
+REV_DT_MAP = {v: k for k, v in DEVICE_TYPE_MAP.items()}
+
+
+@dataclass
+class Result:
+    value: float
+    unit: str
+    higher_is_better: bool
+
+    def as_dict(self) -> dict:
+        return {"value": self.value, "unit": self.unit, "higher_is_better": self.higher_is_better}
+
+
+class _Entry:
+    entry_id = "bench"
+    data: dict = {}
+    options: dict = {}
+
+
+# 합성 프레임 ----------------------------------------------------------
+
+def _status(dev_type: DeviceType, room: int, command: int, data: bytes) -> bytes:
+    return build_frame((WALLPAD_CODE, 0x00), (REV_DT_MAP[dev_type], room), command, data)
+
+
+def synth_frames(dev_type: DeviceType, count: int, rnd: random.Random, rooms: int = 8) -> List[bytes]:
+    """Valid status frames for the handler of `dev_type` with varying payloads."""
+    out: List[bytes] = []
+    for i in range(count):
+        room = i % rooms
+        r = rnd.randrange
+        if dev_type in (DeviceType.LIGHT, DeviceType.OUTLET):
+            if dev_type == DeviceType.LIGHT and i % 16 == 15:
+                # 일괄 소등 스위치
+                out.append(_status(dev_type, 0xFF, 0x65 + (i // 16) % 2, bytes(8)))
+                continue
+            data = bytes(0xFF if r(2) else 0x00 for _ in range(8))
+            out.append(_status(dev_type, room, 0x00, data))
+        elif dev_type == DeviceType.THERMOSTAT:
+            data = bytes([0x11 if r(2) else 0x01, r(2), r(18, 30), r(30, 60), r(15, 30), r(30, 60), 0, 0])
+            out.append(_status(dev_type, room, 0x00, data))
+        elif dev_type == DeviceType.AIRCONDITIONER:
+            data = bytes([0x10 if r(2) else 0x00, r(4), r(1, 5), 0, r(20, 32), r(18, 30), 0, 0])
+            out.append(_status(dev_type, room, 0x00, data))
+        elif dev_type == DeviceType.VENTILATION:
+            data = bytes([0x11 if r(2) else 0x01, rnd.choice((1, 2, 3, 5, 9)), rnd.choice((0x40, 0x80, 0xC0)),
+                          0, r(4, 20), r(100), 0, 0])
+            out.append(_status(dev_type, 0, 0x00, data))
+        elif dev_type == DeviceType.GASVALVE:
+            out.append(_status(dev_type, 0, 0x01 + r(2), bytes(8)))
+        elif dev_type == DeviceType.ELEVATOR:
+            data = bytes([r(4), r(1, 30), 0, 0, 0, 0, 0, 0])
+            out.append(build_frame((WALLPAD_CODE, 0x00), (REV_DT_MAP[dev_type], 0), 0x01, data))
+        elif dev_type == DeviceType.MOTION:
+            out.append(_status(dev_type, room, rnd.choice((0x00, 0x04)), bytes(8)))
+        elif dev_type == DeviceType.AIRQUALITY:
+            data = bytes([r(1, 80), r(1, 50), 0x02, r(256), 0x00, r(1, 200), r(15, 30), r(20, 80)])
+            out.append(_status(dev_type, 0, 0x00, data))
+        else:
+            raise ValueError(f"No generator for {dev_type}")
+    return out
+
+
+def realistic_stream(cycles: int, rnd: random.Random, rooms: int = 8) -> bytes:
+    """Poll cycles: wallpad query + device status per device, ~2% changes, a little noise."""
+    state: Dict[tuple[DeviceType, int], bytes] = {}
+    devices = [(t, room) for room in range(rooms) for t in (DeviceType.LIGHT, DeviceType.OUTLET, DeviceType.THERMOSTAT)]
+    devices += [(DeviceType.VENTILATION, 0), (DeviceType.AIRQUALITY, 0), (DeviceType.GASVALVE, 0)]
+    for dev in devices:
+        state[dev] = synth_frames(dev[0], 1, rnd)[0]
+    out = bytearray()
+    for _ in range(cycles):
+        for dev_type, room in devices:
+            if rnd.random() < 0.02:
+                state[(dev_type, room)] = synth_frames(dev_type, 1, rnd)[0]
+            code = REV_DT_MAP[dev_type]
+            out += build_frame((code, room), (WALLPAD_CODE, 0x00), CMD_QUERY)
+            out += state[(dev_type, room)]
+            if rnd.random() < 0.01:
+                out += bytes(rnd.randrange(256) for _ in range(rnd.randint(1, 6)))
+    return bytes(out)
+
+
+def chunked(data: bytes, size: int) -> List[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+# 측정 ---------------------------------------------------------------
+
+def new_gateway(hass: HomeAssistant) -> KocomGateway:
+    return KocomGateway(hass, _Entry(), "bench", 0, discovery=False)
+
+
+def best_of(repeat: int, fn: Callable[[], float]) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def bench_feed(hass: HomeAssistant, chunks: List[bytes], repeat: int, frame_cache: bool = True) -> float:
+    """Seconds to feed `chunks` into a fresh controller (best of `repeat`)."""
+    def run() -> float:
+        controller = new_gateway(hass).controller
+        if not frame_cache:
+            controller.frame_cache.max_age = 0
+        t0 = time.perf_counter()
+        for chunk in chunks:
+            controller.feed(chunk)
+        return time.perf_counter() - t0
+    return best_of(repeat, run)
+
+
+def feed_results(hass: HomeAssistant, scale: int, repeat: int) -> Dict[str, Result]:
+    rnd = random.Random(1)
+    results: Dict[str, Result] = {}
+    for dev_type in DEVICE_TYPE_MAP.values():
+        frames = synth_frames(dev_type, 2000 * scale, rnd)
+        # 중복 프레임 캐시를 끄고 모든 프레임이 핸들러까지 가도록 함
+        dt = bench_feed(hass, chunked(b"".join(frames), 256), repeat, frame_cache=False)
+        results[f"feed_{dev_type.name.lower()}"] = Result(round(len(frames) / dt), "frames/s", True)
+
+    stream = realistic_stream(40 * scale, rnd)
+    frames = len(stream) // 21
+    dt = bench_feed(hass, chunked(stream, 64), repeat)
+    results["feed_realistic"] = Result(round(frames / dt), "frames/s", True)
+    dt = bench_feed(hass, chunked(stream[: len(stream) // 4], 1), repeat)
+    results["feed_fragmented"] = Result(round(frames / 4 / dt), "frames/s", True)
+
+    garbage = bytes(rnd.randrange(256) for _ in range(200_000 * scale)).replace(b"\xaa\x55", b"\x00\x55")
+    dt = bench_feed(hass, chunked(garbage, 256), repeat)
+    results["feed_garbage"] = Result(round(len(garbage) / dt / 1e6, 2), "MB/s", True)
+    return results
+
+
+def upsert_results(hass: HomeAssistant, scale: int, repeat: int) -> Dict[str, Result]:
+    gw = new_gateway(hass)
+    for frame in synth_frames(DeviceType.THERMOSTAT, 8, random.Random(2)):
+        gw.controller._dispatch_packet(frame)
+    climates = [d for d in gw.registry._states.values() if isinstance(d.state, dict)]
+    n = 20000 * scale
+    flip = [
+        [DeviceState(d.key, d.platform, d.attribute, {**d.state, "current_temp": t}) for d in climates]
+        for t in (20.0, 21.0)
+    ]
+    registry = gw.registry
+
+    def changed() -> float:
+        t0 = time.perf_counter()
+        for i in range(n):
+            states = flip[i & 1]
+            registry.upsert(states[i % len(states)])
+        return time.perf_counter() - t0
+
+    def same() -> float:
+        states = flip[0]
+        for dev in states:
+            registry.upsert(dev)
+        t0 = time.perf_counter()
+        for i in range(n):
+            registry.upsert(states[i % len(states)])
+        return time.perf_counter() - t0
+
+    return {
+        "upsert_changed": Result(round(best_of(repeat, changed) / n * 1e6, 3), "us/op", False),
+        "upsert_same": Result(round(best_of(repeat, same) / n * 1e6, 3), "us/op", False),
+    }
+
+
+def encode_results(hass: HomeAssistant, scale: int, repeat: int) -> Dict[str, Result]:
+    controller = new_gateway(hass).controller
+    key = lambda t, r=0, i=0: DeviceKey(t, r, i, SubType.NONE)  # noqa: E731
+    actions = [
+        (key(DeviceType.LIGHT, 1, 2), "turn_on", {}),
+        (key(DeviceType.OUTLET, 2, 0), "turn_off", {}),
+        (key(DeviceType.THERMOSTAT, 3), "set_temperature", {"target_temp": 23}),
+        (key(DeviceType.THERMOSTAT, 3), "set_hvac", {"hvac_mode": HVACMode.HEAT}),
+        (key(DeviceType.AIRCONDITIONER, 1), "set_fan", {"fan_mode": "high"}),
+        (key(DeviceType.VENTILATION), "set_preset", {"preset_mode": "sleep"}),
+        (key(DeviceType.GASVALVE), "turn_off", {}),
+        (key(DeviceType.LIGHT, 4), "query", {}),
+    ]
+    n = 20000 * scale
+
+    def run() -> float:
+        t0 = time.perf_counter()
+        for i in range(n):
+            k, action, kwargs = actions[i % len(actions)]
+            controller.generate_command(k, action, **kwargs)
+        return time.perf_counter() - t0
+
+    return {"encode": Result(round(n / best_of(repeat, run)), "calls/s", True)}
+
+
+async def _round_trips(hass: HomeAssistant, house: HouseConfig, commands: int) -> List[float]:
+    sim = BusSimulator(house, FaultConfig(delay=(0.03, 0.03)), seed=3)
+    sim.start()
+    port = await sim.start_tcp()
+    gw = KocomGateway(hass, _Entry(), "127.0.0.1", port, discovery=False)
+    await gw.async_start()
+    latencies: List[float] = []
+    try:
+        await gw.conn.wait_connected(5.0)
+        # 첫 폴링 주기가 끝날 때까지 (기기 등록 + 버스 타이밍 학습)
+        await asyncio.sleep(len(sim.devices) * (0.03 + house.poll_gap) + 0.5)
+        for i in range(commands):
+            key = DeviceKey(DeviceType.LIGHT, i % house.rooms, i % house.lights, SubType.NONE)
+            action = "turn_on" if (i // house.rooms) % 2 == 0 else "turn_off"
+            t0 = time.perf_counter()
+            ok = await gw.async_send_action(key, action, force=True)
+            if ok:
+                latencies.append(time.perf_counter() - t0)
+    finally:
+        await gw.async_stop()
+        await sim.close()
+    return latencies
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def rtt_results(hass: HomeAssistant, scale: int) -> Dict[str, Result]:
+    results: Dict[str, Result] = {}
+    commands = 10 * scale
+    cases = {
+        # 첫 폴링 이후 조용한 버스
+        "rtt_idle": HouseConfig(rooms=2, lights=4, outlets=0, cycle=3600.0),
+        # 월패드가 쉬지 않고 폴링하는 버스
+        "rtt_busy": HouseConfig(rooms=4, lights=4, outlets=2, cycle=1.0),
+    }
+    for name, house in cases.items():
+        latencies = await _round_trips(hass, house, commands)
+        if not latencies:
+            raise RuntimeError(f"{name}: no command was confirmed")
+        results[f"{name}_p50"] = Result(round(_percentile(latencies, 0.5) * 1000, 1), "ms", False)
+        results[f"{name}_p95"] = Result(round(_percentile(latencies, 0.95) * 1000, 1), "ms", False)
+    return results
+
+
+async def check_command_order(hass: HomeAssistant) -> Dict[str, Result]:
+    """Queue conflicting commands behind a busy device; the last one must win."""
+    house = HouseConfig(rooms=2, lights=4, outlets=0, thermostats=True, ventilation=False,
+                        airquality=False, cycle=1.0)
+    sim = BusSimulator(house, FaultConfig(delay=(0.05, 0.05)), seed=5)
+    sim.start()
+    port = await sim.start_tcp()
+    gw = KocomGateway(hass, _Entry(), "127.0.0.1", port, discovery=False)
+    await gw.async_start()
+    try:
+        await gw.conn.wait_connected(5.0)
+        await asyncio.sleep(len(sim.devices) * (0.05 + house.poll_gap) + 0.5)
+
+        async def burst(busy: tuple, calls: List[tuple]) -> None:
+            # 첫 명령이 확인을 기다리는 동안 나머지는 같은 기기 뒤에서 대기열에 쌓임
+            first = asyncio.create_task(gw.async_send_action(*busy[:2], force=True, **busy[2]))
+            await asyncio.sleep(0)
+            rest = [asyncio.create_task(gw.async_send_action(k, a, force=True, **kw)) for k, a, kw in calls]
+            await asyncio.gather(first, *rest)
+
+        light = DeviceKey(DeviceType.LIGHT, 1, 0, SubType.NONE)
+        other = DeviceKey(DeviceType.LIGHT, 1, 1, SubType.NONE)
+        await burst((other, "turn_on", {}), [
+            (light, "turn_on", {}), (light, "turn_off", {}), (light, "turn_on", {}),
+        ])
+        assert sim.device(DeviceType.LIGHT, 1).state[0] is True, "light: turn_on/off/on ended off"
+
+        thermostat = DeviceKey(DeviceType.THERMOSTAT, 0, 0, SubType.NONE)
+        await burst((thermostat, "set_temperature", {"target_temp": 23}), [
+            (thermostat, "set_hvac", {"hvac_mode": HVACMode.OFF}),
+            (thermostat, "set_temperature", {"target_temp": 24}),
+            (thermostat, "set_hvac", {"hvac_mode": HVACMode.OFF}),
+        ])
+        assert sim.device(DeviceType.THERMOSTAT, 0).heating is False, "thermostat: final off was overtaken"
+    finally:
+        await gw.async_stop()
+        await sim.close()
+    print("command order ok")
+    return {}
+
+
+# 기준선 -------------------------------------------------------------
+
+def compare(baseline: dict, current: Dict[str, Result], threshold: float) -> bool:
+    """Print a comparison table; return True if nothing regressed past `threshold` %."""
+    ok = True
+    old = baseline.get("results", {})
+    print(f"\n{'metric':<22}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, res in current.items():
+        if name not in old:
+            print(f"{name:<22}{'-':>14}{res.value:>14}{'new':>10}")
+            continue
+        before = old[name]["value"]
+        change = (res.value - before) / before * 100 if before else 0.0
+        worse = -change if res.higher_is_better else change
+        flag = ""
+        if worse > threshold:
+            flag, ok = " REGRESSION", False
+        print(f"{name:<22}{before:>14}{res.value:>14}{change:>+9.1f}%{flag}")
+    return ok
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, single repeat")
+    parser.add_argument("--only", default="feed,upsert,encode,rtt,order")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="FILE")
+    parser.add_argument("--compare", metavar="FILE")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    scale = 1 if args.quick else 3
+    repeat = 1 if args.quick else args.repeat
+    only = set(args.only.split(","))
+
+    sections: Dict[str, Callable[[HomeAssistant], Awaitable[Dict[str, Result]] | Dict[str, Result]]] = {
+        "feed": lambda hass: feed_results(hass, scale, repeat),
+        "upsert": lambda hass: upsert_results(hass, scale, repeat),
+        "encode": lambda hass: encode_results(hass, scale, repeat),
+        "rtt": lambda hass: rtt_results(hass, scale),
+        "order": check_command_order,
+    }
+    results: Dict[str, Result] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for name, section in sections.items():
+            if name not in only:
+                continue
+            out = section(hass)
+            if asyncio.iscoroutine(out):
+                out = await out
+            for metric, res in out.items():
+                print(f"{metric:<22}{res.value:>14} {res.unit}")
+            results.update(out)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "quick": args.quick,
+                },
+                "results": {k: v.as_dict() for k, v in results.items()},
+            }, fp, indent=2)
+        print(f"\nbaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        if not compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
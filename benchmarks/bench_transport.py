@@ -0,0 +1,124 @@
+"""CPU time / wakeup comparison of the RX paths.
+
+A local TCP server (in its own thread) emits status frames in bursts with
+quiet gaps, like the wallpad poll cycle. The client side runs either the
+previous `wait_for(reader.read(), 0.05)` polling loop or the protocol based
+AsyncConnection, and we count event loop iterations and the client thread's
+CPU time.
+
+Usage: python benchmarks/bench_transport.py [--seconds 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.kocom_wallpad.transport import AsyncConnection  # noqa: E402
+
+FRAME = bytes.fromhex("aa5530bc000100360100110016001500000000") + b"\x0d\x0d"
+FRAME = FRAME[:18] + bytes([sum(FRAME[2:18]) % 256]) + FRAME[19:]
+
+
+def stream(conn: socket.socket, stop: threading.Event) -> None:
+    with conn:
+        while not stop.is_set():
+            # 10 프레임 버스트 후 0.5초 조용함
+            for _ in range(10):
+                try:
+                    conn.sendall(FRAME)
+                except OSError:
+                    return
+                time.sleep(0.03)
+            time.sleep(0.5)
+
+
+def serve(sock: socket.socket, stop: threading.Event) -> None:
+    while not stop.is_set():
+        try:
+            conn, _ = sock.accept()
+        except OSError:
+            return
+        threading.Thread(target=stream, args=(conn, stop), daemon=True).start()
+
+
+class CountingLoop(asyncio.SelectorEventLoop):
+    iterations = 0
+
+    def _run_once(self) -> None:  # noqa: D401
+        self.iterations += 1
+        super()._run_once()
+
+
+async def legacy_client(port: int, seconds: float) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    received = 0
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        try:
+            chunk = await asyncio.wait_for(reader.read(512), timeout=0.05)
+        except asyncio.TimeoutError:
+            continue
+        received += len(chunk)
+    writer.close()
+    return received
+
+
+async def protocol_client(port: int, seconds: float) -> int:
+    received = 0
+
+    def on_data(chunk: bytes) -> None:
+        nonlocal received
+        received += len(chunk)
+
+    conn = AsyncConnection(host="127.0.0.1", port=port, on_data=on_data)
+    await conn.open()
+    await asyncio.sleep(seconds)
+    await conn.close()
+    return received
+
+
+def measure(name: str, factory, port: int, seconds: float) -> None:
+    loop = CountingLoop()
+    try:
+        t0 = time.thread_time()
+        received = loop.run_until_complete(factory(port, seconds))
+        cpu = time.thread_time() - t0
+    finally:
+        loop.close()
+    print(
+        f"{name:<9} rx={received:<7} wakeups={loop.iterations:<6} "
+        f"({loop.iterations / seconds:6.1f}/s) cpu={cpu * 1e3:7.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.listen(1)
+    stop = threading.Event()
+    thread = threading.Thread(target=serve, args=(sock, stop), daemon=True)
+    thread.start()
+    try:
+        measure("polling", legacy_client, port, args.seconds)
+        measure("protocol", protocol_client, port, args.seconds)
+    finally:
+        stop.set()
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
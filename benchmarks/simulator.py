@@ -0,0 +1,499 @@
+"""Local EW11 bridge + Kocom wallpad bus simulator.
+
+Stands in for the hardware so `KocomGateway` can be driven end to end. A
+simulated wallpad walks its device list on a fixed cycle, querying each
+device and letting it answer, the way the real wallpad fills the bus. Frames
+written by clients (i.e. commands built by `generate_command`) are applied
+to the simulated device, which acknowledges with its new status after a
+configurable delay. Everything on the bus is paced at the line rate and
+broadcast to every client, like an EW11 in TCP server mode.
+
+Clients connect over TCP (`--port`) and/or a pseudo terminal (`--serial`,
+prints the /dev/pts path to use as a serial device). Faults can be injected
+on the way to the clients: random garbage between frames, dropped frames,
+corrupted bytes, fragmented writes, and random reply delays; commands can
+be dropped before they reach a device.
+
+Only the `protocol` package is used, so Home Assistant is not needed to run
+the simulator itself.
+
+Usage: python benchmarks/simulator.py [--port 8899] [--serial] [--rooms 4]
+           [--noise 0.01] [--drop 0.01] [--corrupt 0.0] [--fragment]
+           [--delay 0.02:0.06] [--cycle 3.0] [--seed N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tty
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components", "kocom_wallpad"))
+
+from protocol import (  # noqa: E402
+    CMD_QUERY,
+    CMD_STATUS,
+    DEVICE_TYPE_MAP,
+    PACKET_LEN,
+    VENTILATION_PRESET_MAP,
+    WALLPAD_CODE,
+    DeviceType,
+    PacketFrame,
+    PacketFramer,
+    build_frame,
+    is_valid,
+)
+
+REV_DT_MAP = {v: k for k, v in DEVICE_TYPE_MAP.items()}
+REV_VENT_PRESET_MAP = {v: k for k, v in VENTILATION_PRESET_MAP.items()}
+
+
+@dataclass
+class FaultConfig:
+    """Faults applied between the bus and the clients."""
+    noise: float = 0.0       # 프레임 앞에 잡음 바이트를 끼워 넣을 확률
+    drop: float = 0.0        # 프레임(양방향)을 잃어버릴 확률
+    corrupt: float = 0.0     # 프레임의 한 바이트를 바꿀 확률 (체크섬 오류)
+    fragment: bool = False   # 프레임을 임의 크기로 쪼개서 전달
+    delay: tuple[float, float] = (0.02, 0.06)  # 기기 응답 지연 범위 (초)
+
+
+@dataclass
+class HouseConfig:
+    """Simulated devices and poll cycle."""
+    rooms: int = 4
+    lights: int = 4          # 방마다 조명 채널 수 (0: 없음)
+    outlets: int = 2         # 방마다 콘센트 채널 수 (0: 없음)
+    thermostats: bool = True
+    ventilation: bool = True
+    airquality: bool = True
+    cycle: float = 3.0       # 월패드 폴링 주기
+    poll_gap: float = 0.05   # 한 기기의 응답과 다음 조회 사이 간격
+    baud: int = 9600         # 0: 전송 시간 없이 바로 전달
+
+
+class SimDevice:
+    """A device on the bus; `status()` is the 8 data bytes it reports."""
+
+    dev_type: DeviceType = DeviceType.UNKNOWN
+
+    def __init__(self, room: int) -> None:
+        self.room = room
+        self.code = REV_DT_MAP[self.dev_type]
+
+    def status(self) -> bytes:
+        raise NotImplementedError
+
+    def apply(self, data: bytes) -> None:
+        """Apply a command payload from the wallpad side."""
+
+    def tick(self, rnd: random.Random) -> None:
+        """Advance sensor values by one poll cycle."""
+
+
+class SwitchBank(SimDevice):
+    """Light or outlet controller with up to 8 channels."""
+
+    def __init__(self, dev_type: DeviceType, room: int, channels: int) -> None:
+        self.dev_type = dev_type
+        super().__init__(room)
+        self.channels = channels
+        self.state = [False] * 8
+
+    def status(self) -> bytes:
+        return bytes(0xFF if on else 0x00 for on in self.state)
+
+    def apply(self, data: bytes) -> None:
+        # 없는 채널은 꺼진 채로 남음
+        self.state = [data[i] == 0xFF and i < self.channels for i in range(8)]
+
+
+class Thermostat(SimDevice):
+    dev_type = DeviceType.THERMOSTAT
+
+    def __init__(self, room: int) -> None:
+        super().__init__(room)
+        self.heating = False
+        self.away = False
+        self.target = 22
+        self.current = 20
+        self.hot_water = 45
+        self.heating_water = 40
+
+    def status(self) -> bytes:
+        return bytes([
+            0x11 if self.heating else 0x01, 0x01 if self.away else 0x00,
+            self.target, self.hot_water, self.current, self.heating_water, 0, 0,
+        ])
+
+    def apply(self, data: bytes) -> None:
+        self.heating = data[0] >> 4 == 0x01
+        self.away = data[1] & 0x0F == 0x01
+        if data[2]:
+            self.target = data[2]
+
+    def tick(self, rnd: random.Random) -> None:
+        goal = self.target if self.heating else 18
+        if self.current != goal and rnd.random() < 0.3:
+            self.current += 1 if goal > self.current else -1
+
+
+class Ventilation(SimDevice):
+    dev_type = DeviceType.VENTILATION
+
+    def __init__(self, room: int = 0) -> None:
+        super().__init__(room)
+        self.on = False
+        self.preset = REV_VENT_PRESET_MAP["ventilation"]
+        self.speed = 0x40
+        self.co2 = 450
+
+    def status(self) -> bytes:
+        return bytes([
+            0x11 if self.on else 0x01, self.preset, self.speed if self.on else 0x00, 0,
+            self.co2 // 100, self.co2 % 100, 0, 0,
+        ])
+
+    def apply(self, data: bytes) -> None:
+        # 0 인 필드는 "변경 없음" (끌 때는 전부 0)
+        self.on = data[0] >> 4 == 0x01
+        if data[1]:
+            self.preset = data[1]
+        if data[2]:
+            self.speed = data[2]
+
+    def tick(self, rnd: random.Random) -> None:
+        self.co2 = max(400, min(2000, self.co2 + rnd.randint(-20, 20)))
+
+
+class AirQuality(SimDevice):
+    dev_type = DeviceType.AIRQUALITY
+
+    def __init__(self, room: int = 0) -> None:
+        super().__init__(room)
+        self.values = [12, 8, 600, 150, 23, 45]  # pm10, pm2.5, co2, voc, 온도, 습도
+
+    def status(self) -> bytes:
+        pm10, pm25, co2, voc, temp, hum = self.values
+        return bytes([pm10, pm25, *co2.to_bytes(2, "big"), *voc.to_bytes(2, "big"), temp, hum])
+
+    def tick(self, rnd: random.Random) -> None:
+        limits = (255, 255, 5000, 5000, 40, 100)
+        self.values = [max(1, min(hi, v + rnd.randint(-2, 2))) for v, hi in zip(self.values, limits)]
+
+
+def build_house(cfg: HouseConfig) -> List[SimDevice]:
+    devices: List[SimDevice] = []
+    for room in range(cfg.rooms):
+        if cfg.lights:
+            devices.append(SwitchBank(DeviceType.LIGHT, room, cfg.lights))
+        if cfg.outlets:
+            devices.append(SwitchBank(DeviceType.OUTLET, room, cfg.outlets))
+        if cfg.thermostats:
+            devices.append(Thermostat(room))
+    if cfg.ventilation:
+        devices.append(Ventilation())
+    if cfg.airquality:
+        devices.append(AirQuality())
+    return devices
+
+
+@dataclass
+class SimStats:
+    frames_out: int = 0
+    frames_dropped: int = 0
+    frames_corrupted: int = 0
+    noise_bytes: int = 0
+    commands: int = 0
+    commands_dropped: int = 0
+    queries: int = 0
+    bad_frames: int = 0
+    unknown: int = 0
+    # 명령 수신부터 응답 프레임이 버스에 실릴 때까지 (초)
+    ack_latency: List[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        lat = sorted(self.ack_latency)
+        out = {k: v for k, v in self.__dict__.items() if k != "ack_latency"}
+        if lat:
+            out["ack_ms_p50"] = round(lat[len(lat) // 2] * 1000, 1)
+            out["ack_ms_max"] = round(lat[-1] * 1000, 1)
+        return out
+
+
+class _Client:
+    """One bridge client; `write` sends bus bytes to it."""
+
+    __slots__ = ("write", "framer", "name")
+
+    def __init__(self, write: Callable[[bytes], None], name: str) -> None:
+        self.write = write
+        self.framer = PacketFramer()
+        self.name = name
+
+
+class BusSimulator:
+    """Simulated wallpad bus behind an EW11-like bridge."""
+
+    def __init__(
+        self,
+        house: Optional[HouseConfig] = None,
+        faults: Optional[FaultConfig] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.house = house or HouseConfig()
+        self.faults = faults or FaultConfig()
+        self.rnd = random.Random(seed)
+        self.devices = build_house(self.house)
+        self._by_peer = {(d.code, d.room): d for d in self.devices}
+        self.stats = SimStats()
+        self._clients: list[_Client] = []
+        self._bus: asyncio.Queue[tuple[bytes, Optional[_Client]]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._acks: set[asyncio.Task] = set()
+        self._servers: list[asyncio.AbstractServer] = []
+        self._ptys: list[tuple[int, int]] = []
+        self._frame_sec = PACKET_LEN * 10 / self.house.baud if self.house.baud else 0.0
+
+    def device(self, dev_type: DeviceType, room: int = 0) -> Optional[SimDevice]:
+        return self._by_peer.get((REV_DT_MAP[dev_type], room))
+
+    # 버스 --------------------------------------------------------------
+
+    def _put(self, frame: bytes, source: Optional[_Client] = None) -> None:
+        self._bus.put_nowait((frame, source))
+
+    def _deliver(self, client: _Client, frame: bytes) -> None:
+        faults, rnd = self.faults, self.rnd
+        if faults.drop and rnd.random() < faults.drop:
+            self.stats.frames_dropped += 1
+            return
+        out = bytearray()
+        if faults.noise and rnd.random() < faults.noise:
+            n = rnd.randint(1, 8)
+            out += bytes(rnd.randrange(256) for _ in range(n))
+            self.stats.noise_bytes += n
+        start = len(out)
+        out += frame
+        if faults.corrupt and rnd.random() < faults.corrupt:
+            i = start + rnd.randrange(2, 18)
+            out[i] ^= 1 << rnd.randrange(8)
+            self.stats.frames_corrupted += 1
+        if faults.fragment:
+            pos = 0
+            while pos < len(out):
+                n = rnd.randint(1, 8)
+                client.write(bytes(out[pos:pos + n]))
+                pos += n
+        else:
+            client.write(bytes(out))
+
+    async def _bus_writer(self) -> None:
+        while True:
+            frame, source = await self._bus.get()
+            if self._frame_sec:
+                await asyncio.sleep(self._frame_sec)
+            self.stats.frames_out += 1
+            for client in tuple(self._clients):
+                if client is not source:
+                    self._deliver(client, frame)
+
+    async def _poll_loop(self) -> None:
+        """Wallpad side: query every device once per cycle."""
+        while True:
+            started = time.monotonic()
+            for dev in self.devices:
+                dev.tick(self.rnd)
+                self._put(build_frame((dev.code, dev.room), (WALLPAD_CODE, 0x00), CMD_QUERY))
+                await asyncio.sleep(self._reply_delay())
+                self._put(self._status_frame(dev, CMD_QUERY))
+                await asyncio.sleep(self.house.poll_gap)
+            await asyncio.sleep(max(0.0, self.house.cycle - (time.monotonic() - started)))
+
+    def _reply_delay(self) -> float:
+        lo, hi = self.faults.delay
+        return self.rnd.uniform(lo, hi)
+
+    @staticmethod
+    def _status_frame(dev: SimDevice, command: int = CMD_STATUS) -> bytes:
+        return build_frame((WALLPAD_CODE, 0x00), (dev.code, dev.room), command, dev.status())
+
+    # 클라이언트 -> 버스 -------------------------------------------------
+
+    def _on_client_data(self, client: _Client, data: bytes) -> None:
+        for view in client.framer.feed(data):
+            raw = bytes(view)
+            if not is_valid(raw):
+                self.stats.bad_frames += 1
+                continue
+            self._put(raw, client)
+            self._on_command(raw)
+
+    def _on_command(self, raw: bytes) -> None:
+        if raw[7] != WALLPAD_CODE:
+            # 월패드가 보낸 형식이 아님 (예: 엘리베이터 호출) - 버스에만 실음
+            self.stats.unknown += 1
+            return
+        frame = PacketFrame(raw)
+        dev = self._by_peer.get(frame.peer)
+        if dev is None:
+            self.stats.unknown += 1
+            return
+        if self.faults.drop and self.rnd.random() < self.faults.drop:
+            self.stats.commands_dropped += 1
+            return
+        if frame.command == CMD_QUERY:
+            self.stats.queries += 1
+            reply_cmd = CMD_QUERY
+        else:
+            self.stats.commands += 1
+            dev.apply(frame.payload)
+            reply_cmd = CMD_STATUS
+        received = time.monotonic()
+        task = asyncio.ensure_future(self._ack(dev, reply_cmd, received))
+        self._acks.add(task)
+        task.add_done_callback(self._acks.discard)
+
+    async def _ack(self, dev: SimDevice, command: int, received: float) -> None:
+        await asyncio.sleep(self._reply_delay())
+        self._put(self._status_frame(dev, command))
+        if command == CMD_STATUS:
+            self.stats.ack_latency.append(time.monotonic() - received)
+
+    # 연결 -------------------------------------------------------------
+
+    async def _serve_tcp_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer.write, str(writer.get_extra_info("peername")))
+        self._clients.append(client)
+        try:
+            while data := await reader.read(1024):
+                self._on_client_data(client, data)
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.remove(client)
+            writer.close()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen for bridge clients; returns the bound port."""
+        server = await asyncio.start_server(self._serve_tcp_client, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    def start_pty(self) -> str:
+        """Attach a pseudo terminal to the bus; returns the serial device path."""
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        loop = asyncio.get_running_loop()
+
+        def write(data: bytes) -> None:
+            try:
+                os.write(master, data)
+            except (BlockingIOError, OSError):
+                # 상대가 읽지 않으면 버림 (실제 시리얼도 마찬가지)
+                self.stats.frames_dropped += 1
+
+        client = _Client(write, os.ttyname(slave))
+        self._clients.append(client)
+
+        def on_readable() -> None:
+            try:
+                data = os.read(master, 1024)
+            except OSError:
+                return
+            self._on_client_data(client, data)
+
+        loop.add_reader(master, on_readable)
+        # slave 를 열어 두어야 클라이언트가 없을 때도 master 가 EIO 로 끊기지 않음
+        self._ptys.append((master, slave))
+        return client.name
+
+    def start(self) -> None:
+        """Start the wallpad poll cycle and the bus."""
+        self._tasks.append(asyncio.ensure_future(self._bus_writer()))
+        self._tasks.append(asyncio.ensure_future(self._poll_loop()))
+
+    async def close(self) -> None:
+        tasks = [*self._tasks, *self._acks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        loop = asyncio.get_running_loop()
+        for master, slave in self._ptys:
+            loop.remove_reader(master)
+            os.close(master)
+            os.close(slave)
+        self._ptys.clear()
+
+
+def _delay_range(text: str) -> tuple[float, float]:
+    lo, _, hi = text.partition(":")
+    return float(lo), float(hi or lo)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899, help="TCP port (-1: no TCP server)")
+    parser.add_argument("--serial", action="store_true", help="also expose the bus on a pty")
+    parser.add_argument("--rooms", type=int, default=4)
+    parser.add_argument("--lights", type=int, default=4)
+    parser.add_argument("--outlets", type=int, default=2)
+    parser.add_argument("--no-thermostats", action="store_true")
+    parser.add_argument("--no-ventilation", action="store_true")
+    parser.add_argument("--no-airquality", action="store_true")
+    parser.add_argument("--cycle", type=float, default=3.0)
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--drop", type=float, default=0.0)
+    parser.add_argument("--corrupt", type=float, default=0.0)
+    parser.add_argument("--fragment", action="store_true")
+    parser.add_argument("--delay", type=_delay_range, default=(0.02, 0.06), help="MIN:MAX seconds")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--stats", type=float, default=10.0, help="stats interval (0: off)")
+    args = parser.parse_args()
+
+    sim = BusSimulator(
+        HouseConfig(
+            rooms=args.rooms, lights=args.lights, outlets=args.outlets,
+            thermostats=not args.no_thermostats, ventilation=not args.no_ventilation,
+            airquality=not args.no_airquality, cycle=args.cycle, baud=args.baud,
+        ),
+        FaultConfig(
+            noise=args.noise, drop=args.drop, corrupt=args.corrupt,
+            fragment=args.fragment, delay=args.delay,
+        ),
+        seed=args.seed,
+    )
+    sim.start()
+    if args.port >= 0:
+        port = await sim.start_tcp(args.host, args.port)
+        print(f"EW11 simulator listening on {args.host}:{port}")
+    if args.serial:
+        print(f"serial bus on {sim.start_pty()}")
+    print(f"{len(sim.devices)} devices, poll cycle {args.cycle}s")
+    try:
+        while True:
+            await asyncio.sleep(args.stats or 3600)
+            if args.stats:
+                print(sim.stats.as_dict())
+    finally:
+        await sim.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -6,8 +6,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_STOP
 
-from .const import DOMAIN, PLATFORMS
+from .const import DOMAIN, PLATFORMS, CONF_OPTIMISTIC, CONF_DISCOVERY, CONF_INSTRUMENTATION
 from .gateway import KocomGateway
+from .services import async_setup_services, async_unload_services
+from .snapshot import SnapshotStore
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -15,23 +17,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host: str = entry.data[CONF_HOST]
     port: int = entry.data[CONF_PORT]
 
-    gateway = KocomGateway(hass, entry, host=host, port=port)
+    gateway = KocomGateway(
+        hass, entry, host=host, port=port,
+        optimistic=entry.options.get(CONF_OPTIMISTIC, False),
+        discovery=entry.options.get(CONF_DISCOVERY, True),
+        instrumentation=entry.options.get(CONF_INSTRUMENTATION, False),
+    )
     await gateway.async_get_entity_registry()
     await gateway.async_start()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = gateway
+    async_setup_services(hass)
 
     entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, gateway.async_stop)
     )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         gateway: KocomGateway = hass.data[DOMAIN].pop(entry.entry_id)
         await gateway.async_stop()
+        async_unload_services(hass)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot with the entry."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
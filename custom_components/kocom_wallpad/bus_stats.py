@@ -0,0 +1,64 @@
+"""Bus utilization and health counters for Kocom Wallpad."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from .const import BUS_STATS_MIN_INTERVAL_SEC
+
+# 누적 카운터 (게이트웨이/컨트롤러가 직접 증가시킴)
+COUNTERS = (
+    "rx_bytes",
+    "rx_frames",
+    "tx_bytes",
+    "tx_frames",
+    "checksum_errors",
+    "unknown_codes",
+    "tx_retries",
+)
+
+
+class BusStats:
+    """Cumulative bus counters with rate-limited snapshots.
+
+    The hot path only does integer increments. Rates are worked out in
+    `snapshot()`, which reuses its last result for `min_interval` seconds so
+    any number of sensors polled in the same cycle share one computation.
+    """
+
+    __slots__ = (*COUNTERS, "min_interval", "_taken", "_prev", "_cached")
+
+    def __init__(self, min_interval: float = BUS_STATS_MIN_INTERVAL_SEC) -> None:
+        """Initialize the counters."""
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.min_interval = min_interval
+        self._taken = time.monotonic()
+        self._prev = (0, 0)  # 직전 스냅샷의 (rx_bytes, rx_frames)
+        self._cached: dict[str, Any] | None = None
+
+    def snapshot(self, now: float | None = None, **totals: int) -> dict[str, Any]:
+        """Counters plus RX rates since the previous snapshot.
+
+        `totals` carries counters owned elsewhere (framer resync drops,
+        reconnects) so they are reported alongside.
+        """
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self._taken
+        if self._cached is not None and elapsed < self.min_interval:
+            return self._cached
+        rx_bytes, rx_frames = self.rx_bytes, self.rx_frames
+        prev_bytes, prev_frames = self._prev
+        data: dict[str, Any] = {name: getattr(self, name) for name in COUNTERS}
+        data.update(totals)
+        if elapsed > 0:
+            data["rx_bytes_per_s"] = round((rx_bytes - prev_bytes) / elapsed, 1)
+            data["rx_frames_per_s"] = round((rx_frames - prev_frames) / elapsed, 2)
+        else:
+            data["rx_bytes_per_s"] = data["rx_frames_per_s"] = 0.0
+        self._taken = now
+        self._prev = (rx_bytes, rx_frames)
+        self._cached = data
+        return data
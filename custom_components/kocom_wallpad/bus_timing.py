@@ -0,0 +1,140 @@
+"""Bus timing model for Kocom Wallpad."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    IDLE_GAP_SEC,
+    BUS_MIN_GAP_SEC,
+    BUS_FRAME_SEC,
+    BUS_PREDICT_HORIZON_SEC,
+)
+
+_ALPHA = 0.125      # EWMA 가중치
+_EXCHANGE_SEC = 0.5  # 같은 peer 의 프레임이 이보다 가까우면 한 번의 요청/응답으로 봄
+_MIN_SAMPLES = 3     # 예측에 쓰기 전 필요한 주기 샘플 수
+_GUARD_SEC = 0.02
+
+
+class _PeerTiming:
+
+    __slots__ = ("last_start", "last_seen", "period", "jitter", "span", "samples")
+
+    def __init__(self, now: float) -> None:
+        self.last_start = now
+        self.last_seen = now
+        self.period = 0.0
+        self.jitter = 0.0
+        self.span = 0.0  # 요청~응답 한 번이 차지하는 시간 EWMA
+        self.samples = 0
+
+    def observe(self, now: float) -> None:
+        if now - self.last_seen < _EXCHANGE_SEC:
+            self.last_seen = now
+            return
+        span = self.last_seen - self.last_start
+        self.span = span if self.samples == 0 else self.span + _ALPHA * (span - self.span)
+        interval = now - self.last_start
+        if self.samples == 0:
+            self.period = interval
+        else:
+            err = interval - self.period
+            self.period += _ALPHA * err
+            self.jitter += _ALPHA * (abs(err) - self.jitter)
+        self.samples += 1
+        self.last_start = now
+        self.last_seen = now
+
+    def next_arrival(self, now: float) -> float | None:
+        if self.samples < _MIN_SAMPLES or self.period <= 0:
+            return None
+        t = self.last_start + self.period
+        if t < now - self.jitter:
+            # 놓친 주기는 건너뛰고 다음 주기로
+            missed = int((now - t) / self.period) + 1
+            t += missed * self.period
+        return t
+
+
+class BusTimingModel:
+    """Learns inter-frame gaps and per-peer poll periods from the RX stream.
+
+    The wallpad polls its devices in a fixed cycle; once a peer's period is
+    known, the model predicts when it will talk next so TX can be placed in
+    the quiet window between two predicted exchanges.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the model."""
+        self._peers: dict[tuple[int, int], _PeerTiming] = {}
+        self._last_rx: float | None = None
+        self.burst_gap = 0.0  # 버스트 안의 프레임 간격 EWMA
+        self.frames = 0
+
+    def observe(self, code: int, room: int, now: float) -> None:
+        """Record one received frame."""
+        self.frames += 1
+        last = self._last_rx
+        self._last_rx = now
+        if last is not None:
+            gap = now - last
+            if 0 < gap < IDLE_GAP_SEC:
+                if self.burst_gap == 0.0:
+                    self.burst_gap = gap
+                else:
+                    self.burst_gap += _ALPHA * (gap - self.burst_gap)
+        peer = self._peers.get((code, room))
+        if peer is None:
+            self._peers[(code, room)] = _PeerTiming(now)
+        else:
+            peer.observe(now)
+
+    def last_seen(self, code: int, room: int) -> float | None:
+        """Monotonic time of the last frame from a peer, None if never seen."""
+        peer = self._peers.get((code, room))
+        return None if peer is None else peer.last_seen
+
+    def quiet_gap(self) -> float:
+        """Line silence that marks the end of a burst."""
+        if self.burst_gap == 0.0:
+            return IDLE_GAP_SEC
+        return min(IDLE_GAP_SEC, max(BUS_MIN_GAP_SEC, 2 * self.burst_gap + BUS_FRAME_SEC))
+
+    def next_free_slot(self, now: float, duration: float = BUS_FRAME_SEC) -> float:
+        """Earliest time >= now at which `duration` of TX fits between predicted frames."""
+        horizon = now + BUS_PREDICT_HORIZON_SEC
+        arrivals = []
+        for peer in self._peers.values():
+            t = peer.next_arrival(now)
+            if t is not None and t < horizon:
+                arrivals.append((
+                    t - peer.jitter - _GUARD_SEC,
+                    t + peer.span + peer.jitter + BUS_FRAME_SEC + _GUARD_SEC,
+                ))
+        if not arrivals:
+            return now
+        arrivals.sort()
+        slot = now
+        for busy_from, busy_until in arrivals:
+            if slot + duration <= busy_from:
+                break
+            if busy_until > slot:
+                slot = busy_until
+        return min(slot, horizon)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "burst_gap_ms": round(self.burst_gap * 1000, 1),
+            "quiet_gap_ms": round(self.quiet_gap() * 1000, 1),
+            "peers": {
+                f"{code:02x}:{room:02x}": {
+                    "period_s": round(p.period, 3),
+                    "jitter_ms": round(p.jitter * 1000, 1),
+                    "span_ms": round(p.span * 1000, 1),
+                    "samples": p.samples,
+                }
+                for (code, room), p in sorted(self._peers.items())
+            },
+        }
@@ -55,6 +55,7 @@ class KocomClimate(KocomBaseEntity, ClimateEntity):
     """Representation of a Kocom climate."""
     
     _enable_turn_on_off_backwards_compatibility = False
+    _passive_attributes = frozenset({"temp_step", "feature_fan", "feature_preset"})
 
     _attr_min_temp = 5
     _attr_max_temp = 40
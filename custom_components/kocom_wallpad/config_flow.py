@@ -5,10 +5,11 @@ from __future__ import annotations
 from typing import Any
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import callback
 
-from .const import DOMAIN, DEFAULT_TCP_PORT
+from .const import DOMAIN, DEFAULT_TCP_PORT, CONF_OPTIMISTIC, CONF_DISCOVERY, CONF_INSTRUMENTATION
 
 
 class KocomConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -16,6 +17,12 @@ class KocomConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> KocomOptionsFlow:
+        """Get the options flow for this handler."""
+        return KocomOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -45,3 +52,30 @@ class KocomConfigFlow(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=schema, errors=errors
         )
+
+
+class KocomOptionsFlow(OptionsFlow):
+    """Options flow for Kocom Wallpad."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        schema = vol.Schema({
+            vol.Required(
+                CONF_OPTIMISTIC,
+                default=self.config_entry.options.get(CONF_OPTIMISTIC, False),
+            ): bool,
+            vol.Required(
+                CONF_DISCOVERY,
+                default=self.config_entry.options.get(CONF_DISCOVERY, True),
+            ): bool,
+            vol.Required(
+                CONF_INSTRUMENTATION,
+                default=self.config_entry.options.get(CONF_INSTRUMENTATION, False),
+            ): bool,
+        })
+        return self.async_show_form(step_id="init", data_schema=schema)
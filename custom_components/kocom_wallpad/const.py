@@ -6,6 +6,16 @@ import logging
 from enum import IntEnum
 from homeassistant.const import Platform
 
+from .protocol.const import (  # noqa: F401
+    PACKET_PREFIX,
+    PACKET_SUFFIX,
+    PACKET_LEN,
+    CMD_QUERY,
+    DUP_FRAME_MAX_AGE,
+    DeviceType,
+    SubType,
+)
+
 LOGGER = logging.getLogger(__package__)
 
 DOMAIN = "kocom_wallpad"
@@ -18,44 +28,40 @@ PLATFORMS = [
     Platform.BINARY_SENSOR,
 ]
 
-PACKET_PREFIX = bytes([0xAA, 0x55])
-PACKET_SUFFIX = bytes([0x0D, 0x0D])
-PACKET_LEN = 21
-
 DEFAULT_TCP_PORT = 8899
-RECV_POLL_SEC = 0.05  # 50ms polling
+CONF_OPTIMISTIC = "optimistic"
+CONF_DISCOVERY = "discovery"
+CONF_INSTRUMENTATION = "instrumentation"
+EVENT_COMMAND_FAILED = f"{DOMAIN}_command_failed"
+SERVICE_DUMP_CAPTURE = "dump_capture"
+ATTR_FILENAME = "filename"
+CAPTURE_DIR = DOMAIN  # 캡처 파일을 저장할 설정 디렉터리 하위 폴더
+
 IDLE_GAP_SEC = 0.20   # 보내기 전 라인 유휴로 보고 싶은 최소 간격
+BUS_MIN_GAP_SEC = 0.05  # 학습된 유휴 간격의 하한
+BUS_FRAME_SEC = PACKET_LEN * 10 / 9600  # 9600bps 에서 프레임 하나 전송 시간
+BUS_PREDICT_HORIZON_SEC = 1.0  # 다음 빈 슬롯을 찾는 최대 범위
 SEND_RETRY_MAX = 3
 SEND_RETRY_GAP = 0.15
-CMD_CONFIRM_TIMEOUT = 1.0  # 보낸 뒤 상태 확인을 기다리는 최대 시간
-
-class DeviceType(IntEnum):
-    """Device types."""
-    UNKNOWN = 0
-    LIGHT = 1
-    LIGHTCUTOFF = 2
-    DIMMINGLIGHT = 3
-    OUTLET = 4
-    THERMOSTAT = 5
-    AIRCONDITIONER = 6
-    VENTILATION = 7
-    GASVALVE = 8
-    ELEVATOR = 9
-    MOTION = 10
-    AIRQUALITY = 11
-
-
-class SubType(IntEnum):
-    """Sub types."""
-    NONE = 0
-    DIRECTION = 1
-    FLOOR = 2
-    ERRCODE = 3
-    HEATTEMP = 4
-    HOTTEMP = 5
-    CO2 = 6
-    PM10 = 7
-    PM25 = 8
-    VOC = 9
-    TEMP = 10
-    HUMIDITY = 11
+TX_WINDOW = 4  # 확인을 기다리는 동안 동시에 진행할 수 있는 명령(서로 다른 기기) 수
+CMD_CONFIRM_TIMEOUT = 1.0  # 보낸 뒤 상태 확인을 기다리는 최대 시간 (RTT 학습 전 초기값)
+RTT_MIN_TIMEOUT = 0.3
+RTT_MAX_TIMEOUT = 5.0
+RTT_MIN_RETRY_GAP = 0.05
+DISCOVERY_ROOMS = 8  # 시작 시 조회할 방 번호 범위 (0 ~ N-1)
+DISCOVERY_REFRESH_SEC = 300.0  # 이 시간 동안 소식이 없는 기기는 다시 조회
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10.0  # 상태 변경 후 스냅샷을 저장하기까지의 지연 (디바운스)
+LATENCY_WINDOW_SEC = 300.0  # 단계별 지연 히스토그램의 집계 구간
+BUS_STATS_MIN_INTERVAL_SEC = 10.0  # 이 간격 안의 조회는 직전 버스 통계 스냅샷을 재사용
+
+
+class TxPriority(IntEnum):
+    """Transmit priority classes (lower is served first)."""
+    SAFETY = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+# 다른 명령보다 먼저 전송되는 기기
+SAFETY_DEVICE_TYPES = frozenset({DeviceType.GASVALVE, DeviceType.ELEVATOR})
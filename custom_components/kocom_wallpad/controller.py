@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import List, Callable, Any, Tuple
-from dataclasses import dataclass, replace
+import logging
+import time
 
 from homeassistant.const import Platform, UnitOfTemperature
 from homeassistant.components.sensor import SensorDeviceClass
@@ -12,503 +14,381 @@ from homeassistant.components.switch import SwitchDeviceClass
 from homeassistant.components.climate.const import (
     PRESET_NONE,
     PRESET_AWAY,
-    FAN_LOW,
     HVACMode,
 )
 
 from .const import (
     LOGGER,
-    PACKET_PREFIX,
-    PACKET_SUFFIX,
-    PACKET_LEN,
     CMD_CONFIRM_TIMEOUT,
     DeviceType,
     SubType,
 )
-from .models import (
+from .models import DeviceKey, DeviceState
+from .protocol import (
     DEVICE_TYPE_MAP,
     AIRCONDITIONER_HVAC_MAP,
     AIRCONDITIONER_FAN_MAP,
-    VENTILATION_PRESET_MAP,
-    ELEVATOR_DIRECTION_MAP,
-    DeviceKey,
-    DeviceState
+    CAPTURE_RX,
+    AirconStatus,
+    AirQualityStatus,
+    CutoffStatus,
+    ElevatorStatus,
+    GasValveStatus,
+    MotionStatus,
+    PacketFrame,
+    PacketFramer,
+    Frame,
+    FrameCache,
+    SwitchStatus,
+    ThermostatStatus,
+    VentilationStatus,
+    decode,
+    encode_command,
+    is_valid,
 )
 
 Predicate = Callable[[DeviceState], bool]
+FrameHandler = Callable[[PacketFrame], "DeviceState | List[DeviceState] | None"]
 
-REV_DT_MAP = {v: k for k, v in DEVICE_TYPE_MAP.items()}
-REV_AC_HVAC_MAP = {v: k for k, v in AIRCONDITIONER_HVAC_MAP.items()}
-REV_AC_FAN_MAP = {v: k for k, v in AIRCONDITIONER_FAN_MAP.items()}
-REV_VENT_PRESET_MAP = {v: k for k, v in VENTILATION_PRESET_MAP.items()}
+AIRCONDITIONER_HVAC_MODES = [*(HVACMode(m) for m in AIRCONDITIONER_HVAC_MAP.values()), HVACMode.OFF]
+AIRCONDITIONER_FAN_MODES = [*AIRCONDITIONER_FAN_MAP.values()]
 
+# action -> (kwargs 키, state 필드) : 낙관적 상태 계산용
+OPTIMISTIC_FIELD_MAP = {
+    "set_hvac": ("hvac_mode", "hvac_mode"),
+    "set_preset": ("preset_mode", "preset_mode"),
+    "set_fan": ("fan_mode", "fan_mode"),
+    "set_temperature": ("target_temp", "target_temp"),
+    "set_percentage": ("speed", "speed"),
+}
 
-@dataclass(slots=True, frozen=True)
-class PacketFrame:
-    """Packet frame."""
-    raw: bytes
 
-    @property
-    def packet_type(self) -> int:
-        return (self.raw[3] >> 4) & 0x0F
-
-    @property
-    def dest(self) -> bytes:
-        return self.raw[5:7]
-
-    @property
-    def src(self) -> bytes:
-        return self.raw[7:9]
-
-    @property
-    def command(self) -> int:
-        return self.raw[9]
-
-    @property
-    def payload(self) -> bytes:
-        return self.raw[10:18]
+def _key(frame: PacketFrame, sub_type: SubType = SubType.NONE, device_index: int = 0) -> DeviceKey:
+    return DeviceKey(
+        device_type=frame.dev_type,
+        room_index=frame.dev_room,
+        device_index=device_index,
+        sub_type=sub_type,
+    )
 
-    @property
-    def checksum(self) -> int:
-        return self.raw[18]
 
-    @property
-    def peer(self) -> tuple[int, int]:
-        if self.dest[0] == 0x01:
-            return (self.src[0], self.src[1])
-        elif self.src[0] == 0x01:
-            return (self.dest[0], self.dest[1])
-        else:
-            LOGGER.warning("Peer resolution failed: dest=%s, src=%s", self.dest.hex(), self.src.hex())
-            return (0, 0)
-
-    @property
-    def dev_type(self) -> DeviceType:
-        dev_type = DEVICE_TYPE_MAP.get(self.peer[0], None)
-        if dev_type is None:
-            LOGGER.debug("Unknown device type code=%s, raw=%s", hex(self.peer[0]), self.raw.hex())
-            dev_type = DeviceType.UNKNOWN
-        return dev_type
-
-    @property
-    def dev_room(self) -> int:
-        return self.peer[1]
+def _error_state(key: DeviceKey, error_code: int) -> DeviceState:
+    attribute = {
+        "extra_state": {
+            "error_code": f"{error_code:02}"
+        },
+        "device_class": BinarySensorDeviceClass.PROBLEM
+    }
+    return DeviceState(key=key, platform=Platform.BINARY_SENSOR, attribute=attribute, state=error_code != 0x00)
 
 
 class KocomController:
-    """Controller for Kocom Wallpad."""
+    """Maps decoded protocol frames to Home Assistant device states."""
 
     def __init__(self, gateway) -> None:
         """Initialize the controller."""
         self.gateway = gateway
-        self._rx_buf = bytearray()
+        self._framer = PacketFramer()
+        self.frame_cache = FrameCache()
         self._device_storage: dict[str, Any] = {}
-
-    @staticmethod
-    def _checksum(buf: bytes) -> int:
-        return sum(buf) % 256
+        # (peer code, room, command) -> 마지막 패킷, 최근에 받은 것이 뒤로 (스냅샷용)
+        self.last_packets: dict[tuple[int, int, int], bytes] = {}
+        self._dispatch_table: dict[int, Tuple[DeviceType, FrameHandler]] = {}
+        handlers = self._default_handlers()
+        for code, dev_type in DEVICE_TYPE_MAP.items():
+            handler = handlers.get(dev_type)
+            if handler is not None:
+                self.register_handler(code, dev_type, handler)
+
+    def _default_handlers(self) -> dict[DeviceType, FrameHandler]:
+        return {
+            DeviceType.LIGHT: self._handle_switch,
+            DeviceType.OUTLET: self._handle_switch,
+            DeviceType.THERMOSTAT: self._handle_thermostat,
+            DeviceType.AIRCONDITIONER: self._handle_airconditioner,
+            DeviceType.VENTILATION: self._handle_ventilation,
+            DeviceType.GASVALVE: self._handle_gasvalve,
+            DeviceType.ELEVATOR: self._handle_elevator,
+            DeviceType.MOTION: self._handle_motion,
+            DeviceType.AIRQUALITY: self._handle_airquality,
+        }
+
+    def register_handler(self, code: int, dev_type: DeviceType, handler: FrameHandler) -> None:
+        """Register a frame handler for a device code."""
+        self._dispatch_table[code] = (dev_type, handler)
 
     def feed(self, chunk: bytes) -> None:
         if not chunk:
             return
-        self._rx_buf.extend(chunk)
-        for pkt in self._split_buf():
-            LOGGER.debug("Packet received: raw=%s", pkt.hex())
-            self._dispatch_packet(pkt)
-
-    def _split_buf(self) -> List[bytes]:
-        packets: List[bytes] = []
-        buf = self._rx_buf
-        while True:
-            start = buf.find(PACKET_PREFIX)
-            if start < 0:
-                # 프리픽스 이전의 쓰레기 데이터 제거
-                buf.clear()
-                break
-            if start > 0:
-                del buf[:start]
-            if len(buf) < PACKET_LEN:
-                # 더 받을 때까지 대기
-                break
-            # 고정 길이 확인 후 서픽스 검사
-            candidate = bytes(buf[:PACKET_LEN])
-            if not candidate.endswith(PACKET_SUFFIX):
-                # 한 바이트 밀어서 재탐색 (프레이밍 어긋남 복구)
-                del buf[0]
+        now = time.monotonic()
+        stats = self.gateway.bus_stats
+        capture = self.gateway.capture
+        latency = self.gateway.latency
+        timed = latency.enabled
+        # hex 문자열 변환은 디버그 로그가 켜져 있을 때만
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
+        if timed:
+            mark = time.perf_counter()
+        for view in self._split_buf(chunk):
+            capture.add(CAPTURE_RX, view, now)
+            if not is_valid(view):
+                stats.checksum_errors += 1
+                LOGGER.debug("Packet checksum is invalid. raw=%s", view.hex())
                 continue
-            packets.append(candidate)
-            del buf[:PACKET_LEN]
-        return packets
+            stats.rx_frames += 1
+            # 유지할 프레임만 복사 (청크에서 바로 잘라낸 bytes 는 그대로 사용)
+            pkt = view if type(view) is bytes else bytes(view)
+            if debug:
+                LOGGER.debug("Packet received: raw=%s", pkt.hex())
+            frame = PacketFrame(pkt)
+            if timed:
+                # 직전 프레임 처리 이후 이 프레임을 잘라내기까지
+                latency.record("framing", time.perf_counter() - mark, frame.dev_type)
+            self.gateway.bus_timing.observe(frame.dev_code, frame.dev_room, now)
+            if not self.frame_cache.seen(
+                frame.dev_code, frame.dev_room, frame.command,
+                frame.packet_type, frame.payload, now,
+            ):
+                self._dispatch_frame(frame)
+            if timed:
+                mark = time.perf_counter()
+
+    @property
+    def resync_dropped(self) -> int:
+        """Bytes discarded by the framer while resynchronizing."""
+        return self._framer.dropped
+
+    def _split_buf(self, chunk: bytes) -> List[Frame]:
+        return self._framer.feed(chunk)
 
     def _dispatch_packet(self, packet: bytes) -> None:
-        frame = PacketFrame(packet)
-        if self._checksum(packet[2:18]) != frame.checksum:
-            LOGGER.debug("Packet checksum is invalid. raw=%s", frame.raw.hex())
+        if not is_valid(packet):
+            LOGGER.debug("Packet checksum is invalid. raw=%s", packet.hex())
             return
-
-        dev_state = None
-        if frame.dev_type == DeviceType.LIGHT:
-            if frame.dev_room == 0xFF:
-                dev_state = self._handle_cutoff_switch(frame)
-            else:
-                dev_state = self._handle_switch(frame)
-        elif frame.dev_type == DeviceType.OUTLET:
-            dev_state = self._handle_switch(frame)
-        elif frame.dev_type == DeviceType.THERMOSTAT:
-            dev_state = self._handle_thermostat(frame)
-        elif frame.dev_type == DeviceType.AIRCONDITIONER:
-            dev_state = self._handle_airconditioner(frame)
-        elif frame.dev_type == DeviceType.VENTILATION:
-            dev_state = self._handle_ventilation(frame)
-        elif frame.dev_type == DeviceType.GASVALVE:
-            dev_state = self._handle_gasvalve(frame)
-        elif frame.dev_type == DeviceType.ELEVATOR:
-            dev_state = self._handle_elevator(frame)
-        elif frame.dev_type == DeviceType.MOTION:
-            dev_state = self._handle_motion(frame)
-        elif frame.dev_type == DeviceType.AIRQUALITY:
-            dev_state = self._handle_airquality(frame)
-        else:
-            LOGGER.debug("Unhandled device type: %s (raw=%s)", frame.dev_type.name, frame.raw.hex())
+        self._dispatch_frame(PacketFrame(packet))
+
+    def _dispatch_frame(self, frame: PacketFrame) -> None:
+        packet = frame.raw
+        entry = self._dispatch_table.get(frame.dev_code)
+        if entry is None:
+            self.gateway.bus_stats.unknown_codes += 1
+            LOGGER.debug("Unhandled device code: %s (raw=%s)", hex(frame.dev_code), packet.hex())
             return
+        frame.dev_type, handler = entry
+        latency = self.gateway.latency
+        if latency.enabled:
+            t0 = time.perf_counter()
+            dev_state = handler(frame)
+            latency.record("decode", time.perf_counter() - t0, frame.dev_type)
+        else:
+            dev_state = handler(frame)
 
         if not dev_state:
             return
 
+        k = (frame.dev_code, frame.dev_room, frame.command)
+        self.last_packets.pop(k, None)
+        self.last_packets[k] = packet
+
         if isinstance(dev_state, list):
             for state in dev_state:
-                state._packet = packet
+                state.packet = packet
                 self.gateway.on_device_state(state)
         else:
-            dev_state._packet = packet
+            dev_state.packet = packet
             self.gateway.on_device_state(dev_state)
             
-    def _handle_cutoff_switch(self, frame: PacketFrame) -> DeviceState:
-        if frame.command in (0x65, 0x66):
+    def invalidate_peer(self, packet: bytes) -> None:
+        """Let the next frame from the peer addressed by `packet` through the cache."""
+        frame = PacketFrame(packet)
+        self.frame_cache.invalidate(frame.dev_code, frame.dev_room)
+
+    def _handle_switch(self, frame: PacketFrame) -> DeviceState | List[DeviceState] | None:
+        status = decode(frame)
+        if isinstance(status, CutoffStatus):
             key = DeviceKey(
                 device_type=frame.dev_type,
                 room_index=0,
                 device_index=0,
                 sub_type=SubType.NONE,
             )
-            state = frame.command == 0x65
-            dev = DeviceState(key=key, platform=Platform.LIGHT, attribute={}, state=state)
-            return dev
-
-    def _handle_switch(self, frame: PacketFrame) -> List[DeviceState]:
+            return DeviceState(key=key, platform=Platform.LIGHT, attribute={}, state=status.on)
+        if not isinstance(status, SwitchStatus):
+            return None
         states: List[DeviceState] = []
-        if frame.command == 0x00:
-            for idx in range(8):
-                key = DeviceKey(
-                    device_type=frame.dev_type,
-                    room_index=frame.dev_room,
-                    device_index=idx,
-                    sub_type=SubType.NONE,
-                )
-                platform = Platform.LIGHT if frame.dev_type == DeviceType.LIGHT else Platform.SWITCH      
-                attribute = {}
-                if platform == Platform.SWITCH:
-                    attribute = {"device_class": SwitchDeviceClass.OUTLET}
-                state = frame.payload[idx] == 0xFF        
-                dev = DeviceState(key=key, platform=platform, attribute=attribute, state=state)
-                if state:
-                    dev._is_register = True
-                else:
-                    dev._is_register = False
-                states.append(dev)
-            return states
-
-    def _handle_thermostat(self, frame: PacketFrame) -> List[DeviceState]:
-        states: List[DeviceState] = []
-        if frame.command == 0x00:
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.NONE,
-            )
-            havc_mode = HVACMode.HEAT if frame.payload[0] >> 4 == 0x01 else HVACMode.OFF
-            preset_mode = PRESET_AWAY if frame.payload[1] & 0x0F == 0x01 else PRESET_NONE
-            target_temp = float(frame.payload[2])
-            current_temp = float(frame.payload[4])
-            hot_temp = frame.payload[3]
-            heat_temp = frame.payload[5]
-            error_code = frame.payload[6]
-
-            attribute = {
-                "hvac_modes": [HVACMode.HEAT, HVACMode.OFF],
-                "feature_preset": True,
-                "preset_modes": [PRESET_AWAY, PRESET_NONE],
-                "temp_step": self._device_storage.get(f"{key.unique_id}_thermo_step", 1.0),
-            }
-            state = {
-                "hvac_mode": havc_mode,
-                "preset_mode": preset_mode,
-                "target_temp": self._device_storage.get(f"{key.unique_id}_thermo_target", target_temp),
-                "current_temp": self._device_storage.get(f"{key.unique_id}_thermo_current", current_temp),
-            }
-            if target_temp % 1 == 0.5 and self._device_storage.get(f"{key.unique_id}_thermo_step") != 0.5:
-                LOGGER.debug("0.5°C step detected, heating supports 0.5 increments.")
-                self._device_storage[f"{key.unique_id}_thermo_step"] = 0.5
-            if target_temp != 0 and current_temp != 0:
-                if havc_mode == HVACMode.HEAT and self._device_storage.get(f"{key.unique_id}_thermo_target") != target_temp:
-                    LOGGER.debug(f"User target temperature update: {target_temp}")
-                    self._device_storage[f"{key.unique_id}_thermo_target"] = target_temp
-                self._device_storage[f"{key.unique_id}_thermo_current"] = current_temp
-            dev = DeviceState(key=key, platform=Platform.CLIMATE, attribute=attribute, state=state)
-            states.append(dev)
-            
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.HOTTEMP,
+        platform = Platform.LIGHT if frame.dev_type == DeviceType.LIGHT else Platform.SWITCH
+        for idx, state in enumerate(status.channels):
+            attribute = {}
+            if platform == Platform.SWITCH:
+                attribute = {"device_class": SwitchDeviceClass.OUTLET}
+            dev = DeviceState(
+                key=_key(frame, device_index=idx), platform=platform,
+                attribute=attribute, state=state, is_register=state,
             )
-            attribute = {
-                "device_class": SensorDeviceClass.TEMPERATURE,
-                "unit_of_measurement": UnitOfTemperature.CELSIUS
-            }
-            if hot_temp > 0:
-                dev = DeviceState(key=key, platform=Platform.SENSOR, attribute=attribute, state=hot_temp)
-                states.append(dev)
-            
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.HEATTEMP,
-            )
-            attribute = {
-                "device_class": SensorDeviceClass.TEMPERATURE,
-                "unit_of_measurement": UnitOfTemperature.CELSIUS
-            }
-            if heat_temp > 0:
-                dev = DeviceState(key=key, platform=Platform.SENSOR, attribute=attribute, state=heat_temp)
-                states.append(dev)
-            
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.ERRCODE,
-            )
-            attribute = {
-                "extra_state": {
-                    "error_code": f"{error_code:02}"
-                },
-                "device_class": BinarySensorDeviceClass.PROBLEM
-            }
-            state = error_code != 0x00
-            dev = DeviceState(key=key, platform=Platform.BINARY_SENSOR, attribute=attribute, state=state)
             states.append(dev)
-            return states
-        
-    def _handle_airconditioner(self, frame: PacketFrame) -> DeviceState:
-        if frame.command == 0x00:
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.NONE,
-            )
-            if frame.payload[0] == 0x10:
-                havc_mode = AIRCONDITIONER_HVAC_MAP.get(frame.payload[1], HVACMode.OFF) 
-            else:
-                havc_mode = HVACMode.OFF
-            fan_mode = AIRCONDITIONER_FAN_MAP.get(frame.payload[2], FAN_LOW)
-            current_temp = float(frame.payload[4])
-            target_temp = float(frame.payload[5])
+        return states
 
-            attribute = {
-                "hvac_modes": [*AIRCONDITIONER_HVAC_MAP.values(), HVACMode.OFF],
-                "fan_modes": [*AIRCONDITIONER_FAN_MAP.values()],
-                "feature_fan": True,
-                "temp_step": 1.0,
-            }
-            state = {
-                "hvac_mode": havc_mode,
-                "fan_mode": fan_mode,
-                "current_temp": current_temp,
-                "target_temp": target_temp,
-            }
-            dev = DeviceState(key=key, platform=Platform.CLIMATE, attribute=attribute, state=state)
-            return dev
-    
-    def _handle_ventilation(self, frame: PacketFrame) -> List[DeviceState]:
+    def _handle_thermostat(self, frame: PacketFrame) -> List[DeviceState] | None:
+        status = decode(frame)
+        if not isinstance(status, ThermostatStatus):
+            return None
         states: List[DeviceState] = []
-        if frame.command == 0x00:
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.NONE,
-            )
-            state = frame.payload[0] >> 4 == 0x01
-            preset_mode = VENTILATION_PRESET_MAP.get(frame.payload[1], "unknown")
-            speed = frame.payload[2]
-            co2_value = (frame.payload[4] * 100) + frame.payload[5]
-            error_code = frame.payload[6]
-
-            attribute = {
-                "feature_preset": self._device_storage.get("ventil_feature", False),
-                "preset_modes": self._device_storage.get("ventil_modes", []),
-                "speed_list": [0x40, 0x80, 0xC0]
-            }
-            state = {
-                "state": state,
-                "preset_mode": preset_mode,
-                "speed": speed,
-            }
-            if preset_mode != "unknown" and preset_mode != "ventilation":
-                if self._device_storage.get("ventil_modes") is None:
-                    LOGGER.debug("New ventilation preset detected (excluding default).")
-                    self._device_storage["ventil_feature"] = True
-                    self._device_storage["ventil_modes"] = ["ventilation"]
-                if preset_mode not in self._device_storage["ventil_modes"]:
-                    LOGGER.debug(f"Added presets: {preset_mode}")
-                    self._device_storage["ventil_modes"].append(preset_mode)
-            dev = DeviceState(key=key, platform=Platform.FAN, attribute=attribute, state=state)
-            states.append(dev)
-            
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.CO2,
-            )
-            attribute = {
-                "device_class": SensorDeviceClass.CO2,
-                "unit_of_measurement": "ppm"
-            }
-            if co2_value > 0:
-                dev = DeviceState(key=key, platform=Platform.SENSOR, attribute=attribute, state=co2_value)
-                states.append(dev)
-            
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.ERRCODE,
-            )
-            attribute = {
-                "extra_state": {
-                    "error_code": f"{error_code:02}"
-                },
-                "device_class": BinarySensorDeviceClass.PROBLEM
-            }
-            state = error_code != 0x00
-            dev = DeviceState(key=key, platform=Platform.BINARY_SENSOR, attribute=attribute, state=state)
-            states.append(dev)
-            return states
-
-    def _handle_gasvalve(self, frame: PacketFrame) -> DeviceState:
-        if frame.command in (0x01, 0x02):
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.NONE,
-            )
-            state = frame.command == 0x01
-            dev = DeviceState(key=key, platform=Platform.SWITCH, attribute={}, state=state)
-            return dev
+        key = _key(frame)
+        havc_mode = HVACMode.HEAT if status.heating else HVACMode.OFF
+        preset_mode = PRESET_AWAY if status.away else PRESET_NONE
+        target_temp = status.target_temp
+        current_temp = status.current_temp
+
+        attribute = {
+            "hvac_modes": [HVACMode.HEAT, HVACMode.OFF],
+            "feature_preset": True,
+            "preset_modes": [PRESET_AWAY, PRESET_NONE],
+            "temp_step": self._device_storage.get(f"{key.unique_id}_thermo_step", 1.0),
+        }
+        state = {
+            "hvac_mode": havc_mode,
+            "preset_mode": preset_mode,
+            "target_temp": self._device_storage.get(f"{key.unique_id}_thermo_target", target_temp),
+            "current_temp": self._device_storage.get(f"{key.unique_id}_thermo_current", current_temp),
+        }
+        if target_temp % 1 == 0.5 and self._device_storage.get(f"{key.unique_id}_thermo_step") != 0.5:
+            LOGGER.debug("0.5°C step detected, heating supports 0.5 increments.")
+            self._device_storage[f"{key.unique_id}_thermo_step"] = 0.5
+        if target_temp != 0 and current_temp != 0:
+            if havc_mode == HVACMode.HEAT and self._device_storage.get(f"{key.unique_id}_thermo_target") != target_temp:
+                LOGGER.debug(f"User target temperature update: {target_temp}")
+                self._device_storage[f"{key.unique_id}_thermo_target"] = target_temp
+            self._device_storage[f"{key.unique_id}_thermo_current"] = current_temp
+        states.append(DeviceState(key=key, platform=Platform.CLIMATE, attribute=attribute, state=state))
+
+        attribute = {
+            "device_class": SensorDeviceClass.TEMPERATURE,
+            "unit_of_measurement": UnitOfTemperature.CELSIUS
+        }
+        if status.hot_water_temp > 0:
+            states.append(DeviceState(
+                key=_key(frame, SubType.HOTTEMP), platform=Platform.SENSOR,
+                attribute=attribute, state=status.hot_water_temp,
+            ))
+        if status.heating_water_temp > 0:
+            states.append(DeviceState(
+                key=_key(frame, SubType.HEATTEMP), platform=Platform.SENSOR,
+                attribute=dict(attribute), state=status.heating_water_temp,
+            ))
+        states.append(_error_state(_key(frame, SubType.ERRCODE), status.error_code))
+        return states
 
-    def _handle_elevator(self, frame: PacketFrame) -> List[DeviceState]:    
+    def _handle_airconditioner(self, frame: PacketFrame) -> DeviceState | None:
+        status = decode(frame)
+        if not isinstance(status, AirconStatus):
+            return None
+        attribute = {
+            "hvac_modes": list(AIRCONDITIONER_HVAC_MODES),
+            "fan_modes": list(AIRCONDITIONER_FAN_MODES),
+            "feature_fan": True,
+            "temp_step": 1.0,
+        }
+        state = {
+            "hvac_mode": HVACMode(status.hvac_mode),
+            "fan_mode": status.fan_mode,
+            "current_temp": status.current_temp,
+            "target_temp": status.target_temp,
+        }
+        return DeviceState(key=_key(frame), platform=Platform.CLIMATE, attribute=attribute, state=state)
+
+    def _handle_ventilation(self, frame: PacketFrame) -> List[DeviceState] | None:
+        status = decode(frame)
+        if not isinstance(status, VentilationStatus):
+            return None
         states: List[DeviceState] = []
-        key = DeviceKey(
-            device_type=frame.dev_type,
-            room_index=frame.dev_room,
-            device_index=0,
-            sub_type=SubType.NONE,
-        )
-        state = False
-        if frame.payload[0] == 0x03:
-            state = False
-        elif frame.payload[0] in (0x01, 0x02) or frame.packet_type == 0x0D:
-            state = True
-        dev = DeviceState(key=key, platform=Platform.SWITCH, attribute={}, state=state)
-        states.append(dev)
-
-        key = DeviceKey(
-            device_type=frame.dev_type,
-            room_index=frame.dev_room,
-            device_index=0,
-            sub_type=SubType.DIRECTION,
-        )
-        state = ""
-        if frame.payload[0] == 0x00 and frame.packet_type == 0x0D:
-            state = "called"
-        else:
-            state = ELEVATOR_DIRECTION_MAP.get(frame.payload[0], "unknown")
-        dev = DeviceState(key=key, platform=Platform.SENSOR, attribute={}, state=state)
-        states.append(dev)
-        
-        key = DeviceKey(
-            device_type=frame.dev_type,
-            room_index=frame.dev_room,
-            device_index=0,
-            sub_type=SubType.FLOOR,
-        )
-        state = ""
-        if frame.payload[1] == 0x00:
-            state = "unknown"
-        else:
-            if frame.payload[2] != 0x00:
-                state = f"{chr(frame.payload[1])}{chr(frame.payload[2])}"
-            else:
-                if frame.payload[1] >> 4 == 0x08:
-                    state = f"B{str(frame.payload[1] & 0x0F)}"
-                else:
-                    state = str(frame.payload[1])
-        if state != "" and state != "unknown":
+        preset_mode = status.preset_mode
+        attribute = {
+            "feature_preset": self._device_storage.get("ventil_feature", False),
+            "preset_modes": self._device_storage.get("ventil_modes", []),
+            "speed_list": [0x40, 0x80, 0xC0]
+        }
+        state = {
+            "state": status.on,
+            "preset_mode": preset_mode,
+            "speed": status.speed,
+        }
+        if preset_mode != "unknown" and preset_mode != "ventilation":
+            if self._device_storage.get("ventil_modes") is None:
+                LOGGER.debug("New ventilation preset detected (excluding default).")
+                self._device_storage["ventil_feature"] = True
+                self._device_storage["ventil_modes"] = ["ventilation"]
+            if preset_mode not in self._device_storage["ventil_modes"]:
+                LOGGER.debug(f"Added presets: {preset_mode}")
+                self._device_storage["ventil_modes"].append(preset_mode)
+        states.append(DeviceState(key=_key(frame), platform=Platform.FAN, attribute=attribute, state=state))
+
+        attribute = {
+            "device_class": SensorDeviceClass.CO2,
+            "unit_of_measurement": "ppm"
+        }
+        if status.co2 > 0:
+            states.append(DeviceState(
+                key=_key(frame, SubType.CO2), platform=Platform.SENSOR, attribute=attribute, state=status.co2,
+            ))
+        states.append(_error_state(_key(frame, SubType.ERRCODE), status.error_code))
+        return states
+
+    def _handle_gasvalve(self, frame: PacketFrame) -> DeviceState | None:
+        status = decode(frame)
+        if not isinstance(status, GasValveStatus):
+            return None
+        return DeviceState(key=_key(frame), platform=Platform.SWITCH, attribute={}, state=status.open)
+
+    def _handle_elevator(self, frame: PacketFrame) -> List[DeviceState] | None:
+        status = decode(frame)
+        if not isinstance(status, ElevatorStatus):
+            return None
+        states: List[DeviceState] = [
+            DeviceState(key=_key(frame), platform=Platform.SWITCH, attribute={}, state=status.called),
+            DeviceState(
+                key=_key(frame, SubType.DIRECTION), platform=Platform.SENSOR, attribute={}, state=status.direction,
+            ),
+        ]
+        if status.floor != "unknown":
             self._device_storage["available_floor"] = True
         if self._device_storage.get("available_floor", False):
-            dev = DeviceState(key=key, platform=Platform.SENSOR, attribute={}, state=state)
-            states.append(dev)
+            states.append(DeviceState(
+                key=_key(frame, SubType.FLOOR), platform=Platform.SENSOR, attribute={}, state=status.floor,
+            ))
         return states
-    
-    def _handle_motion(self, frame: PacketFrame) -> DeviceState:
-        if frame.command in (0x00, 0x04):
-            key = DeviceKey(
-                device_type=frame.dev_type,
-                room_index=frame.dev_room,
-                device_index=0,
-                sub_type=SubType.NONE,
-            )
-            attribute = {
-                "device_class": BinarySensorDeviceClass.MOTION
-            }
-            state = frame.command == 0x04
-            dev = DeviceState(key=key, platform=Platform.BINARY_SENSOR, attribute=attribute, state=state)
-            return dev
-        
-    def _handle_airquality(self, frame: PacketFrame) -> List[DeviceState]:
+
+    def _handle_motion(self, frame: PacketFrame) -> DeviceState | None:
+        status = decode(frame)
+        if not isinstance(status, MotionStatus):
+            return None
+        attribute = {
+            "device_class": BinarySensorDeviceClass.MOTION
+        }
+        return DeviceState(key=_key(frame), platform=Platform.BINARY_SENSOR, attribute=attribute, state=status.detected)
+
+    def _handle_airquality(self, frame: PacketFrame) -> List[DeviceState] | None:
+        status = decode(frame)
+        if not isinstance(status, AirQualityStatus):
+            return None
         states: List[DeviceState] = []
-        if frame.command in (0x00, 0x3A):
-            data_mapping = {
-                SubType.PM10: (SensorDeviceClass.PM10, "µg/m³", frame.payload[0]),
-                SubType.PM25: (SensorDeviceClass.PM25, "µg/m³", frame.payload[1]),
-                SubType.CO2: (SensorDeviceClass.CO2, "ppm", int.from_bytes(frame.payload[2:4], 'big')),
-                SubType.VOC: (SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS, "µg/m³", int.from_bytes(frame.payload[4:6], 'big')),
-                SubType.TEMP: (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, frame.payload[6]),
-                SubType.HUMIDITY: (SensorDeviceClass.HUMIDITY, "%", frame.payload[7]),
+        data_mapping = {
+            SubType.PM10: (SensorDeviceClass.PM10, "µg/m³", status.pm10),
+            SubType.PM25: (SensorDeviceClass.PM25, "µg/m³", status.pm25),
+            SubType.CO2: (SensorDeviceClass.CO2, "ppm", status.co2),
+            SubType.VOC: (SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS, "µg/m³", status.voc),
+            SubType.TEMP: (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, status.temperature),
+            SubType.HUMIDITY: (SensorDeviceClass.HUMIDITY, "%", status.humidity),
+        }
+        for sub_type, (device_class, native_unit, state) in data_mapping.items():
+            attribute = {
+                "device_class": device_class,
+                "unit_of_measurement": native_unit
             }
-            for key, value in data_mapping.items():
-                device_class, native_unit, state = value
-                key = DeviceKey(
-                    device_type=frame.dev_type,
-                    room_index=frame.dev_room,
-                    device_index=0,
-                    sub_type=key,
-                )
-                attribute = {
-                    "device_class": device_class,
-                    "unit_of_measurement": native_unit
-                }
-                if state > 0:
-                    dev = DeviceState(key=key, platform=Platform.SENSOR, attribute=attribute, state=state)
-                    states.append(dev)
-            return states
+            if state > 0:
+                states.append(DeviceState(
+                    key=_key(frame, sub_type), platform=Platform.SENSOR, attribute=attribute, state=state,
+                ))
+        return states
     
     # TODO: 명령 상태 비교 로직 통합 (gateway.py)
     def _match_key_and(self, key: DeviceKey, cond: Predicate) -> Predicate:
@@ -552,7 +432,7 @@ class KocomController:
         # 밸브는 동작이 느릴 수 있으니 기본 타임아웃 상향
         base_timeout = max(CMD_CONFIRM_TIMEOUT, 1.5)
         if action == "turn_on":
-            return True, base_timeout
+            return self._match_key_and(key, lambda _d: True), base_timeout
         if action == "turn_off":
             return self._match_key_and(key, lambda d: bool(d.state) is False), base_timeout
         return self._match_key_and(key, lambda _d: False), base_timeout
@@ -606,104 +486,74 @@ class KocomController:
             return self._expect_for_airconditioner(key, action, **kwargs)            
         return self._match_key_and(key, lambda _d: False), CMD_CONFIRM_TIMEOUT
 
-    def generate_command(self, key: DeviceKey, action: str, **kwargs) -> Tuple[bytes, Predicate, float]:
-        device_type = key.device_type
-        room_index = key.room_index
-        device_index = key.device_index
-        sub_type = key.sub_type
-
-        if device_type not in REV_DT_MAP:
-            raise ValueError(f"Invalid device type: {device_type}")
-
-        type_bytes = bytes([0x30, 0xBC])
-        padding = bytes([0x00])
-        dest_dev = bytes([REV_DT_MAP[device_type]])
-        dest_room = bytes([room_index & 0xFF])
-        src_dev = bytes([0x01])
-        src_room = bytes([0x00])
-        command = bytes([0x00])
-        data = bytearray(8)
-
-        if device_type in (DeviceType.LIGHT, DeviceType.OUTLET):
-            data = self._generate_switch(key, action, data)
-        elif device_type == DeviceType.VENTILATION:
-            data = self._generate_ventilation(action, data, **kwargs)
-        elif device_type == DeviceType.THERMOSTAT:
-            data = self._generate_thermostat(action, data, **kwargs)
-        elif device_type == DeviceType.AIRCONDITIONER:
-            data = self._generate_airconditioner(action, data, **kwargs)
-        elif device_type == DeviceType.GASVALVE:
-            command = bytes([0x02])
-        elif device_type == DeviceType.ELEVATOR:
-            dest_dev = bytes([0x01])
-            dest_room = bytes([0x00])
-            src_dev = bytes([0x44])
-            src_room = bytes([room_index & 0xFF])
-            command = bytes([0x01])
+    def expected_state(self, dev: DeviceState, action: str, **kwargs: Any) -> DeviceState | None:
+        """State `dev` should reach once `action` is confirmed; None if not predictable.
+
+        Gas valve and elevator are left out on purpose: the valve can only be
+        locked from the wallpad side and an elevator call is an event, not a state.
+        """
+        dt = dev.key.device_type
+        if dt in (DeviceType.LIGHT, DeviceType.LIGHTCUTOFF, DeviceType.OUTLET):
+            if action not in ("turn_on", "turn_off"):
+                return None
+            return replace(dev, state=action == "turn_on")
+        if dt not in (DeviceType.THERMOSTAT, DeviceType.AIRCONDITIONER, DeviceType.VENTILATION):
+            return None
+        if not isinstance(dev.state, dict):
+            return None
+
+        state = dict(dev.state)
+        if action in ("turn_on", "turn_off") and "state" in state:
+            state["state"] = action == "turn_on"
+        elif action in OPTIMISTIC_FIELD_MAP:
+            arg, fld = OPTIMISTIC_FIELD_MAP[action]
+            if arg not in kwargs or fld not in state:
+                return None
+            state[fld] = kwargs[arg]
+            if dt == DeviceType.VENTILATION and action == "set_percentage":
+                state["state"] = kwargs[arg] != 0
         else:
-            raise ValueError(f"Invalid device generator: {device_type}")
-
-        body = b"".join([type_bytes, padding, dest_dev, dest_room, src_dev, src_room, command, bytes(data)])
-        checksum = bytes([self._checksum(body)])
-        packet = bytes([0xAA, 0x55]) + body + checksum + bytes([0x0D, 0x0D])
+            return None
+        return replace(dev, state=state)
 
+    def generate_command(self, key: DeviceKey, action: str, **kwargs) -> Tuple[bytes, Predicate, float]:
+        overrides = kwargs.pop("channels", None)
+        channels = None
+        if action != "query" and key.device_type in (DeviceType.LIGHT, DeviceType.OUTLET):
+            channels = self._switch_channels(key, action, overrides)
+        packet = encode_command(key, action, channels=channels, **kwargs)
         expect, timeout = self.build_expectation(key, action, **kwargs)
         return packet, expect, timeout
 
-    def _generate_switch(self, key: DeviceKey, action: str, data: bytes) -> bytes:
+    def _switch_channels(
+        self, key: DeviceKey, action: str, channels: dict[int, bool] | None = None
+    ) -> List[bool]:
+        """All eight channels of the room: overrides, then `action`, then confirmed state."""
+        out: List[bool] = []
         for idx in range(8):
-            new_key = replace(key, device_index=idx)
-            st = self.gateway.registry.get(new_key)
-            if idx != key.device_index:
-                bit = 0xFF if (st and st.state is True) else 0x00
-                data[idx] = bit
+            if channels is not None and idx in channels:
+                out.append(channels[idx])
+            elif idx != key.device_index:
+                st = self.gateway.confirmed_state(key.replace(device_index=idx))
+                out.append(bool(st and st.state is True))
             else:
-                data[idx] = 0xFF if action == "turn_on" else 0x00
-        return data
-
-    def _generate_ventilation(self, action: str, data: bytes, **kwargs: Any) -> bytes:
-        if action == "set_preset":
-            pm = kwargs["preset_mode"]
-            data[0] = 0x11
-            data[1] = REV_VENT_PRESET_MAP[pm]
-        elif action == "set_percentage":
-            speed = kwargs["speed"]
-            data[0] = 0x00 if speed == 0 else 0x11
-            data[2] = speed
-        else:
-            data[0] = 0x11 if action == "turn_on" else 0x00
-        return data
-    
-    def _generate_thermostat(self, action: str, data: bytes, **kwargs: Any) -> bytes:
-        if action == "set_hvac":
-            hm = kwargs["hvac_mode"]
-            data[0] = 0x11 if hm == HVACMode.HEAT else 0x00
-            data[1] = 0x00
-        elif action == "set_preset":
-            pm = kwargs["preset_mode"]
-            data[0] = 0x11
-            data[1] = 0x01 if pm == PRESET_AWAY else 0x00
-        elif action == "set_temperature":
-            tt = kwargs["target_temp"]
-            data[0] = 0x11
-            data[2] = int(tt)
-        return data
-    
-    def _generate_airconditioner(self, action: str, data: bytes, **kwargs: Any) -> bytes:
-        if action == "set_hvac":
-            hm = kwargs["hvac_mode"]
-            if hm == HVACMode.OFF:
-                data[0] = 0x00
-            else:
-                data[0] = 0x10
-                data[1] = REV_AC_HVAC_MAP[hm]
-        elif action == "set_fan":
-            fm = kwargs["fan_mode"]
-            data[0] = 0x10
-            data[2] = REV_AC_FAN_MAP[fm]
-        elif action == "set_temperature":
-            tt = kwargs["target_temp"]
-            data[0] = 0x10
-            data[5] = int(tt)
-        return data
-    
\ No newline at end of file
+                out.append(action == "turn_on")
+        return out
+
+    def generate_switch_batch(
+        self, commands: List[Tuple[DeviceKey, str]]
+    ) -> Tuple[bytes, List[Tuple[DeviceKey, Predicate]], float]:
+        """Build one frame for several channels of the same room.
+
+        Later commands for the same channel win. Returns the packet, one
+        (key, predicate) per channel and the confirmation timeout.
+        """
+        last: dict[DeviceKey, str] = {}
+        for key, action in commands:
+            last.pop(key, None)
+            last[key] = action
+        channels = {key.device_index: action == "turn_on" for key, action in last.items()}
+        key, action = commands[-1]
+        packet, _, timeout = self.generate_command(key, action, channels=channels)
+        expects = [(k, self.build_expectation(k, a)[0]) for k, a in last.items()]
+        return packet, expects, timeout
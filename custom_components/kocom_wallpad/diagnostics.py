@@ -0,0 +1,35 @@
+"""Diagnostics support for Kocom Wallpad."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .gateway import KocomGateway
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    gateway: KocomGateway = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "bus_timing": gateway.bus_timing.as_dict(),
+        "frame_cache": gateway.controller.frame_cache.as_dict(),
+        "rtt": gateway.rtt.as_dict(),
+        "discovery": gateway.discovery.as_dict() if gateway.discovery else None,
+        "tx": {
+            "frames_saved": gateway.frames_saved,
+            "queue": gateway.queue_stats(),
+        },
+        "latency": gateway.latency.as_dict(),
+        "bus": gateway.bus_health(),
+        "capture": {
+            "frames": len(gateway.capture),
+            "total": gateway.capture.total,
+            "capacity": gateway.capture.capacity,
+        },
+    }
@@ -0,0 +1,103 @@
+"""Bus discovery and status refresh for Kocom Wallpad."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, List
+
+from .const import (
+    LOGGER,
+    DISCOVERY_ROOMS,
+    DISCOVERY_REFRESH_SEC,
+    DeviceType,
+    SubType,
+)
+from .protocol import DEVICE_TYPE_MAP, DeviceKey
+
+# 조회하면 동작해 버리거나(엘리베이터 호출) 조회 대상이 아닌 기기
+_SKIP_TYPES = frozenset({DeviceType.ELEVATOR, DeviceType.MOTION})
+# 집 전체에 하나뿐인 기기 (방 번호 0)
+_SINGLE_ROOM_TYPES = frozenset({DeviceType.VENTILATION, DeviceType.GASVALVE, DeviceType.AIRQUALITY})
+
+
+class DiscoveryEngine:
+    """Sends status queries so devices show up without being toggled first.
+
+    At start every known device code is queried once across the room range;
+    afterwards peers that answered but have been silent for `refresh`
+    seconds are queried again. Queries go out at background priority and
+    are not confirmed; answers arrive through the normal RX path.
+    """
+
+    def __init__(
+        self,
+        gateway,
+        rooms: int = DISCOVERY_ROOMS,
+        refresh: float = DISCOVERY_REFRESH_SEC,
+    ) -> None:
+        """Initialize the engine."""
+        self.gateway = gateway
+        self.rooms = rooms
+        self.refresh = refresh
+        self.queries = 0
+        self.sweeps = 0
+
+    def targets(self) -> List[tuple[int, DeviceKey]]:
+        """(device code, query key) for every peer the sweep should ask."""
+        out: List[tuple[int, DeviceKey]] = []
+        for code, dev_type in DEVICE_TYPE_MAP.items():
+            if dev_type in _SKIP_TYPES:
+                continue
+            rooms = (0,) if dev_type in _SINGLE_ROOM_TYPES else range(self.rooms)
+            for room in rooms:
+                out.append((code, DeviceKey(dev_type, room, 0, SubType.NONE)))
+        return out
+
+    def _responders(self) -> List[tuple[int, DeviceKey]]:
+        timing = self.gateway.bus_timing
+        return [
+            (code, key) for code, key in self.targets()
+            if timing.last_seen(code, key.room_index) is not None
+        ]
+
+    async def _query(self, key: DeviceKey) -> None:
+        if await self.gateway.async_query(key):
+            self.queries += 1
+
+    async def sweep(self) -> None:
+        """Query every target once."""
+        targets = self.targets()
+        LOGGER.debug("Discovery sweep: %d targets", len(targets))
+        for _, key in targets:
+            await self._query(key)
+        self.sweeps += 1
+
+    async def run(self) -> None:
+        try:
+            await self.gateway.conn.wait_connected()
+            await self.sweep()
+            while True:
+                responders = self._responders()
+                if not responders:
+                    await asyncio.sleep(self.refresh)
+                    continue
+                # 한 주기에 걸쳐 고르게 분산
+                spacing = self.refresh / max(1, len(responders))
+                for code, key in responders:
+                    await asyncio.sleep(spacing)
+                    seen = self.gateway.bus_timing.last_seen(code, key.room_index)
+                    if seen is None or time.monotonic() - seen >= self.refresh:
+                        await self._query(key)
+        except asyncio.CancelledError:
+            LOGGER.debug("Discovery cancelled")
+            raise
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rooms": self.rooms,
+            "refresh_s": self.refresh,
+            "sweeps": self.sweeps,
+            "queries": self.queries,
+            "responders": [key.unique_id for _, key in self._responders()],
+        }
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.entity import DeviceInfo
+import time
+
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityCategory
 from homeassistant.helpers.restore_state import RestoreEntity, RestoredExtraData
 from homeassistant.core import callback
 from homeassistant.const import Platform
@@ -15,6 +17,7 @@ from homeassistant.components.sensor import SensorEntityDescription
 from homeassistant.components.binary_sensor import BinarySensorEntityDescription
 
 from .const import DOMAIN, DeviceType, SubType
+from .models import DeviceDelta
 
 
 ENTITY_DESCRIPTION_MAP = {
@@ -30,6 +33,9 @@ ENTITY_DESCRIPTION_MAP = {
 class KocomBaseEntity(RestoreEntity):
     """Base class for Kocom entities."""
 
+    # 바뀌어도 HA 상태를 다시 쓸 필요가 없는 속성
+    _passive_attributes: frozenset[str] = frozenset()
+
     def __init__(self, gateway, device) -> None:
         """Initialize the base entity."""
         super().__init__()
@@ -84,11 +90,28 @@ class KocomBaseEntity(RestoreEntity):
         sig = self.gateway.async_signal_device_updated(self._device.key.unique_id)
 
         @callback
-        def _handle_update(dev):
+        def _handle_update(dev, delta: DeviceDelta):
             self._device = dev
+            if not self._affects_ha_state(delta):
+                return
+            latency = self.gateway.latency
+            if not latency.enabled:
+                self.update_from_state()
+                return
+            t0 = time.perf_counter()
             self.update_from_state()
+            t1 = time.perf_counter()
+            dev_type = dev.key.device_type
+            latency.record("entity_write", t1 - t0, dev_type)
+            if latency.rx_started:
+                latency.record("rx_to_state", t1 - latency.rx_started, dev_type)
         self._unsubs.append(async_dispatcher_connect(self.hass, sig, _handle_update))
 
+    def _affects_ha_state(self, delta: DeviceDelta) -> bool:
+        if delta.platform or delta.state:
+            return True
+        return any(k not in self._passive_attributes for k in delta.attribute)
+
     async def async_will_remove_from_hass(self) -> None:
         for unsub in self._unsubs:
             try:
@@ -104,6 +127,30 @@ class KocomBaseEntity(RestoreEntity):
     @property
     def extra_restore_state_data(self) -> RestoredExtraData:
         return RestoredExtraData({
-            "packet": getattr(self._device, "_packet", bytes()).hex(),
+            "packet": self._device.packet.hex(),
             "device_storage": self.gateway.controller._device_storage
         })
+
+
+class KocomGatewayEntity(Entity):
+    """Base class for diagnostic entities of the gateway itself.
+
+    Created disabled; values are read from the gateway on each poll, which
+    keeps state writes to one per scan interval however busy the bus is.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, gateway, key: str) -> None:
+        """Initialize the gateway entity."""
+        self.gateway = gateway
+        self._attr_unique_id = f"gateway_{key}:{self.gateway.host}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, str(self.gateway.host))},
+            manufacturer="KOCOM Co., Ltd",
+            model="Smart Wallpad",
+            name="KOCOM Gateway",
+        )
@@ -54,6 +54,8 @@ async def async_setup_entry(
 class KocomFan(KocomBaseEntity, FanEntity):
     """Representation of a Kocom fan."""
 
+    _passive_attributes = frozenset({"feature_preset"})
+
     def __init__(self, gateway: KocomGateway, device: DeviceState) -> None:
         """Initialize the fan."""
         super().__init__(gateway, device)
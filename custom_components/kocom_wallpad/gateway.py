@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import heapq
+import itertools
+import time
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Tuple, List, Callable
 
@@ -16,15 +19,25 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from .const import (
     LOGGER,
     DOMAIN,
-    RECV_POLL_SEC,
-    IDLE_GAP_SEC,
+    EVENT_COMMAND_FAILED,
     SEND_RETRY_MAX,
-    SEND_RETRY_GAP,
+    TX_WINDOW,
+    SAFETY_DEVICE_TYPES,
     DeviceType,
+    SubType,
+    TxPriority,
 )
-from .models import DeviceKey, DeviceState
+from .models import DeviceKey, DeviceState, DeviceDelta
 from .transport import AsyncConnection
 from .controller import KocomController
+from .bus_timing import BusTimingModel
+from .scheduler import CommandQueue
+from .rtt import RttTable
+from .bus_stats import BusStats
+from .latency import LatencyStats
+from .discovery import DiscoveryEngine
+from .protocol import CAPTURE_TX, CaptureRing
+from .snapshot import SnapshotStore, encode_snapshot, decode_packets
 
 
 @dataclass(slots=True)
@@ -32,22 +45,125 @@ class _CmdItem:
     key: DeviceKey
     action: str
     kwargs: dict
-    future: asyncio.Future = field(default_factory=asyncio.get_running_loop().create_future)
+    priority: TxPriority = TxPriority.NORMAL
+    queued_at: float = field(default_factory=time.monotonic)
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    # 전송 전에 더 새로운 명령으로 대체됨 (결과는 False, 확인 실패와 구분)
+    replaced: bool = False
+
+    def resolve(self, result: bool) -> None:
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def supersede(self) -> None:
+        self.replaced = True
+        self.resolve(False)
+
+
+class _OptimisticHold:
+    """Real state of a device kept aside while an optimistic state is shown."""
+
+    __slots__ = ("base", "refs")
+
+    def __init__(self, base: DeviceState) -> None:
+        self.base = base
+        self.refs = 0
 
 
 class _PendingWaiter:
 
-    __slots__ = ("key", "predicate", "future")
+    __slots__ = ("key", "predicate", "future", "deadline")
 
     def __init__(
         self, 
         key: DeviceKey,
         predicate: Callable[[DeviceState], bool],
-        loop: asyncio.AbstractEventLoop
+        loop: asyncio.AbstractEventLoop,
+        deadline: float = 0.0,
     ) -> None:
         self.key = key
         self.predicate = predicate
         self.future: asyncio.Future[DeviceState] = loop.create_future()
+        self.deadline = deadline
+
+
+class _PendingTable:
+    """Confirmation waiters indexed by DeviceKey.key, expired from one deadline heap."""
+
+    def __init__(self) -> None:
+        self._by_key: Dict[Tuple[int, int, int, int], list[_PendingWaiter]] = {}
+        self._heap: list[tuple[float, int, _PendingWaiter]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_at = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(w) for w in self._by_key.values())
+
+    def has_key(self, key: DeviceKey) -> bool:
+        return key.key in self._by_key
+
+    def add(
+        self, key: DeviceKey, predicate: Callable[[DeviceState], bool], timeout: float
+    ) -> _PendingWaiter:
+        loop = asyncio.get_running_loop()
+        waiter = _PendingWaiter(key, predicate, loop, loop.time() + timeout)
+        self._by_key.setdefault(key.key, []).append(waiter)
+        heapq.heappush(self._heap, (waiter.deadline, next(self._seq), waiter))
+        if self._timer is None or waiter.deadline < self._timer_at:
+            self._arm(loop)
+        return waiter
+
+    def discard(self, waiter: _PendingWaiter) -> None:
+        # 힙 항목은 만료 시점에 게으르게 정리
+        waiters = self._by_key.get(waiter.key.key)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        if not waiters:
+            del self._by_key[waiter.key.key]
+
+    def notify(self, dev: DeviceState) -> None:
+        waiters = self._by_key.get(dev.key.key)
+        if not waiters:
+            return
+        for waiter in tuple(waiters):
+            if waiter.future.done():
+                continue
+            try:
+                matched = waiter.predicate(dev)
+            except Exception:
+                # predicate 내부 오류 방어
+                LOGGER.debug("Confirmation predicate failed for %s", dev.key, exc_info=True)
+                continue
+            if matched:
+                waiter.future.set_result(dev)
+                self.discard(waiter)
+
+    def _arm(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        heap = self._heap
+        while heap and heap[0][2].future.done():
+            heapq.heappop(heap)
+        if heap:
+            self._timer_at = heap[0][0]
+            self._timer = loop.call_at(self._timer_at, self._expire, loop)
+
+    def _expire(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._timer = None
+        now = loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, waiter = heapq.heappop(heap)
+            if not waiter.future.done():
+                waiter.future.set_exception(asyncio.TimeoutError())
+            self.discard(waiter)
+        self._arm(loop)
 
 
 class EntityRegistry:
@@ -59,29 +175,28 @@ class EntityRegistry:
         self._shadow: Dict[Tuple[int, int, int, int], DeviceState] = {}
         self.by_platform: Dict[Platform, Dict[str, DeviceState]] = {}
 
-    def upsert(self, dev: DeviceState, allow_insert: bool = True) -> tuple[bool, bool]:
+    def upsert(self, dev: DeviceState, allow_insert: bool = True) -> tuple[bool, DeviceDelta | None]:
+        """Insert or update a device; return (is_new, delta) where delta is None if nothing changed."""
         k = dev.key.key
         old = self._states.get(k)
         is_new = old is None
 
         if is_new and not allow_insert:
-            return False, False
+            return False, None
         if is_new:
             self._states[k] = dev
             self.by_platform.setdefault(dev.platform, {})[dev.key.unique_id] = dev
-            return True, True
+            return True, None
 
-        platform_changed = (old.platform != dev.platform)
-        state_changed = (old.state != dev.state)
-        attr_changed = (old.attribute != dev.attribute)
-        changed = platform_changed or state_changed or attr_changed
+        delta = DeviceDelta.between(old, dev)
+        if not delta:
+            return False, None
 
-        if changed:
-            if platform_changed:
-                self.by_platform.get(old.platform, {}).pop(old.key.unique_id, None)
-            self.by_platform.setdefault(dev.platform, {})[dev.key.unique_id] = dev
-            self._states[k] = dev
-        return False, changed
+        if delta.platform:
+            self.by_platform.get(old.platform, {}).pop(old.key.unique_id, None)
+        self.by_platform.setdefault(dev.platform, {})[dev.key.unique_id] = dev
+        self._states[k] = dev
+        return False, delta
 
     def get(self, key: DeviceKey, include_shadow: bool = False) -> Optional[DeviceState]:
         dev = self._states.get(key.key)
@@ -111,66 +226,157 @@ class KocomGateway:
         hass: HomeAssistant, 
         entry: ConfigEntry,
         host: str,
-        port: int | None
+        port: int | None,
+        tx_window: int = TX_WINDOW,
+        optimistic: bool = False,
+        discovery: bool = True,
+        instrumentation: bool = False,
     ) -> None:
         """Initialize the gateway."""
         self.hass = hass
         self.entry = entry
         self.host = host
         self.port = port
-        self.conn = AsyncConnection(host=host, port=port)
+        self.conn = AsyncConnection(host=host, port=port, on_data=self._on_data)
         self.controller = KocomController(self)
         self.registry = EntityRegistry()
-        self._tx_queue: asyncio.Queue[_CmdItem] = asyncio.Queue()
-        self._task_reader: asyncio.Task | None = None
+        self.bus_timing = BusTimingModel()
+        self.rtt = RttTable()
+        self.latency = LatencyStats(enabled=instrumentation)
+        self.bus_stats = BusStats()
+        self.capture = CaptureRing()  # 최근 RX/TX 원시 프레임 (덤프 서비스용)
+        self._tx_queue: CommandQueue[_CmdItem] = CommandQueue(
+            supersede_key=lambda it: (it.key.key, it.action),
+            priority=lambda it: it.priority,
+            group=lambda it: it.key.device_type,
+        )
         self._task_sender: asyncio.Task | None = None
-        self._pendings: list[_PendingWaiter] = []
+        self.discovery = DiscoveryEngine(self) if discovery else None
+        self._task_discovery: asyncio.Task | None = None
+        # 파이프라인: 서로 다른 기기의 명령은 확인을 기다리는 동안에도 이어서 전송
+        self._tx_window = max(1, tx_window)
+        self._tx_lock = asyncio.Lock()
+        self._inflight: set[tuple] = set()
+        self._inflight_tasks: set[asyncio.Task] = set()
+        self._pendings = _PendingTable()
         self._last_rx_monotonic: float = 0.0
         self._last_tx_monotonic: float = 0.0
         self._restore_mode: bool = False
-        self._force_register_uid: str | None = None
+        self.optimistic = optimistic
+        self.frames_saved = 0  # 이미 같은 상태라 전송하지 않은 명령 수
+        self._optimistic: Dict[Tuple[int, int, int, int], _OptimisticHold] = {}
+        self._force_register_uids: set[str] = set()
+        self.snapshot = SnapshotStore(hass, entry.entry_id)
 
     async def async_start(self) -> None:
         LOGGER.info("Starting gateway - %s:%s", self.host, self.port or "")
-        await self.conn.open()
+        # 연결은 감독 태스크가 백그라운드에서 맺음 (설정 단계를 막지 않음)
+        self.conn.start()
         self._last_rx_monotonic = self.conn.idle_since()
         self._last_tx_monotonic = self.conn.idle_since()
-        self._task_reader = asyncio.create_task(self._read_loop())
         self._task_sender = asyncio.create_task(self._sender_loop())
+        if self.discovery is not None:
+            self._task_discovery = asyncio.create_task(self.discovery.run())
 
     async def async_stop(self, event: Event | None = None) -> None:
         LOGGER.info("Stopping gateway - %s:%s", self.host, self.port or "")
-        if self._task_reader:
-            self._task_reader.cancel()
+        if self._task_discovery:
+            self._task_discovery.cancel()
             with contextlib.suppress(asyncio.CancelledError):
-                await self._task_reader
+                await self._task_discovery
         if self._task_sender:
             self._task_sender.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._task_sender
+        for task in tuple(self._inflight_tasks):
+            task.cancel()
+        if self._inflight_tasks:
+            await asyncio.gather(*self._inflight_tasks, return_exceptions=True)
         await self.conn.close()
+        await self.snapshot.async_save(self._snapshot_data())
 
-    def is_idle(self) -> bool:
-        return self.conn.idle_since() >= IDLE_GAP_SEC
+    def queue_stats(self) -> dict:
+        """Per priority class queue depth and wait-time metrics."""
+        return self._tx_queue.as_dict(lambda cls: TxPriority(cls).name.lower())
+
+    def bus_health(self) -> dict:
+        """Bus utilization and error counters (rate-limited snapshot)."""
+        return self.bus_stats.snapshot(
+            resync_dropped=self.controller.resync_dropped,
+            reconnects=self.conn.reconnects,
+        )
 
-    async def _read_loop(self) -> None:
+    def dump_capture(self) -> bytes:
+        """Recent raw RX/TX frames in the capture file format."""
+        return self.capture.to_bytes()
+
+    def is_idle(self) -> bool:
+        return self.conn.idle_since() >= self.bus_timing.quiet_gap()
+
+    async def _wait_tx_slot(self, timeout: float) -> bool:
+        """Wait for a quiet line, then for the next slot the bus model predicts is free."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if not await self.conn.idle_gate.wait(self.bus_timing.quiet_gap(), remaining):
+                return False
+            now = time.monotonic()
+            slot = self.bus_timing.next_free_slot(now)
+            if slot <= now:
+                return True
+            if slot >= deadline:
+                # 예측 슬롯이 너무 멀면 유휴 상태만으로 전송
+                return True
+            await asyncio.sleep(slot - now)
+            # 슬롯까지 기다리는 동안 라인이 다시 바빠졌을 수 있으므로 재확인
+
+    def _on_data(self, chunk: bytes) -> None:
+        self._last_rx_monotonic = time.monotonic()
+        self.bus_stats.rx_bytes += len(chunk)
+        latency = self.latency
+        if latency.enabled:
+            latency.rx_started = time.perf_counter()
         try:
-            LOGGER.debug("Starting read loop")
-            while True:
-                if not self.conn._is_connected():
-                    await asyncio.sleep(5)
-                    continue
-                chunk = await self.conn.recv(512, RECV_POLL_SEC)
-                if chunk:
-                    self._last_rx_monotonic = asyncio.get_running_loop().time()
-                    self.controller.feed(chunk)
-        except asyncio.CancelledError:
-            LOGGER.debug("Read loop cancelled")
-            raise
+            self.controller.feed(chunk)
+        except Exception:
+            # 프로토콜 콜백에서 예외가 나가면 연결이 닫히므로 여기서 차단
+            LOGGER.exception("Failed to process received data")
+        if latency.enabled:
+            latency.record("rx", time.perf_counter() - latency.rx_started)
+            latency.rx_started = 0.0
 
     async def async_send_action(self, key: DeviceKey, action: str, **kwargs) -> bool:
-        item = _CmdItem(key=key, action=action, kwargs=kwargs)
-        await self._tx_queue.put(item)
+        """Queue a command; `optimistic=` overrides the gateway option for this call.
+
+        In optimistic mode the expected state is shown right away and True is
+        returned; confirmation continues in the background and the real state
+        is put back (and EVENT_COMMAND_FAILED fired) if every retry fails.
+        A command the device already satisfies completes without touching the
+        bus unless `force=True` is given. A command replaced by a newer one for
+        the same device and action before it was sent returns False at once;
+        it was never sent, so no EVENT_COMMAND_FAILED is fired for it.
+        """
+        optimistic = kwargs.pop("optimistic", self.optimistic)
+        force = kwargs.pop("force", False)
+        if not force and self._is_noop(key, action, kwargs):
+            self.frames_saved += 1
+            LOGGER.debug("Command '%s' for %s skipped, already in requested state", action, key)
+            return True
+        item = _CmdItem(key=key, action=action, kwargs=kwargs, priority=self._priority_for(key))
+        replaced = self._tx_queue.put_nowait(item)
+        if replaced is not None:
+            # 아직 전송되지 않은 같은 명령은 최신 값으로 대체, 이전 호출자는 False 를 받음
+            LOGGER.debug("Command '%s' for %s superseded by newer value", action, key)
+            replaced.supersede()
+        if optimistic and self._apply_optimistic(key, action, kwargs):
+            self.entry.async_create_background_task(
+                self.hass,
+                self._async_reconcile(item, key, action, kwargs),
+                f"{DOMAIN} reconcile {key.unique_id} {action}",
+            )
+            return True
         try:
             res = await item.future   # 워커가 set_result(True/False)
             return bool(res)
@@ -180,14 +386,111 @@ class KocomGateway:
                 item.future.set_result(False)
             raise
 
+    async def async_query(self, key: DeviceKey) -> bool:
+        """Queue a status query for the peer of `key` at background priority.
+
+        Resolves once the frame is on the bus; the answer is handled like any
+        other status frame. Returns False if a newer query for the same peer
+        replaced this one before it was sent.
+        """
+        item = _CmdItem(key=key, action="query", kwargs={}, priority=TxPriority.BACKGROUND)
+        replaced = self._tx_queue.put_nowait(item)
+        if replaced is not None:
+            replaced.supersede()
+        return bool(await item.future)
+
+    def _has_outstanding(self, key: DeviceKey) -> bool:
+        """True if a queued or unconfirmed command may still change `key`."""
+        if key.key in self._optimistic or self._pendings.has_key(key):
+            return True
+        if self._order_key(key) in self._inflight:
+            return True
+        return self._tx_queue.contains_where(lambda it: it.key == key)
+
+    def _is_noop(self, key: DeviceKey, action: str, kwargs: dict) -> bool:
+        if self._has_outstanding(key):
+            # 앞선 명령의 결과에 따라 달라지므로 레지스트리만으로 판단할 수 없음
+            return False
+        current = self.registry.get(key)
+        if current is None:
+            return False
+        expected = self.controller.expected_state(current, action, **kwargs)
+        return expected is not None and expected.state == current.state
+
+    def confirmed_state(self, key: DeviceKey) -> Optional[DeviceState]:
+        """Last state reported by the device, ignoring any optimistic overlay."""
+        hold = self._optimistic.get(key.key)
+        if hold is not None:
+            return hold.base
+        return self.registry.get(key)
+
+    def _apply_optimistic(self, key: DeviceKey, action: str, kwargs: dict) -> bool:
+        current = self.registry.get(key)
+        if current is None:
+            return False
+        expected = self.controller.expected_state(current, action, **kwargs)
+        if expected is None:
+            return False
+        hold = self._optimistic.get(key.key)
+        if hold is None:
+            hold = self._optimistic[key.key] = _OptimisticHold(current)
+        hold.refs += 1
+        self._publish(expected)
+        return True
+
+    def _release_optimistic(self, key: DeviceKey) -> None:
+        hold = self._optimistic.get(key.key)
+        if hold is None:
+            return
+        hold.refs -= 1
+        if hold.refs > 0:
+            return
+        del self._optimistic[key.key]
+        # 마지막으로 수신한 실제 상태로 정리 (확인 실패 시 자연스럽게 롤백)
+        self._publish(hold.base)
+
+    async def _async_reconcile(self, item: _CmdItem, key: DeviceKey, action: str, kwargs: dict) -> None:
+        ok = False
+        try:
+            ok = bool(await item.future)
+        finally:
+            self._release_optimistic(key)
+        if not ok and item.replaced:
+            # 대체한 명령이 자기 낙관적 상태와 확인을 이어받음
+            LOGGER.debug("Optimistic '%s' for %s superseded before it was sent", action, key)
+            return
+        if not ok:
+            LOGGER.warning("Optimistic '%s' for %s was not confirmed. Rolled back.", action, key)
+            self.hass.bus.async_fire(
+                EVENT_COMMAND_FAILED,
+                {"unique_id": key.unique_id, "action": action, "data": dict(kwargs)},
+            )
+
     def on_device_state(self, dev: DeviceState) -> None:  
+        hold = self._optimistic.get(dev.key.key)
+        if hold is not None:
+            # 낙관적 상태 표시 중에는 실제 상태를 보관만 하고 확인 판정에만 사용
+            hold.base = dev
+            self._notify_pendings(dev)
+            return
+
         allow_insert = True
         if dev.key.device_type in (DeviceType.LIGHT, DeviceType.OUTLET):
-            allow_insert = bool(getattr(dev, "_is_register", True))
-            if getattr(self, "_force_register_uid", None) == dev.key.unique_id:
+            allow_insert = dev.is_register
+            if dev.key.unique_id in self._force_register_uids:
                 allow_insert = True
 
-        is_new, changed = self.registry.upsert(dev, allow_insert=allow_insert)
+        self._publish(dev, allow_insert)
+        self._notify_pendings(dev)
+
+    def _publish(self, dev: DeviceState, allow_insert: bool = True) -> None:
+        latency = self.latency
+        if latency.enabled:
+            t0 = time.perf_counter()
+        is_new, delta = self.registry.upsert(dev, allow_insert=allow_insert)
+        if latency.enabled:
+            t1 = time.perf_counter()
+            latency.record("upsert", t1 - t0, dev.key.device_type)
         if is_new:
             LOGGER.info("New device has been detected. Register -> %s", dev.key)
             async_dispatcher_send(
@@ -195,17 +498,20 @@ class KocomGateway:
                 self.async_signal_new_device(dev.platform),
                 [dev],
             )
-            self._notify_pendings(dev)
-            return
-
-        if changed:
+        elif delta:
             LOGGER.debug("Device state has been changed. Update -> %s", dev.key)
             async_dispatcher_send(
                 self.hass,
                 self.async_signal_device_updated(dev.key.unique_id),
                 dev,
+                delta,
             )
-        self._notify_pendings(dev)
+        else:
+            return
+        if latency.enabled:
+            # 콜백 엔티티의 상태 기록(entity_write)까지 포함
+            latency.record("dispatch", time.perf_counter() - t1, dev.key.device_type)
+        self._schedule_snapshot()
 
     @callback
     def async_signal_new_device(self, platform: Platform) -> str:
@@ -227,44 +533,58 @@ class KocomGateway:
             return
         ent_reg = er.async_get(self.hass)
         ent_entry = ent_reg.async_get(entity_id)
+        uid = None
         if ent_entry and ent_entry.unique_id:
-            self._force_register_uid = ent_entry.unique_id.split(":")[0]
+            uid = ent_entry.unique_id.split(":")[0]
+            self._force_register_uids.add(uid)
         LOGGER.debug("Restore state -> packet: %s", packet)
         self.controller._dispatch_packet(bytes.fromhex(packet))
-        self._force_register_uid = None
+        self._force_register_uids.discard(uid)
         device_storage = state.extra_data.as_dict().get("device_storage", {})
         LOGGER.debug("Restore state -> device_storage: %s", device_storage)
-        self.controller._device_storage = device_storage
+        # 엔티티마다 같은 저장소의 사본을 갖고 있으므로 덮어쓰지 않고 합침
+        self.controller._device_storage.update(device_storage)
+
+    def _apply_snapshot(self, data: dict) -> int:
+        """Rebuild the registry from a stored snapshot; return the number of packets."""
+        self.controller._device_storage.update(data.get("device_storage") or {})
+        self._force_register_uids = set(data.get("registered") or ())
+        packets = decode_packets(data)
+        for packet in packets:
+            self.controller._dispatch_packet(packet)
+        return len(packets)
+
+    def _snapshot_data(self) -> dict:
+        return encode_snapshot(
+            self.controller.last_packets.values(),
+            (uid for devs in self.registry.by_platform.values() for uid in devs),
+            self.controller._device_storage,
+        )
+
+    def _schedule_snapshot(self) -> None:
+        if self._restore_mode:
+            return
+        self.snapshot.async_schedule_save(self._snapshot_data)
 
     async def async_get_entity_registry(self) -> None:
         self._restore_mode = True
         try:
+            data = await self.snapshot.async_load()
+            if data:
+                n = self._apply_snapshot(data)
+                LOGGER.debug("Restored %d packets from snapshot", n)
+                return
+            # 스냅샷이 없으면 (이전 버전에서 업데이트) 엔티티별 복원 데이터 사용
             entity_registry = er.async_get(self.hass)
             entities = er.async_entries_for_config_entry(entity_registry, self.entry.entry_id)
             for entity in entities:
                 await self._async_put_entity_dispatch_packet(entity.entity_id)
         finally:
             self._restore_mode = False
+            self._force_register_uids.clear()
 
     def _notify_pendings(self, dev: DeviceState) -> None:
-        if not self._pendings:
-            return
-        hit: list[_PendingWaiter] = []
-        for p in self._pendings:
-            try:
-                if p.key.key == dev.key.key and p.predicate(dev):
-                    hit.append(p)
-            except Exception:
-                # predicate 내부 오류 방어
-                continue
-        if hit:
-            for p in hit:
-                if not p.future.done():
-                    p.future.set_result(dev)
-                try:
-                    self._pendings.remove(p)
-                except ValueError:
-                    pass
+        self._pendings.notify(dev)
 
     async def _wait_for_confirmation(
         self,
@@ -272,89 +592,207 @@ class KocomGateway:
         predicate: Callable[[DeviceState], bool],
         timeout: float,
     ) -> DeviceState:
-        loop = asyncio.get_running_loop()
-        waiter = _PendingWaiter(key, predicate, loop)
-        self._pendings.append(waiter)
+        waiter = self._pendings.add(key, predicate, timeout)
         try:
-            return await asyncio.wait_for(waiter.future, timeout=timeout)
+            return await waiter.future
         finally:
-            # 타임아웃 등으로 끝났을 때 누수 방지
-            if waiter in self._pendings:
-                try:
-                    self._pendings.remove(waiter)
-                except ValueError:
-                    pass
+            self._pendings.discard(waiter)
+
+    @staticmethod
+    def _is_coalescable(item: _CmdItem) -> bool:
+        return (
+            item.key.device_type in (DeviceType.LIGHT, DeviceType.OUTLET)
+            and item.key.sub_type == SubType.NONE
+            and item.action in ("turn_on", "turn_off")
+        )
+
+    def _take_batch(self, item: _CmdItem) -> list[_CmdItem]:
+        """Pull queued switch commands for the same room into one batch."""
+        if not self._is_coalescable(item):
+            return [item]
+        dt, room = item.key.device_type, item.key.room_index
+        return [item, *self._tx_queue.take_where(
+            lambda o: self._is_coalescable(o)
+            and o.key.device_type == dt
+            and o.key.room_index == room
+        )]
+
+    async def _wait_for_all(
+        self,
+        expects: list[tuple[DeviceKey, Callable[[DeviceState], bool]]],
+        timeout: float,
+    ) -> None:
+        if len(expects) == 1:
+            key, predicate = expects[0]
+            await self._wait_for_confirmation(key, predicate, timeout)
+            return
+        await asyncio.gather(*(
+            self._wait_for_confirmation(key, predicate, timeout) for key, predicate in expects
+        ))
+
+    @staticmethod
+    def _order_key(key: DeviceKey) -> tuple:
+        """Unit within which commands must stay in order.
+
+        Light/outlet frames carry every channel of a room, so the whole room
+        is one unit; other devices are ordered per DeviceKey.
+        """
+        if key.device_type in (DeviceType.LIGHT, DeviceType.OUTLET):
+            return (key.device_type, key.room_index)
+        return key.key
+
+    @staticmethod
+    def _priority_for(key: DeviceKey) -> TxPriority:
+        if key.device_type in SAFETY_DEVICE_TYPES:
+            return TxPriority.SAFETY
+        return TxPriority.NORMAL
+
+    def _is_ready(self, item: _CmdItem) -> bool:
+        if self._order_key(item.key) in self._inflight:
+            return False
+        # 안전 명령은 창(window)이 가득 차 있어도 바로 진행
+        return len(self._inflight) < self._tx_window or item.priority == TxPriority.SAFETY
 
     async def _sender_loop(self) -> None:
         LOGGER.debug("Starting sender loop")
         try:
             while True:
-                item = await self._tx_queue.get()
-                if item is None:
-                    continue
-
-                # generate packet & expect predicate
-                try:
-                    packet, expect_predicate, timeout = self.controller.generate_command(
-                        item.key, item.action, **item.kwargs
-                    )
-                except Exception as e:
-                    LOGGER.exception("generate_command failed: %s", e)
-                    if not item.future.done():
-                        item.future.set_result(False)
-                    self._tx_queue.task_done()
-                    continue
-
-                # 재시도 루프
-                success = False
-                for attempt in range(1, SEND_RETRY_MAX + 1):
-                    # idle 대기 (최대 1초)
-                    LOGGER.debug("TX idle wait (max 1.0s) before '%s'...", item.action)
-                    t0 = asyncio.get_running_loop().time()
-                    while not self.is_idle():
-                        await asyncio.sleep(0.01)
-                        if asyncio.get_running_loop().time() - t0 > 1.0:
-                            LOGGER.debug("Idle wait timeout (%.2fs).", asyncio.get_running_loop().time() - t0)
-                            break
-
-                    # 연결 확인
-                    if not self.conn._is_connected():
-                        LOGGER.warning("Connection not ready. '%s' abort.", item.action)
-                        break
-
-                    # 전송
-                    try:
-                        await self.conn.send(packet)
-                    except Exception as e:
-                        LOGGER.warning("Send failed on attempt %d: %s", attempt, e)
-                        if attempt < SEND_RETRY_MAX:
-                            await asyncio.sleep(SEND_RETRY_GAP)
-                            continue
-                        else:
-                            break
-
-                    self._last_tx_monotonic = asyncio.get_running_loop().time()
-
-                    # 확인 대기
-                    try:
-                        _ = await self._wait_for_confirmation(item.key, expect_predicate, timeout)
-                        LOGGER.debug("Command '%s' confirmed (attempt %d).", item.action, attempt)
-                        success = True
-                        break
-                    except asyncio.TimeoutError:
-                        if attempt < SEND_RETRY_MAX:
-                            LOGGER.warning(
-                                "No confirmation for '%s' (attempt %d/%d). Retrying in %.2fs...",
-                                item.action, attempt, SEND_RETRY_MAX, SEND_RETRY_GAP
-                            )
-                            await asyncio.sleep(SEND_RETRY_GAP)
-                        else:
-                            LOGGER.error("Command '%s' failed after %d attempts.", item.action, SEND_RETRY_MAX)
-
-                if not item.future.done():
-                    item.future.set_result(success)
-
-                self._tx_queue.task_done()
+                item = await self._tx_queue.get(ready=self._is_ready)
+                batch = self._take_batch(item)
+                if self.latency.enabled:
+                    now = time.monotonic()
+                    for it in batch:
+                        self.latency.record("queue_wait", now - it.queued_at, it.key.device_type)
+                order_key = self._order_key(item.key)
+                self._inflight.add(order_key)
+                task = asyncio.create_task(self._run_batch(batch, order_key))
+                self._inflight_tasks.add(task)
+                task.add_done_callback(self._inflight_tasks.discard)
         except asyncio.CancelledError:
             LOGGER.debug("Sender loop cancelled")
             raise
+
+    async def _run_batch(self, batch: list[_CmdItem], order_key: tuple) -> None:
+        success = False
+        try:
+            success = await self._process_batch(batch)
+        except Exception:
+            LOGGER.exception("Command '%s' for %s failed", batch[-1].action, batch[-1].key)
+        finally:
+            self._inflight.discard(order_key)
+            self._tx_queue.kick()
+            for it in batch:
+                it.resolve(success)
+
+    async def _transmit(self, packet: bytes, action: str, key: DeviceKey | None = None) -> float | None:
+        """Send one frame in the next free slot; return the send time, None if the link is down.
+
+        Only one frame is on its way to the line at a time; confirmations
+        are awaited outside the lock so other devices can be served meanwhile.
+        Raises ConnectionError if the write fails (the connection drops the link).
+        """
+        latency = self.latency
+        dev_type = key.device_type if key is not None else None
+        async with self._tx_lock:
+            # idle 대기 (최대 1초)
+            LOGGER.debug("TX slot wait (max 1.0s) before '%s'...", action)
+            if latency.enabled:
+                t0 = time.perf_counter()
+            if not await self._wait_tx_slot(1.0):
+                LOGGER.debug("TX slot wait timeout (1.00s).")
+            if latency.enabled:
+                latency.record("idle_wait", time.perf_counter() - t0, dev_type)
+
+            # 연결 확인 (끊겨 있으면 재연결을 잠시 기다림)
+            if not await self.conn.wait_connected(1.0):
+                return None
+
+            if latency.enabled:
+                t0 = time.perf_counter()
+            sent = await self.conn.send(packet)
+            if not sent:
+                # 쓰기 실패로 연결이 끊김: 확인을 기다리지 않고 재시도 경로로
+                raise ConnectionError("send failed")
+            sent_at = self._last_tx_monotonic = asyncio.get_running_loop().time()
+            # 실제로 회선에 쓴 프레임만 사용률과 캡처에 반영
+            self.bus_stats.tx_frames += 1
+            self.bus_stats.tx_bytes += sent
+            self.capture.add(CAPTURE_TX, packet, time.monotonic())
+            if latency.enabled:
+                latency.record("send", time.perf_counter() - t0, dev_type)
+            # 응답이 직전 상태와 같아도 확인될 수 있도록 캐시 무효화
+            self.controller.invalidate_peer(packet)
+            return sent_at
+
+    async def _process_query(self, item: _CmdItem) -> bool:
+        try:
+            packet, _, _ = self.controller.generate_command(item.key, item.action)
+            return await self._transmit(packet, item.action, item.key) is not None
+        except Exception as e:
+            LOGGER.debug("Query for %s failed: %s", item.key, e)
+            return False
+
+    async def _process_batch(self, batch: list[_CmdItem]) -> bool:
+        item = batch[-1]
+        if item.action == "query":
+            return await self._process_query(item)
+        action = item.action if len(batch) == 1 else f"{item.action} x{len(batch)}"
+
+        # generate packet & expect predicate
+        try:
+            if len(batch) == 1:
+                packet, expect_predicate, timeout = self.controller.generate_command(
+                    item.key, item.action, **item.kwargs
+                )
+                expects = [(item.key, expect_predicate)]
+            else:
+                packet, expects, timeout = self.controller.generate_switch_batch(
+                    [(it.key, it.action) for it in batch]
+                )
+                LOGGER.debug("Coalesced %d switch commands for %s room %d",
+                             len(batch), item.key.device_type.name, item.key.room_index)
+        except Exception as e:
+            LOGGER.exception("generate_command failed: %s", e)
+            return False
+
+        # 재시도 루프 (타임아웃/재시도 간격은 기기별 RTT 추정치로 결정)
+        rtt = self.rtt.get(item.key, timeout)
+        for attempt in range(1, SEND_RETRY_MAX + 1):
+            # 전송
+            try:
+                sent_at = await self._transmit(packet, action, item.key)
+            except Exception as e:
+                LOGGER.warning("Send failed on attempt %d: %s", attempt, e)
+                if attempt < SEND_RETRY_MAX:
+                    self.bus_stats.tx_retries += 1
+                    await asyncio.sleep(rtt.retry_gap)
+                    continue
+                return False
+            if sent_at is None:
+                LOGGER.warning("Connection not ready. '%s' abort.", action)
+                return False
+
+            # 확인 대기
+            try:
+                await self._wait_for_all(expects, rtt.timeout_for(attempt))
+                if self.latency.enabled:
+                    self.latency.record(
+                        "confirm", asyncio.get_running_loop().time() - sent_at, item.key.device_type
+                    )
+                if attempt == 1:
+                    # 재전송된 명령의 RTT 는 모호하므로 첫 시도만 반영 (Karn)
+                    rtt.sample(asyncio.get_running_loop().time() - sent_at)
+                LOGGER.debug("Command '%s' confirmed (attempt %d).", action, attempt)
+                return True
+            except asyncio.TimeoutError:
+                rtt.on_timeout()
+                if attempt < SEND_RETRY_MAX:
+                    self.bus_stats.tx_retries += 1
+                    LOGGER.warning(
+                        "No confirmation for '%s' (attempt %d/%d). Retrying in %.2fs...",
+                        action, attempt, SEND_RETRY_MAX, rtt.retry_gap
+                    )
+                    await asyncio.sleep(rtt.retry_gap)
+                else:
+                    LOGGER.error("Command '%s' failed after %d attempts.", action, SEND_RETRY_MAX)
+        return False
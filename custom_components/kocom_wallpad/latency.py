@@ -0,0 +1,136 @@
+"""Per-stage latency instrumentation for Kocom Wallpad."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+from .const import LATENCY_WINDOW_SEC, DeviceType
+
+# RX: 소켓 수신 -> HA 상태 기록, TX: 대기열 -> 확인
+RX_STAGES = ("rx", "framing", "decode", "upsert", "dispatch", "entity_write", "rx_to_state")
+TX_STAGES = ("queue_wait", "idle_wait", "send", "confirm")
+STAGES = RX_STAGES + TX_STAGES
+
+_BUCKETS = 32  # 마이크로초 단위 2의 거듭제곱 구간 (~35분까지)
+_ALL = "all"
+
+
+class LatencyHistogram:
+    """Log2-bucketed histogram over a rolling window.
+
+    Two buckets sets are kept: the current window and the one before it.
+    Reports cover both, i.e. the last one to two `window` seconds.
+    """
+
+    __slots__ = ("window", "_cur", "_prev", "_started", "_count", "_sum", "_max")
+
+    def __init__(self, window: float = LATENCY_WINDOW_SEC) -> None:
+        self.window = window
+        self._cur = [0] * _BUCKETS
+        self._prev = [0] * _BUCKETS
+        self._started = time.monotonic()
+        self._count = [0, 0]  # [현재, 이전]
+        self._sum = [0.0, 0.0]
+        self._max = [0.0, 0.0]
+
+    def _rotate(self, now: float) -> None:
+        elapsed = now - self._started
+        if elapsed < self.window:
+            return
+        if elapsed < 2 * self.window:
+            self._prev, self._cur = self._cur, self._prev
+            self._count[1], self._sum[1], self._max[1] = self._count[0], self._sum[0], self._max[0]
+        else:
+            # 한 주기 넘게 기록이 없었음: 이전 구간도 비움
+            self._prev[:] = [0] * _BUCKETS
+            self._count[1], self._sum[1], self._max[1] = 0, 0.0, 0.0
+        self._cur[:] = [0] * _BUCKETS
+        self._count[0], self._sum[0], self._max[0] = 0, 0.0, 0.0
+        self._started = now
+
+    def record(self, seconds: float, now: float) -> None:
+        self._rotate(now)
+        us = int(seconds * 1e6)
+        self._cur[min(us.bit_length(), _BUCKETS - 1)] += 1
+        self._count[0] += 1
+        self._sum[0] += seconds
+        if seconds > self._max[0]:
+            self._max[0] = seconds
+
+    def _percentile(self, buckets: list[int], total: int, pct: float) -> float:
+        """Upper bound of the bucket holding the `pct` quantile, in seconds."""
+        rank = pct * total
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= rank:
+                return (1 << i) / 1e6
+        return (1 << (_BUCKETS - 1)) / 1e6
+
+    def as_dict(self, now: Optional[float] = None) -> dict[str, Any]:
+        self._rotate(time.monotonic() if now is None else now)
+        total = self._count[0] + self._count[1]
+        if total == 0:
+            return {"count": 0}
+        buckets = [a + b for a, b in zip(self._cur, self._prev)]
+        return {
+            "count": total,
+            "mean_ms": round((self._sum[0] + self._sum[1]) / total * 1000, 3),
+            "p50_ms": round(self._percentile(buckets, total, 0.50) * 1000, 3),
+            "p95_ms": round(self._percentile(buckets, total, 0.95) * 1000, 3),
+            "p99_ms": round(self._percentile(buckets, total, 0.99) * 1000, 3),
+            "max_ms": round(max(self._max) * 1000, 3),
+        }
+
+
+class LatencyStats:
+    """Rolling latency histograms per stage and device type.
+
+    Hooks are expected to check `enabled` before taking timestamps, so a
+    disabled instance costs one attribute lookup per hook.
+    """
+
+    __slots__ = ("enabled", "window", "_hists", "rx_started")
+
+    def __init__(self, enabled: bool = False, window: float = LATENCY_WINDOW_SEC) -> None:
+        """Initialize the stats."""
+        self.enabled = enabled
+        self.window = window
+        self._hists: dict[str, dict[str, LatencyHistogram]] = {}
+        # 현재 처리 중인 수신 청크의 도착 시각 (rx_to_state 계산용, 0: 없음)
+        self.rx_started = 0.0
+
+    def record(self, stage: str, seconds: float, dev_type: Optional[DeviceType] = None) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        per_type = self._hists.get(stage)
+        if per_type is None:
+            per_type = self._hists[stage] = {}
+        names = (_ALL,) if dev_type is None else (_ALL, dev_type.name.lower())
+        for name in names:
+            hist = per_type.get(name)
+            if hist is None:
+                hist = per_type[name] = LatencyHistogram(self.window)
+            hist.record(seconds, now)
+
+    def stage(self, stage: str) -> dict[str, Any]:
+        """Summary of one stage over all device types."""
+        hist = self._hists.get(stage, {}).get(_ALL)
+        return hist.as_dict() if hist is not None else {"count": 0}
+
+    def clear(self) -> None:
+        self._hists.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "window_s": self.window,
+            "stages": {
+                stage: {name: hist.as_dict(now) for name, hist in self._hists[stage].items()}
+                for stage in STAGES
+                if stage in self._hists
+            },
+        }
@@ -2,85 +2,50 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Tuple, Union
+from dataclasses import dataclass, field
+from typing import Any, Union
 
 from homeassistant.const import Platform
-from homeassistant.components.climate.const import (
-    HVACMode,
-    FAN_LOW,
-    FAN_MEDIUM,
-    FAN_HIGH,
-    FAN_AUTO,
-)
 
-from .const import DeviceType, SubType
+from .protocol import DeviceKey
 
 
-DEVICE_TYPE_MAP = {
-    0x0E: DeviceType.LIGHT,
-    0x3B: DeviceType.OUTLET,
-    0x36: DeviceType.THERMOSTAT,
-    0x39: DeviceType.AIRCONDITIONER,
-    0x48: DeviceType.VENTILATION,
-    0x2C: DeviceType.GASVALVE,
-    0x44: DeviceType.ELEVATOR,
-    0x60: DeviceType.MOTION,
-    0x98: DeviceType.AIRQUALITY,
-}
-
-AIRCONDITIONER_HVAC_MAP = {
-    0x00: HVACMode.COOL,
-    0x01: HVACMode.FAN_ONLY,
-    0x02: HVACMode.DRY,
-    0x03: HVACMode.AUTO
-}
-
-AIRCONDITIONER_FAN_MAP = {
-    0x01: FAN_LOW,
-    0x02: FAN_MEDIUM,
-    0x03: FAN_HIGH,
-    0x04: FAN_AUTO
-}
-
-VENTILATION_PRESET_MAP = {
-    0x00: "unknown",
-    0x01: "ventilation",
-    0x02: "auto",
-    0x03: "bypass",
-    0x05: "sleep",
-    0x09: "air purification"
-}
-
-ELEVATOR_DIRECTION_MAP = {
-    0x00: "idle",
-    0x01: "downward",
-    0x02: "upward",
-    0x03: "arrival"
-}
-
-
-@dataclass(frozen=True)
-class DeviceKey:
-    """Device key."""
-    device_type: DeviceType
-    room_index: int
-    device_index: int
-    sub_type: SubType
-
-    @property
-    def unique_id(self) -> str:
-        return f"{self.device_type.value}-{self.room_index}_{self.device_index}-{self.sub_type.value}"
-
-    @property
-    def key(self) -> Tuple[int, int, int, int]:
-        return (self.device_type.value, self.room_index, self.device_index, self.sub_type.value)
-
-
-@dataclass
+@dataclass(slots=True)
 class DeviceState:
     """Device state."""
     key: DeviceKey
     platform: Platform
-    attribute: dict[str, Any] 
+    attribute: dict[str, Any]
     state: Union[dict[str, Any], bool, int, float, str]
+    packet: bytes = b""          # 이 상태를 만든 원본 패킷 (복원용)
+    is_register: bool = True     # False 이면 레지스트리에 새로 등록하지 않음
+
+
+@dataclass(slots=True)
+class DeviceDelta:
+    """Field-level difference between two device states."""
+    state: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    attribute: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    platform: bool = False
+
+    def __bool__(self) -> bool:
+        return self.platform or bool(self.state) or bool(self.attribute)
+
+    @staticmethod
+    def _diff(old: Any, new: Any, into: dict[str, tuple[Any, Any]], scalar_key: str) -> None:
+        if old == new:
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for k in old.keys() | new.keys():
+                o, n = old.get(k), new.get(k)
+                if o != n:
+                    into[k] = (o, n)
+        else:
+            into[scalar_key] = (old, new)
+
+    @classmethod
+    def between(cls, old: DeviceState, new: DeviceState) -> DeviceDelta:
+        delta = cls(platform=old.platform != new.platform)
+        cls._diff(old.state, new.state, delta.state, "state")
+        cls._diff(old.attribute, new.attribute, delta.attribute, "attribute")
+        return delta
@@ -0,0 +1,90 @@
+"""Kocom RS485 wallpad protocol.
+
+Framing, frame decoding and command encoding with no Home Assistant (or any
+third-party) dependency. Only relative imports are used inside this package,
+so it can also be imported on its own by putting `custom_components/
+kocom_wallpad` on `sys.path` and importing `protocol`.
+"""
+
+from .const import (
+    PACKET_PREFIX,
+    PACKET_SUFFIX,
+    PACKET_LEN,
+    WALLPAD_CODE,
+    CMD_STATUS,
+    CMD_QUERY,
+    DUP_FRAME_MAX_AGE,
+    DEVICE_TYPE_MAP,
+    AIRCONDITIONER_HVAC_MAP,
+    AIRCONDITIONER_FAN_MAP,
+    VENTILATION_PRESET_MAP,
+    ELEVATOR_DIRECTION_MAP,
+    DeviceType,
+    SubType,
+)
+from .key import DeviceKey
+from .frame import PacketFrame, build_frame, checksum, is_valid
+from .framer import Frame, PacketFramer, FrameCache
+from .capture import (
+    CAPTURE_RX,
+    CAPTURE_TX,
+    CapturedFrame,
+    CaptureRing,
+    read_capture,
+)
+from .codec import (
+    AirconStatus,
+    AirQualityStatus,
+    CutoffStatus,
+    ElevatorStatus,
+    GasValveStatus,
+    MotionStatus,
+    Status,
+    SwitchStatus,
+    ThermostatStatus,
+    VentilationStatus,
+    decode,
+    encode_command,
+)
+
+__all__ = [
+    "PACKET_PREFIX",
+    "PACKET_SUFFIX",
+    "PACKET_LEN",
+    "WALLPAD_CODE",
+    "CMD_STATUS",
+    "CMD_QUERY",
+    "DUP_FRAME_MAX_AGE",
+    "DEVICE_TYPE_MAP",
+    "AIRCONDITIONER_HVAC_MAP",
+    "AIRCONDITIONER_FAN_MAP",
+    "VENTILATION_PRESET_MAP",
+    "ELEVATOR_DIRECTION_MAP",
+    "DeviceType",
+    "SubType",
+    "DeviceKey",
+    "PacketFrame",
+    "build_frame",
+    "checksum",
+    "is_valid",
+    "Frame",
+    "PacketFramer",
+    "FrameCache",
+    "CAPTURE_RX",
+    "CAPTURE_TX",
+    "CapturedFrame",
+    "CaptureRing",
+    "read_capture",
+    "AirconStatus",
+    "AirQualityStatus",
+    "CutoffStatus",
+    "ElevatorStatus",
+    "GasValveStatus",
+    "MotionStatus",
+    "Status",
+    "SwitchStatus",
+    "ThermostatStatus",
+    "VentilationStatus",
+    "decode",
+    "encode_command",
+]
@@ -0,0 +1,126 @@
+"""Raw frame capture for the Kocom RS485 protocol.
+
+`CaptureRing` keeps the last N frames seen on the bus in one preallocated
+buffer. `to_bytes()` serializes it to the capture file format below and
+`read_capture()` parses such a file back, e.g. for replaying into a framer.
+
+File layout (little endian):
+
+    header  "KCAP" | version u8 | frame_len u8 | reserved u16 | wall_offset f64 | count u32
+    record  monotonic_ts f64 | direction u8 | frame (frame_len bytes)
+
+Records are in chronological order. `wall_offset` is `time.time() -
+time.monotonic()` at dump time; adding it to a record timestamp gives the
+approximate wall clock time of the frame.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from typing import Iterator, NamedTuple, Optional
+
+from .const import PACKET_LEN
+
+CAPTURE_MAGIC = b"KCAP"
+CAPTURE_VERSION = 1
+CAPTURE_RX = 0
+CAPTURE_TX = 1
+
+DEFAULT_CAPTURE_FRAMES = 4096
+
+_HEADER = struct.Struct("<4sBBHdI")
+_STAMP = struct.Struct("<dB")
+_RECORD_LEN = _STAMP.size + PACKET_LEN
+
+
+class CapturedFrame(NamedTuple):
+    """One record of a capture."""
+    timestamp: float
+    direction: int
+    raw: bytes
+
+
+class CaptureRing:
+    """Fixed-memory ring of raw RX/TX frames with monotonic timestamps.
+
+    `add()` overwrites the oldest slot once the ring is full; it packs the
+    timestamp and copies the frame into the slot, nothing else.
+    """
+
+    __slots__ = ("_buf", "_view", "_cap", "_total")
+
+    def __init__(self, capacity: int = DEFAULT_CAPTURE_FRAMES) -> None:
+        """Initialize the ring."""
+        if capacity < 1:
+            raise ValueError(f"capacity too small: {capacity}")
+        self._buf = bytearray(capacity * _RECORD_LEN)
+        self._view = memoryview(self._buf)
+        self._cap = capacity
+        self._total = 0  # 지금까지 기록한 프레임 수 (덮어쓴 것 포함)
+
+    def __len__(self) -> int:
+        return min(self._total, self._cap)
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def clear(self) -> None:
+        self._total = 0
+
+    def add(self, direction: int, frame: bytes | memoryview, timestamp: float) -> None:
+        """Store one frame; frames that are not exactly PACKET_LEN long are ignored."""
+        if len(frame) != PACKET_LEN:
+            return
+        off = (self._total % self._cap) * _RECORD_LEN
+        _STAMP.pack_into(self._buf, off, timestamp, direction)
+        off += _STAMP.size
+        self._view[off:off + PACKET_LEN] = frame
+        self._total += 1
+
+    def _ordered(self) -> bytes:
+        """Stored records, oldest first, as one contiguous block."""
+        if self._total <= self._cap:
+            return bytes(self._view[:self._total * _RECORD_LEN])
+        split = (self._total % self._cap) * _RECORD_LEN
+        return bytes(self._view[split:]) + bytes(self._view[:split])
+
+    def records(self) -> Iterator[CapturedFrame]:
+        data = self._ordered()
+        for off in range(0, len(data), _RECORD_LEN):
+            yield _unpack_record(data, off)
+
+    def to_bytes(self, wall_offset: Optional[float] = None) -> bytes:
+        """Serialize the ring to the capture file format."""
+        if wall_offset is None:
+            wall_offset = time.time() - time.monotonic()
+        header = _HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, PACKET_LEN, 0, wall_offset, len(self))
+        return header + self._ordered()
+
+
+def _unpack_record(data: bytes, off: int) -> CapturedFrame:
+    timestamp, direction = _STAMP.unpack_from(data, off)
+    start = off + _STAMP.size
+    return CapturedFrame(timestamp, direction, bytes(data[start:start + PACKET_LEN]))
+
+
+def read_capture(data: bytes) -> tuple[float, list[CapturedFrame]]:
+    """Parse a capture file; returns `(wall_offset, records)`."""
+    if len(data) < _HEADER.size:
+        raise ValueError("capture too short")
+    magic, version, frame_len, _, wall_offset, count = _HEADER.unpack_from(data, 0)
+    if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+        raise ValueError(f"not a capture file (magic={magic!r}, version={version})")
+    if frame_len != PACKET_LEN:
+        raise ValueError(f"unsupported frame length: {frame_len}")
+    if len(data) != _HEADER.size + count * _RECORD_LEN:
+        raise ValueError("capture is truncated")
+    return wall_offset, [
+        _unpack_record(data, off)
+        for off in range(_HEADER.size, len(data), _RECORD_LEN)
+    ]
@@ -0,0 +1,318 @@
+"""Payload codec for the Kocom RS485 protocol.
+
+`decode()` turns a status frame into one of the typed results below;
+`encode_command()` builds the frame for a device action. Neither knows about
+Home Assistant: modes and presets are plain strings (see `.const`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+from .const import (
+    WALLPAD_CODE,
+    CMD_STATUS,
+    CMD_QUERY,
+    DEVICE_TYPE_MAP,
+    MODE_OFF,
+    MODE_HEAT,
+    PRESET_AWAY,
+    AIRCONDITIONER_HVAC_MAP,
+    AIRCONDITIONER_FAN_MAP,
+    VENTILATION_PRESET_MAP,
+    ELEVATOR_DIRECTION_MAP,
+    DeviceType,
+)
+from .frame import PacketFrame, build_frame
+from .key import DeviceKey
+
+REV_DT_MAP = {v: k for k, v in DEVICE_TYPE_MAP.items()}
+REV_AC_HVAC_MAP = {v: k for k, v in AIRCONDITIONER_HVAC_MAP.items()}
+REV_AC_FAN_MAP = {v: k for k, v in AIRCONDITIONER_FAN_MAP.items()}
+REV_VENT_PRESET_MAP = {v: k for k, v in VENTILATION_PRESET_MAP.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class SwitchStatus:
+    """Eight channels of a light or outlet controller."""
+    channels: Tuple[bool, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CutoffStatus:
+    """Whole-house light cutoff switch."""
+    on: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ThermostatStatus:
+    """Floor heating room controller."""
+    heating: bool
+    away: bool
+    target_temp: float
+    current_temp: float
+    hot_water_temp: int
+    heating_water_temp: int
+    error_code: int
+
+
+@dataclass(frozen=True, slots=True)
+class AirconStatus:
+    """Air conditioner; `hvac_mode` is "off" while powered down."""
+    hvac_mode: str
+    fan_mode: str
+    current_temp: float
+    target_temp: float
+
+
+@dataclass(frozen=True, slots=True)
+class VentilationStatus:
+    """Heat recovery ventilator."""
+    on: bool
+    preset_mode: str
+    speed: int
+    co2: int
+    error_code: int
+
+
+@dataclass(frozen=True, slots=True)
+class GasValveStatus:
+    """Gas valve; `open` is False once locked."""
+    open: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ElevatorStatus:
+    """Elevator call state, travel direction and floor ("unknown" if not sent)."""
+    called: bool
+    direction: str
+    floor: str
+
+
+@dataclass(frozen=True, slots=True)
+class MotionStatus:
+    """Motion sensor."""
+    detected: bool
+
+
+@dataclass(frozen=True, slots=True)
+class AirQualityStatus:
+    """Air quality sensor readings (0 when the sensor does not report one)."""
+    pm10: int
+    pm25: int
+    co2: int
+    voc: int
+    temperature: int
+    humidity: int
+
+
+Status = Union[
+    SwitchStatus, CutoffStatus, ThermostatStatus, AirconStatus, VentilationStatus,
+    GasValveStatus, ElevatorStatus, MotionStatus, AirQualityStatus,
+]
+
+
+def _decode_switch(frame: PacketFrame) -> Optional[Status]:
+    if frame.dev_type == DeviceType.LIGHT and frame.dev_room == 0xFF:
+        # 일괄 소등 스위치
+        if frame.command in (0x65, 0x66):
+            return CutoffStatus(on=frame.command == 0x65)
+        return None
+    if frame.command == CMD_STATUS:
+        return SwitchStatus(channels=tuple(b == 0xFF for b in frame.payload))
+    return None
+
+
+def _decode_thermostat(frame: PacketFrame) -> Optional[ThermostatStatus]:
+    if frame.command != CMD_STATUS:
+        return None
+    p = frame.payload
+    return ThermostatStatus(
+        heating=p[0] >> 4 == 0x01,
+        away=p[1] & 0x0F == 0x01,
+        target_temp=float(p[2]),
+        current_temp=float(p[4]),
+        hot_water_temp=p[3],
+        heating_water_temp=p[5],
+        error_code=p[6],
+    )
+
+
+def _decode_airconditioner(frame: PacketFrame) -> Optional[AirconStatus]:
+    if frame.command != CMD_STATUS:
+        return None
+    p = frame.payload
+    if p[0] == 0x10:
+        hvac_mode = AIRCONDITIONER_HVAC_MAP.get(p[1], MODE_OFF)
+    else:
+        hvac_mode = MODE_OFF
+    return AirconStatus(
+        hvac_mode=hvac_mode,
+        fan_mode=AIRCONDITIONER_FAN_MAP.get(p[2], AIRCONDITIONER_FAN_MAP[0x01]),
+        current_temp=float(p[4]),
+        target_temp=float(p[5]),
+    )
+
+
+def _decode_ventilation(frame: PacketFrame) -> Optional[VentilationStatus]:
+    if frame.command != CMD_STATUS:
+        return None
+    p = frame.payload
+    return VentilationStatus(
+        on=p[0] >> 4 == 0x01,
+        preset_mode=VENTILATION_PRESET_MAP.get(p[1], "unknown"),
+        speed=p[2],
+        co2=(p[4] * 100) + p[5],
+        error_code=p[6],
+    )
+
+
+def _decode_gasvalve(frame: PacketFrame) -> Optional[GasValveStatus]:
+    if frame.command not in (0x01, 0x02):
+        return None
+    return GasValveStatus(open=frame.command == 0x01)
+
+
+def _decode_elevator(frame: PacketFrame) -> ElevatorStatus:
+    p = frame.payload
+    called = p[0] in (0x01, 0x02) or (p[0] != 0x03 and frame.packet_type == 0x0D)
+    if p[0] == 0x00 and frame.packet_type == 0x0D:
+        direction = "called"
+    else:
+        direction = ELEVATOR_DIRECTION_MAP.get(p[0], "unknown")
+    if p[1] == 0x00:
+        floor = "unknown"
+    elif p[2] != 0x00:
+        floor = f"{chr(p[1])}{chr(p[2])}"
+    elif p[1] >> 4 == 0x08:
+        floor = f"B{p[1] & 0x0F}"
+    else:
+        floor = str(p[1])
+    return ElevatorStatus(called=called, direction=direction, floor=floor)
+
+
+def _decode_motion(frame: PacketFrame) -> Optional[MotionStatus]:
+    if frame.command not in (0x00, 0x04):
+        return None
+    return MotionStatus(detected=frame.command == 0x04)
+
+
+def _decode_airquality(frame: PacketFrame) -> Optional[AirQualityStatus]:
+    if frame.command not in (CMD_STATUS, CMD_QUERY):
+        return None
+    p = frame.payload
+    return AirQualityStatus(
+        pm10=p[0],
+        pm25=p[1],
+        co2=int.from_bytes(p[2:4], "big"),
+        voc=int.from_bytes(p[4:6], "big"),
+        temperature=p[6],
+        humidity=p[7],
+    )
+
+
+DECODERS: dict[DeviceType, Callable[[PacketFrame], Optional[Status]]] = {
+    DeviceType.LIGHT: _decode_switch,
+    DeviceType.OUTLET: _decode_switch,
+    DeviceType.THERMOSTAT: _decode_thermostat,
+    DeviceType.AIRCONDITIONER: _decode_airconditioner,
+    DeviceType.VENTILATION: _decode_ventilation,
+    DeviceType.GASVALVE: _decode_gasvalve,
+    DeviceType.ELEVATOR: _decode_elevator,
+    DeviceType.MOTION: _decode_motion,
+    DeviceType.AIRQUALITY: _decode_airquality,
+}
+
+
+def decode(frame: PacketFrame) -> Optional[Status]:
+    """Decode the payload of `frame`; None if it carries no device state."""
+    decoder = DECODERS.get(frame.dev_type)
+    if decoder is None:
+        return None
+    return decoder(frame)
+
+
+def _encode_ventilation(action: str, data: bytearray, **kwargs: Any) -> None:
+    if action == "set_preset":
+        data[0] = 0x11
+        data[1] = REV_VENT_PRESET_MAP[kwargs["preset_mode"]]
+    elif action == "set_percentage":
+        speed = kwargs["speed"]
+        data[0] = 0x00 if speed == 0 else 0x11
+        data[2] = speed
+    else:
+        data[0] = 0x11 if action == "turn_on" else 0x00
+
+
+def _encode_thermostat(action: str, data: bytearray, **kwargs: Any) -> None:
+    if action == "set_hvac":
+        data[0] = 0x11 if kwargs["hvac_mode"] == MODE_HEAT else 0x00
+        data[1] = 0x00
+    elif action == "set_preset":
+        data[0] = 0x11
+        data[1] = 0x01 if kwargs["preset_mode"] == PRESET_AWAY else 0x00
+    elif action == "set_temperature":
+        data[0] = 0x11
+        data[2] = int(kwargs["target_temp"])
+
+
+def _encode_airconditioner(action: str, data: bytearray, **kwargs: Any) -> None:
+    if action == "set_hvac":
+        hm = kwargs["hvac_mode"]
+        if hm == MODE_OFF:
+            data[0] = 0x00
+        else:
+            data[0] = 0x10
+            data[1] = REV_AC_HVAC_MAP[hm]
+    elif action == "set_fan":
+        data[0] = 0x10
+        data[2] = REV_AC_FAN_MAP[kwargs["fan_mode"]]
+    elif action == "set_temperature":
+        data[0] = 0x10
+        data[5] = int(kwargs["target_temp"])
+
+
+def encode_command(
+    key: DeviceKey,
+    action: str,
+    channels: Optional[Sequence[bool]] = None,
+    **kwargs: Any,
+) -> bytes:
+    """Build the frame that performs `action` on `key`.
+
+    Lights and outlets are written a room at a time, so `channels` must hold
+    the desired state of all eight channels of the room.
+    """
+    device_type = key.device_type
+    if device_type not in REV_DT_MAP:
+        raise ValueError(f"Invalid device type: {device_type}")
+
+    dest = (REV_DT_MAP[device_type], key.room_index)
+    src = (WALLPAD_CODE, 0x00)
+    command = CMD_STATUS
+    data = bytearray(8)
+
+    if action == "query":
+        command = CMD_QUERY
+    elif device_type in (DeviceType.LIGHT, DeviceType.OUTLET):
+        if channels is None or len(channels) != 8:
+            raise ValueError("channels must give the state of all 8 channels")
+        for idx, on in enumerate(channels):
+            data[idx] = 0xFF if on else 0x00
+    elif device_type == DeviceType.VENTILATION:
+        _encode_ventilation(action, data, **kwargs)
+    elif device_type == DeviceType.THERMOSTAT:
+        _encode_thermostat(action, data, **kwargs)
+    elif device_type == DeviceType.AIRCONDITIONER:
+        _encode_airconditioner(action, data, **kwargs)
+    elif device_type == DeviceType.GASVALVE:
+        command = 0x02
+    elif device_type == DeviceType.ELEVATOR:
+        # 엘리베이터 호출은 기기가 월패드에 보내는 형식으로 보냄
+        dest, src = (WALLPAD_CODE, 0x00), (REV_DT_MAP[device_type], key.room_index)
+        command = 0x01
+    else:
+        raise ValueError(f"Invalid device generator: {device_type}")
+
+    return build_frame(dest, src, command, data)
@@ -0,0 +1,98 @@
+"""Constants for the Kocom RS485 protocol."""
+
+from __future__ import annotations
+
+import logging
+from enum import IntEnum
+
+LOGGER = logging.getLogger(__package__)
+
+PACKET_PREFIX = bytes([0xAA, 0x55])
+PACKET_SUFFIX = bytes([0x0D, 0x0D])
+PACKET_LEN = 21
+PACKET_TYPE = bytes([0x30, 0xBC])  # 월패드가 보내는 명령 프레임의 헤더
+
+WALLPAD_CODE = 0x01  # 월패드 자신의 기기 코드
+CMD_STATUS = 0x00
+CMD_QUERY = 0x3A  # 상태 조회 명령
+DUP_FRAME_MAX_AGE = 60.0  # 동일 프레임이라도 이 시간이 지나면 다시 처리 (0 이하: 비활성)
+
+
+class DeviceType(IntEnum):
+    """Device types."""
+    UNKNOWN = 0
+    LIGHT = 1
+    LIGHTCUTOFF = 2
+    DIMMINGLIGHT = 3
+    OUTLET = 4
+    THERMOSTAT = 5
+    AIRCONDITIONER = 6
+    VENTILATION = 7
+    GASVALVE = 8
+    ELEVATOR = 9
+    MOTION = 10
+    AIRQUALITY = 11
+
+
+class SubType(IntEnum):
+    """Sub types."""
+    NONE = 0
+    DIRECTION = 1
+    FLOOR = 2
+    ERRCODE = 3
+    HEATTEMP = 4
+    HOTTEMP = 5
+    CO2 = 6
+    PM10 = 7
+    PM25 = 8
+    VOC = 9
+    TEMP = 10
+    HUMIDITY = 11
+
+
+DEVICE_TYPE_MAP = {
+    0x0E: DeviceType.LIGHT,
+    0x3B: DeviceType.OUTLET,
+    0x36: DeviceType.THERMOSTAT,
+    0x39: DeviceType.AIRCONDITIONER,
+    0x48: DeviceType.VENTILATION,
+    0x2C: DeviceType.GASVALVE,
+    0x44: DeviceType.ELEVATOR,
+    0x60: DeviceType.MOTION,
+    0x98: DeviceType.AIRQUALITY,
+}
+
+# 모드 이름은 Home Assistant 의 HVACMode / FAN_* / PRESET_* 값과 같은 문자열
+MODE_OFF = "off"
+MODE_HEAT = "heat"
+PRESET_AWAY = "away"
+
+AIRCONDITIONER_HVAC_MAP = {
+    0x00: "cool",
+    0x01: "fan_only",
+    0x02: "dry",
+    0x03: "auto",
+}
+
+AIRCONDITIONER_FAN_MAP = {
+    0x01: "low",
+    0x02: "medium",
+    0x03: "high",
+    0x04: "auto",
+}
+
+VENTILATION_PRESET_MAP = {
+    0x00: "unknown",
+    0x01: "ventilation",
+    0x02: "auto",
+    0x03: "bypass",
+    0x05: "sleep",
+    0x09: "air purification"
+}
+
+ELEVATOR_DIRECTION_MAP = {
+    0x00: "idle",
+    0x01: "downward",
+    0x02: "upward",
+    0x03: "arrival"
+}
@@ -0,0 +1,86 @@
+"""Frame layout for the Kocom RS485 protocol.
+
+    AA 55 | 30 BC | 00 | dest(2) | src(2) | cmd | data(8) | checksum | 0D 0D
+
+The checksum is the byte sum of offsets 2..17 modulo 256. Device addresses
+are (code, room) pairs; the wallpad itself is code 0x01.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .const import (
+    LOGGER,
+    PACKET_PREFIX,
+    PACKET_SUFFIX,
+    PACKET_TYPE,
+    WALLPAD_CODE,
+    CMD_STATUS,
+    CMD_QUERY,
+    DEVICE_TYPE_MAP,
+    DeviceType,
+)
+
+
+def checksum(body: bytes) -> int:
+    """Checksum of the bytes between prefix and checksum (offsets 2..17)."""
+    return sum(body) % 256
+
+
+def is_valid(raw: bytes) -> bool:
+    """Return True if the checksum of a 21-byte frame matches."""
+    return checksum(raw[2:18]) == raw[18]
+
+
+def build_frame(
+    dest: tuple[int, int], src: tuple[int, int], command: int, data: bytes = bytes(8)
+) -> bytes:
+    """Assemble a complete frame from addresses, command and 8 data bytes."""
+    if len(data) != 8:
+        raise ValueError(f"data must be 8 bytes: {len(data)}")
+    body = PACKET_TYPE + bytes([
+        0x00, dest[0], dest[1] & 0xFF, src[0], src[1] & 0xFF, command,
+    ]) + bytes(data)
+    return PACKET_PREFIX + body + bytes([checksum(body)]) + PACKET_SUFFIX
+
+
+class PacketFrame:
+    """Packet frame (header decoded once)."""
+
+    __slots__ = (
+        "raw", "packet_type", "command", "payload", "checksum",
+        "dev_code", "dev_room", "dev_type",
+    )
+
+    def __init__(self, raw: bytes, dev_type: Optional[DeviceType] = None) -> None:
+        self.raw = raw
+        self.packet_type = (raw[3] >> 4) & 0x0F
+        self.command = raw[9]
+        self.payload = raw[10:18]
+        self.checksum = raw[18]
+        if raw[5] == WALLPAD_CODE:
+            self.dev_code, self.dev_room = raw[7], raw[8]
+            if self.command == CMD_QUERY:
+                # 조회에 대한 기기 응답은 상태 프레임과 같은 형식
+                self.command = CMD_STATUS
+        elif raw[7] == WALLPAD_CODE:
+            self.dev_code, self.dev_room = raw[5], raw[6]
+        else:
+            LOGGER.debug("Peer resolution failed: dest=%s, src=%s", raw[5:7].hex(), raw[7:9].hex())
+            self.dev_code, self.dev_room = 0, 0
+        if dev_type is None:
+            dev_type = DEVICE_TYPE_MAP.get(self.dev_code, DeviceType.UNKNOWN)
+        self.dev_type = dev_type
+
+    @property
+    def dest(self) -> bytes:
+        return self.raw[5:7]
+
+    @property
+    def src(self) -> bytes:
+        return self.raw[7:9]
+
+    @property
+    def peer(self) -> tuple[int, int]:
+        return (self.dev_code, self.dev_room)
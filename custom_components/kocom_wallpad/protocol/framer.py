@@ -0,0 +1,251 @@
+"""RX stream framing for the Kocom RS485 protocol."""
+
+from __future__ import annotations
+
+from typing import List, Union
+
+from .const import PACKET_PREFIX, PACKET_SUFFIX, PACKET_LEN, DUP_FRAME_MAX_AGE
+
+_PREFIX_0 = PACKET_PREFIX[0]
+_PREFIX_1 = PACKET_PREFIX[1]
+_SUFFIX_0 = PACKET_SUFFIX[0]
+_SUFFIX_1 = PACKET_SUFFIX[1]
+
+DEFAULT_CAPACITY = 4096
+_ALIGNED_MIN_BYTES = 4 * PACKET_LEN  # 프레임 4개 이상이 정렬된 청크는 경계를 한꺼번에 검사
+
+
+# 프레이머가 돌려주는 프레임: 수신 청크의 bytes 조각 또는 내부 버퍼의 memoryview
+Frame = Union[bytes, memoryview]
+
+
+class PacketFramer:
+    """Fixed-capacity ring buffer that splits the RX stream into frames.
+
+    `feed()` returns the frames found in a list. When nothing was pending
+    and `chunk` is `bytes`, frames are sliced straight out of the chunk
+    (`bytes`, the one copy a caller keeping the frame needs anyway) and only
+    an incomplete tail is buffered. Otherwise they are `memoryview` slices
+    into the internal buffer, valid only until the next call to `feed()`;
+    copy them (`bytes(frame)`) to keep them.
+    """
+
+    __slots__ = ("_buf", "_view", "_cap", "_r", "_w", "dropped")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize the framer."""
+        if capacity < PACKET_LEN * 2:
+            raise ValueError(f"capacity too small: {capacity}")
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._cap = capacity
+        self._r = 0  # 읽기 오프셋
+        self._w = 0  # 쓰기 오프셋
+        self.dropped = 0  # 재동기화로 버린 바이트 수
+
+    def __len__(self) -> int:
+        return self._w - self._r
+
+    def clear(self) -> None:
+        self._r = self._w = 0
+
+    def feed(self, chunk: bytes) -> List[Frame]:
+        """Append `chunk` and return every complete frame found."""
+        total = len(chunk)
+        w = self._w
+        end = w + total
+        if end - self._r < PACKET_LEN and end <= self._cap:
+            # 프레임 하나 분량이 모이기 전에는 복사만 (1바이트 조각 수신)
+            self._view[w:end] = chunk
+            self._w = end
+            return []
+        if total >= PACKET_LEN and type(chunk) is bytes:
+            return self._feed_bytes(chunk, total)
+        if self._cap - w < total:
+            return self._feed_split(chunk)
+        # bytearray 슬라이스 대입보다 memoryview 대입이 빠름
+        self._view[w:end] = chunk
+        self._w = end
+        return self._scan()
+
+    def _feed_bytes(self, chunk: bytes, total: int) -> List[Frame]:
+        """Split a `bytes` chunk holding at least one frame's worth of data.
+
+        Only a frame straddling the previous chunk is assembled in the
+        buffer; everything after it is sliced straight out of `chunk`.
+        """
+        frames: List[Frame] = []
+        pos = 0
+        if self._w != self._r:
+            # 남은 바이트(PACKET_LEN 미만)에서 시작한 프레임은 청크 앞 PACKET_LEN - 1 바이트 안에서 끝남
+            pos = PACKET_LEN - 1
+            self._reserve(pos)
+            w = self._w
+            self._view[w:w + pos] = chunk[:pos]
+            self._w = w + pos
+            r = self._split(self._buf, self._view, self._r, self._w, frames)
+            if frames:
+                # 아래에서 버퍼를 다시 쓰므로 복사
+                frames = [bytes(v) for v in frames]
+            pos = r - w
+        elif (
+            total >= _ALIGNED_MIN_BYTES
+            and total % PACKET_LEN == 0
+            and self._aligned(chunk, total // PACKET_LEN)
+        ):
+            # 읽기가 프레임 경계에서 시작하고 끝나는 흔한 경우
+            return [chunk[i:i + PACKET_LEN] for i in range(0, total, PACKET_LEN)]
+        r = self._split(chunk, chunk, pos, total, frames)
+        tail = total - r
+        if tail:
+            self._view[0:tail] = chunk[r:]
+        self._r, self._w = 0, tail
+        return frames
+
+    @staticmethod
+    def _aligned(chunk: bytes, count: int) -> bool:
+        """True if `chunk` is exactly `count` back-to-back frames (prefix and suffix in place)."""
+        return (
+            chunk[0::PACKET_LEN].count(_PREFIX_0) == count
+            and chunk[1::PACKET_LEN].count(_PREFIX_1) == count
+            and chunk[PACKET_LEN - 2::PACKET_LEN].count(_SUFFIX_0) == count
+            and chunk[PACKET_LEN - 1::PACKET_LEN].count(_SUFFIX_1) == count
+        )
+
+    def _feed_split(self, chunk: bytes) -> List[Frame]:
+        """Slow path for a chunk that does not fit behind the pending bytes.
+
+        The chunk is written in pieces, and each piece may overwrite the
+        buffer space of frames found earlier, so those are copied to `bytes`.
+        """
+        frames: List[Frame] = []
+        total = len(chunk)
+        pos = 0
+        while pos < total:
+            n = self._reserve(total - pos)
+            w = self._w
+            self._view[w:w + n] = chunk[pos:pos + n]
+            self._w = w + n
+            pos += n
+            if self._w - self._r >= PACKET_LEN:
+                frames.extend(bytes(v) for v in self._scan())
+        return frames
+
+    def _reserve(self, want: int) -> int:
+        """Make room at the tail and return how many bytes may be written."""
+        if self._cap - self._w >= want:
+            return want
+        pending = self._w - self._r
+        if self._r > 0:
+            # 미처리 바이트(보통 PACKET_LEN 미만)만 앞으로 당김
+            self._view[0:pending] = self._view[self._r:self._w]
+            self._r, self._w = 0, pending
+        free = self._cap - self._w
+        if free == 0:
+            # 프레임 없이 버퍼가 가득 참: 전부 폐기
+            self.dropped += pending
+            self._r = self._w = 0
+            free = self._cap
+        return min(want, free)
+
+    def _scan(self) -> List[Frame]:
+        frames: List[Frame] = []
+        r = self._split(self._buf, self._view, self._r, self._w, frames)
+        if r == self._w:
+            self._r = self._w = 0
+        else:
+            self._r = r
+        return frames
+
+    def _split(self, data: bytes | bytearray, source: Frame, r: int, w: int, frames: List[Frame]) -> int:
+        """Append the frames in `data[r:w]` (sliced from `source`); return the new read offset."""
+        dropped = 0
+        while True:
+            end = r + PACKET_LEN
+            if (
+                end <= w
+                and data[r] == _PREFIX_0 and data[r + 1] == _PREFIX_1
+                and data[end - 2] == _SUFFIX_0 and data[end - 1] == _SUFFIX_1
+            ):
+                # 프레임이 바로 이어지는 경우 검색 없이 잘라냄
+                frames.append(source[r:end])
+                r = end
+                if r == w:
+                    break
+                continue
+            start = data.find(PACKET_PREFIX, r, w)
+            if start < 0:
+                # 마지막 바이트가 프리픽스의 앞부분일 수 있으니 남겨둠
+                keep = 1 if data[w - 1] == _PREFIX_0 else 0
+                dropped += (w - r) - keep
+                r = w - keep
+                break
+            dropped += start - r
+            r = start
+            end = r + PACKET_LEN
+            if end > w:
+                # 더 받을 때까지 대기
+                break
+            if data[end - 2] != _SUFFIX_0 or data[end - 1] != _SUFFIX_1:
+                # 한 바이트 밀어서 재탐색 (프레이밍 어긋남 복구)
+                dropped += 1
+                r += 1
+                continue
+            frames.append(source[r:end])
+            r = end
+        if dropped:
+            self.dropped += dropped
+        return r
+
+
+class FrameCache:
+    """Per-peer cache of the last frame seen for each command.
+
+    The wallpad re-broadcasts unchanged status frames every poll cycle; an
+    identical frame seen again within `max_age` seconds is reported as a hit
+    so the caller can drop it before any handler runs.
+    """
+
+    __slots__ = ("max_age", "_peers", "hits", "misses")
+
+    def __init__(self, max_age: float = DUP_FRAME_MAX_AGE) -> None:
+        """Initialize the cache."""
+        self.max_age = max_age
+        self._peers: dict[tuple[int, int], dict[int, tuple[float, int, bytes]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def seen(self, code: int, room: int, command: int, ptype: int, payload: bytes, now: float) -> bool:
+        """Record the frame and return True if it duplicates the last one."""
+        if self.max_age <= 0:
+            return False
+        peer = self._peers.get((code, room))
+        if peer is None:
+            peer = self._peers[(code, room)] = {}
+        last = peer.get(command)
+        if (
+            last is not None
+            and last[1] == ptype
+            and last[2] == payload
+            and now - last[0] < self.max_age
+        ):
+            self.hits += 1
+            return True
+        peer[command] = (now, ptype, payload)
+        self.misses += 1
+        return False
+
+    def invalidate(self, code: int, room: int) -> None:
+        """Forget a peer so its next frame is always processed."""
+        self._peers.pop((code, room), None)
+
+    def clear(self) -> None:
+        self._peers.clear()
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "max_age": self.max_age,
+            "peers": len(self._peers),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
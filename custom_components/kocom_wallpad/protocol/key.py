@@ -0,0 +1,74 @@
+"""Device keys for the Kocom RS485 protocol."""
+
+from __future__ import annotations
+
+from typing import Any, ClassVar, Tuple
+
+from .const import DeviceType, SubType
+
+
+class DeviceKey:
+    """Device key (interned: equal keys are the same object)."""
+
+    __slots__ = ("device_type", "room_index", "device_index", "sub_type", "key", "unique_id")
+
+    _interned: ClassVar[dict[Tuple[int, int, int, int], DeviceKey]] = {}
+
+    device_type: DeviceType
+    room_index: int
+    device_index: int
+    sub_type: SubType
+    key: Tuple[int, int, int, int]
+    unique_id: str
+
+    def __new__(
+        cls,
+        device_type: DeviceType,
+        room_index: int,
+        device_index: int,
+        sub_type: SubType,
+    ) -> DeviceKey:
+        key = (device_type.value, room_index, device_index, sub_type.value)
+        self = cls._interned.get(key)
+        if self is not None:
+            return self
+        self = object.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(self, "device_type", device_type)
+        setattr_(self, "room_index", room_index)
+        setattr_(self, "device_index", device_index)
+        setattr_(self, "sub_type", sub_type)
+        setattr_(self, "key", key)
+        setattr_(self, "unique_id", f"{key[0]}-{room_index}_{device_index}-{key[3]}")
+        cls._interned[key] = self
+        return self
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, DeviceKey):
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __reduce__(self):
+        return (DeviceKey, (self.device_type, self.room_index, self.device_index, self.sub_type))
+
+    def __repr__(self) -> str:
+        return (
+            f"DeviceKey(device_type={self.device_type!r}, room_index={self.room_index}, "
+            f"device_index={self.device_index}, sub_type={self.sub_type!r})"
+        )
+
+    def replace(self, **changes: Any) -> DeviceKey:
+        return DeviceKey(
+            changes.get("device_type", self.device_type),
+            changes.get("room_index", self.room_index),
+            changes.get("device_index", self.device_index),
+            changes.get("sub_type", self.sub_type),
+        )
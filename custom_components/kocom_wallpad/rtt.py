@@ -0,0 +1,88 @@
+"""Round-trip time estimation for Kocom Wallpad."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    SEND_RETRY_GAP,
+    RTT_MIN_TIMEOUT,
+    RTT_MAX_TIMEOUT,
+    RTT_MIN_RETRY_GAP,
+    DeviceType,
+)
+from .models import DeviceKey
+
+_ALPHA = 0.125  # RFC 6298
+_BETA = 0.25
+_K = 4
+_G = 0.05       # 타이머 해상도 하한
+_BACKOFF = 1.5  # 재시도마다 타임아웃 증가 배수
+
+
+class RttEstimator:
+    """SRTT/RTTVAR estimator for command confirmations of one device."""
+
+    __slots__ = ("srtt", "rttvar", "timeout", "samples", "timeouts")
+
+    def __init__(self, initial_timeout: float) -> None:
+        self.srtt = 0.0
+        self.rttvar = 0.0
+        self.timeout = initial_timeout
+        self.samples = 0
+        self.timeouts = 0
+
+    def sample(self, rtt: float) -> None:
+        """Feed one measured send -> confirmation time (first attempts only)."""
+        if self.samples == 0:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - _BETA) * self.rttvar + _BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - _ALPHA) * self.srtt + _ALPHA * rtt
+        self.samples += 1
+        self.timeout = min(RTT_MAX_TIMEOUT, max(RTT_MIN_TIMEOUT, self.srtt + max(_G, _K * self.rttvar)))
+
+    def timeout_for(self, attempt: int) -> float:
+        """Confirmation timeout for the n-th attempt (backs off on retries)."""
+        return min(RTT_MAX_TIMEOUT, self.timeout * _BACKOFF ** (attempt - 1))
+
+    def on_timeout(self) -> None:
+        self.timeouts += 1
+
+    @property
+    def retry_gap(self) -> float:
+        if self.samples == 0:
+            return SEND_RETRY_GAP
+        return min(SEND_RETRY_GAP, max(RTT_MIN_RETRY_GAP, 2 * self.rttvar))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "srtt_ms": round(self.srtt * 1000, 1),
+            "rttvar_ms": round(self.rttvar * 1000, 1),
+            "timeout_ms": round(self.timeout * 1000, 1),
+            "retry_gap_ms": round(self.retry_gap * 1000, 1),
+            "samples": self.samples,
+            "timeouts": self.timeouts,
+        }
+
+
+class RttTable:
+    """Per (device type, room) round-trip estimators."""
+
+    def __init__(self) -> None:
+        """Initialize the table."""
+        self._estimators: dict[tuple[DeviceType, int], RttEstimator] = {}
+
+    def get(self, key: DeviceKey, initial_timeout: float) -> RttEstimator:
+        k = (key.device_type, key.room_index)
+        est = self._estimators.get(k)
+        if est is None:
+            est = self._estimators[k] = RttEstimator(initial_timeout)
+        return est
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            f"{dt.name.lower()}_{room}": est.as_dict()
+            for (dt, room), est in sorted(self._estimators.items())
+        }
@@ -0,0 +1,202 @@
+"""Transmit scheduling for Kocom Wallpad."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Generic, Hashable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_ALPHA = 0.125  # 대기 시간 EWMA 가중치
+
+
+class _ClassStats:
+
+    __slots__ = ("depth", "served", "wait_avg", "wait_max")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.served = 0
+        self.wait_avg = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        if self.served == 0:
+            self.wait_avg = wait
+        else:
+            self.wait_avg += _ALPHA * (wait - self.wait_avg)
+        self.wait_max = max(self.wait_max, wait)
+        self.served += 1
+
+
+class CommandQueue(Generic[T]):
+    """Priority transmit queue with superseding and selective removal.
+
+    Items are served by class (`priority`, lower first). Within a class, the
+    `group`s (e.g. device types) take turns so one busy group cannot starve
+    the others; within a group items stay FIFO.
+
+    When `supersede_key` is given, putting an item whose key matches one that
+    is still queued drops that item and returns it, so only the newest value
+    reaches the bus. The new item goes to the tail like any other put, so
+    it is never sent ahead of commands queued after the one it replaced.
+    """
+
+    def __init__(
+        self,
+        supersede_key: Optional[Callable[[T], Hashable]] = None,
+        priority: Optional[Callable[[T], int]] = None,
+        group: Optional[Callable[[T], Hashable]] = None,
+    ) -> None:
+        """Initialize the queue."""
+        # 클래스 -> 그룹 -> [item, 대기열 진입 시각] 슬롯
+        self._classes: dict[int, OrderedDict[Hashable, deque[list]]] = {}
+        self._index: dict[Hashable, list] = {}
+        self._supersede_key = supersede_key
+        self._priority = priority
+        self._group = group
+        self._stats: dict[int, _ClassStats] = {}
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return sum(st.depth for st in self._stats.values())
+
+    def _slots(self) -> Iterator[list]:
+        for cls in sorted(self._classes):
+            for slots in self._classes[cls].values():
+                yield from slots
+
+    def put_nowait(self, item: T) -> Optional[T]:
+        """Queue `item`; return the item it superseded, if any."""
+        replaced: Optional[T] = None
+        queued_at = time.monotonic()
+        if self._supersede_key is not None:
+            k = self._supersede_key(item)
+            old = self._index.get(k)
+            if old is not None:
+                # 이전 슬롯 자리에 넣으면 그 뒤에 들어온 다른 동작보다 먼저 나가므로 꼬리로 보냄
+                self._discard(old)
+                replaced = old[0]
+                queued_at = old[1]  # 대기 시간 통계는 처음 진입한 시각 기준
+            slot = [item, queued_at]
+            self._index[k] = slot
+        else:
+            slot = [item, queued_at]
+        cls = self._priority(item) if self._priority is not None else 0
+        grp = self._group(item) if self._group is not None else None
+        groups = self._classes.setdefault(cls, OrderedDict())
+        slots = groups.get(grp)
+        if slots is None:
+            slots = groups[grp] = deque()
+        slots.append(slot)
+        stats = self._stats.get(cls)
+        if stats is None:
+            stats = self._stats[cls] = _ClassStats()
+        stats.depth += 1
+        self._wakeup.set()
+        return replaced
+
+    def _discard(self, slot: list) -> None:
+        """Remove a queued slot without counting it as served."""
+        item = slot[0]
+        cls = self._priority(item) if self._priority is not None else 0
+        grp = self._group(item) if self._group is not None else None
+        groups = self._classes[cls]
+        slots = groups[grp]
+        for i, other in enumerate(slots):
+            if other is slot:
+                del slots[i]
+                break
+        if not slots:
+            del groups[grp]
+        self._stats[cls].depth -= 1
+
+    def _unindex(self, slot: list) -> None:
+        if self._supersede_key is not None:
+            k = self._supersede_key(slot[0])
+            if self._index.get(k) is slot:
+                del self._index[k]
+
+    def _served(self, cls: int, slot: list) -> None:
+        self._unindex(slot)
+        stats = self._stats[cls]
+        stats.depth -= 1
+        stats.record_wait(time.monotonic() - slot[1])
+
+    def _pop(self, cls: int, grp: Hashable, i: int) -> T:
+        groups = self._classes[cls]
+        slots = groups[grp]
+        slot = slots[i]
+        del slots[i]
+        if slots:
+            # 방금 처리한 그룹은 뒤로 보내 다른 그룹에 차례를 넘김
+            groups.move_to_end(grp)
+        else:
+            del groups[grp]
+        self._served(cls, slot)
+        return slot[0]
+
+    def _find(self, ready: Optional[Callable[[T], bool]]) -> tuple[int, Hashable, int] | None:
+        for cls in sorted(self._classes):
+            for grp, slots in self._classes[cls].items():
+                if ready is None:
+                    return cls, grp, 0
+                for i, slot in enumerate(slots):
+                    if ready(slot[0]):
+                        return cls, grp, i
+        return None
+
+    def kick(self) -> None:
+        """Wake `get()` so it re-evaluates its `ready` predicate."""
+        self._wakeup.set()
+
+    async def get(self, ready: Optional[Callable[[T], bool]] = None) -> T:
+        """Remove and return the next item, or the next one `ready` accepts.
+
+        Items `ready` rejects stay queued in their position; call `kick()`
+        when the condition behind `ready` changes.
+        """
+        while True:
+            found = self._find(ready)
+            if found is not None:
+                return self._pop(*found)
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    def contains_where(self, predicate: Callable[[T], bool]) -> bool:
+        """Return True if any queued item matches `predicate`."""
+        return any(predicate(slot[0]) for slot in self._slots())
+
+    def take_where(self, predicate: Callable[[T], bool]) -> List[T]:
+        """Remove and return every queued item matching `predicate`, in order."""
+        taken: List[T] = []
+        for cls in sorted(self._classes):
+            groups = self._classes[cls]
+            for grp in tuple(groups):
+                slots = groups[grp]
+                kept: deque[list] = deque()
+                for slot in slots:
+                    if predicate(slot[0]):
+                        self._served(cls, slot)
+                        taken.append(slot[0])
+                    else:
+                        kept.append(slot)
+                if not kept:
+                    del groups[grp]
+                elif len(kept) != len(slots):
+                    groups[grp] = kept
+        return taken
+
+    def as_dict(self, names: Optional[Callable[[int], str]] = None) -> dict[str, Any]:
+        """Per-class depth and wait-time metrics."""
+        return {
+            (names(cls) if names is not None else str(cls)): {
+                "depth": st.depth,
+                "served": st.served,
+                "wait_avg_ms": round(st.wait_avg * 1000, 1),
+                "wait_max_ms": round(st.wait_max * 1000, 1),
+            }
+            for cls, st in sorted(self._stats.items())
+        }
@@ -7,9 +7,10 @@ from typing import Any, List
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
+    SensorStateClass,
 )
 
-from homeassistant.const import Platform
+from homeassistant.const import Platform, UnitOfDataRate, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -17,9 +18,23 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .gateway import KocomGateway
 from .models import DeviceState
-from .entity_base import KocomBaseEntity
+from .entity_base import KocomBaseEntity, KocomGatewayEntity
+from .latency import STAGES
 from .const import DOMAIN, LOGGER
 
+# (지표, 번역 키, 단위, device class, state class)
+BUS_SENSORS = (
+    ("rx_bytes_per_s", "bus-rx-bytes-rate", UnitOfDataRate.BYTES_PER_SECOND,
+     SensorDeviceClass.DATA_RATE, SensorStateClass.MEASUREMENT),
+    ("rx_frames_per_s", "bus-rx-frames-rate", "frames/s", None, SensorStateClass.MEASUREMENT),
+    ("checksum_errors", "bus-checksum-errors", None, None, SensorStateClass.TOTAL_INCREASING),
+    ("resync_dropped", "bus-resync-dropped", UnitOfInformation.BYTES,
+     SensorDeviceClass.DATA_SIZE, SensorStateClass.TOTAL_INCREASING),
+    ("unknown_codes", "bus-unknown-codes", None, None, SensorStateClass.TOTAL_INCREASING),
+    ("tx_retries", "bus-tx-retries", None, None, SensorStateClass.TOTAL_INCREASING),
+    ("reconnects", "bus-reconnects", None, None, SensorStateClass.TOTAL_INCREASING),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -49,6 +64,10 @@ async def async_setup_entry(
     )
     async_add_sensor()
 
+    async_add_entities(KocomBusSensor(gateway, *spec) for spec in BUS_SENSORS)
+    if gateway.latency.enabled:
+        async_add_entities(KocomLatencySensor(gateway, stage) for stage in STAGES)
+
 
 class KocomSensor(KocomBaseEntity, SensorEntity):
     """Representation of a Kocom sensor."""
@@ -68,3 +87,53 @@ class KocomSensor(KocomBaseEntity, SensorEntity):
     @property
     def native_unit_of_measurement(self) -> str | None:
         return self._device.attribute.get("unit_of_measurement", None)
+
+
+class KocomLatencySensor(KocomGatewayEntity, SensorEntity):
+    """95th percentile latency of one RX/TX stage over the rolling window."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 3
+    _attr_translation_key = "latency"
+
+    def __init__(self, gateway: KocomGateway, stage: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(gateway, f"latency_{stage}")
+        self._stage = stage
+        self._attr_translation_placeholders = {"stage": stage}
+
+    @property
+    def native_value(self) -> float | None:
+        return self.gateway.latency.stage(self._stage).get("p95_ms")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self.gateway.latency.stage(self._stage)
+
+
+class KocomBusSensor(KocomGatewayEntity, SensorEntity):
+    """One bus utilization or health counter of the gateway."""
+
+    def __init__(
+        self,
+        gateway: KocomGateway,
+        metric: str,
+        translation_key: str,
+        unit: str | None,
+        device_class: SensorDeviceClass | None,
+        state_class: SensorStateClass,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(gateway, f"bus_{metric}")
+        self._metric = metric
+        self._attr_translation_key = translation_key
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self) -> float | int | None:
+        # 같은 주기에 폴링되는 센서들은 하나의 스냅샷을 공유
+        return self.gateway.bus_health().get(self._metric)
@@ -0,0 +1,70 @@
+"""Services for Kocom Wallpad."""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import ATTR_FILENAME, CAPTURE_DIR, DOMAIN, LOGGER, SERVICE_DUMP_CAPTURE
+
+DUMP_CAPTURE_SCHEMA = vol.Schema({vol.Optional(ATTR_FILENAME): cv.string})
+
+
+def _write_file(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fp:
+        fp.write(data)
+
+
+async def _async_dump_capture(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Write the raw frame capture of every gateway to the config directory."""
+    gateways = hass.data.get(DOMAIN, {})
+    if not gateways:
+        raise HomeAssistantError("No Kocom Wallpad gateway is loaded")
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # 설정 디렉터리 밖으로 나가지 않도록 파일 이름만 사용
+    name = os.path.basename(call.data.get(ATTR_FILENAME) or f"capture_{stamp}.kcap")
+    files = []
+    for index, gateway in enumerate(gateways.values()):
+        # 루프 안에서 한 번에 복사하고 파일 쓰기는 executor 에서
+        data = gateway.dump_capture()
+        frames = len(gateway.capture)
+        file_name = name if index == 0 else f"{index}_{name}"
+        path = hass.config.path(CAPTURE_DIR, file_name)
+        try:
+            await hass.async_add_executor_job(_write_file, path, data)
+        except OSError as e:
+            raise HomeAssistantError(f"Failed to write capture to {path}: {e}") from e
+        LOGGER.info("Wrote %d captured frames to %s", frames, path)
+        files.append({"path": path, "frames": frames})
+    return {"files": files}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services (once for all entries)."""
+    if hass.services.has_service(DOMAIN, SERVICE_DUMP_CAPTURE):
+        return
+
+    async def _dump_capture(call: ServiceCall) -> ServiceResponse:
+        return await _async_dump_capture(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_CAPTURE,
+        _dump_capture,
+        schema=DUMP_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services when the last entry is unloaded."""
+    if not hass.data.get(DOMAIN):
+        hass.services.async_remove(DOMAIN, SERVICE_DUMP_CAPTURE)
@@ -0,0 +1,66 @@
+"""Persistent device snapshot for Kocom Wallpad."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, PACKET_LEN, SNAPSHOT_VERSION, SNAPSHOT_SAVE_DELAY
+
+
+def encode_snapshot(
+    packets: Iterable[bytes], registered: Iterable[str], device_storage: dict[str, Any]
+) -> dict[str, Any]:
+    """Build the stored form: all packets as one hex string, oldest first."""
+    return {
+        "packets": b"".join(packets).hex(),
+        "registered": sorted(registered),
+        "device_storage": device_storage,
+    }
+
+
+def decode_packets(data: dict[str, Any]) -> list[bytes]:
+    raw = bytes.fromhex(data.get("packets", ""))
+    return [raw[i:i + PACKET_LEN] for i in range(0, len(raw) - PACKET_LEN + 1, PACKET_LEN)]
+
+
+class SnapshotStore:
+    """Last frame per peer and command, registered devices and controller storage.
+
+    One file per config entry, loaded in a single read at startup and written
+    at most SNAPSHOT_SAVE_DELAY seconds after the first change while the
+    gateway runs.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._save_pending = False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        return await self._store.async_load()
+
+    def async_schedule_save(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        # async_delay_save 는 호출마다 타이머를 다시 시작하므로, 자주 바뀌는 값이
+        # 있으면 저장이 계속 밀림. 대기 중인 저장이 없을 때만 예약해 지연 상한을 둠
+        if self._save_pending:
+            return
+        self._save_pending = True
+
+        def _data() -> dict[str, Any]:
+            # 실제로 쓰는 시점에 호출됨: 이후의 변경은 새 저장을 예약
+            self._save_pending = False
+            return data_func()
+
+        self._store.async_delay_save(_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        self._save_pending = False
+        await self._store.async_save(data)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
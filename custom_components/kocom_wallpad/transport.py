@@ -3,118 +3,238 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 import asyncio
+import contextlib
+import random
 import serial_asyncio
 import time
 
 from .const import LOGGER
 
 
+class IdleGate:
+    """Tracks line activity and wakes waiters once the line has gone quiet.
+
+    A waiter arms a single loop timer at `last activity + gap`; when it fires
+    and new activity moved the timestamp, the timer is simply re-armed.
+    """
+
+    __slots__ = ("last_activity",)
+
+    def __init__(self) -> None:
+        self.last_activity: float = time.monotonic()
+
+    def touch(self) -> None:
+        self.last_activity = time.monotonic()
+
+    def idle_since(self) -> float:
+        return max(0.0, time.monotonic() - self.last_activity)
+
+    async def wait(self, gap: float, timeout: float | None = None) -> bool:
+        """Wait until the line was idle for `gap` seconds; False on timeout."""
+        now = time.monotonic()
+        if now - self.last_activity >= gap:
+            return True
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[bool] = loop.create_future()
+        deadline = None if timeout is None else now + timeout
+        handle: asyncio.TimerHandle | None = None
+
+        def _check() -> None:
+            nonlocal handle
+            if fut.done():
+                return
+            now = time.monotonic()
+            ready_at = self.last_activity + gap
+            if now >= ready_at:
+                fut.set_result(True)
+                return
+            if deadline is not None and now >= deadline:
+                fut.set_result(False)
+                return
+            at = ready_at if deadline is None else min(ready_at, deadline)
+            handle = loop.call_later(at - now, _check)
+
+        _check()
+        try:
+            return await fut
+        finally:
+            if handle is not None:
+                handle.cancel()
+
+
+class _KocomProtocol(asyncio.Protocol):
+    """asyncio protocol that hands received bytes to the connection."""
+
+    def __init__(self, conn: AsyncConnection) -> None:
+        self._conn = conn
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._conn._on_connection_made(self, transport)
+
+    def data_received(self, data: bytes) -> None:
+        self._conn._on_data(data)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._conn._on_connection_lost(self, exc)
+
+
 @dataclass
 class AsyncConnection:
-    """Async Connection."""
+    """Async Connection.
+
+    `start()` launches a supervisor task that owns the connect/backoff loop:
+    it connects, waits until the link drops, backs off with jitter and tries
+    again. Nothing else reconnects; callers wait on `wait_connected()`.
+    """
     host: str
     port: Optional[int]
     serial_baud: int = 9600
     connect_timeout: float = 5.0
     reconnect_backoff: Tuple[float, float] = (1.0, 30.0)  # min, max seconds
+    reconnect_jitter: float = 0.2  # 지연의 ±20% 무작위화
+    on_data: Optional[Callable[[bytes], None]] = None
 
     def __post_init__(self) -> None:
         """Initialize the connection."""
-        self._reader: Optional[asyncio.StreamReader] = None
-        self._writer: Optional[asyncio.StreamWriter] = None
-        self._last_activity_mono: float = time.monotonic()
-        self._last_reconn_delay: float = 0.0
-        self._connected = True
-
-    async def open(self) -> None:
+        self._transport: Optional[asyncio.Transport] = None
+        self._protocol: Optional[_KocomProtocol] = None
+        self.idle_gate = IdleGate()
+        self._link_up = asyncio.Event()
+        self._link_lost = asyncio.Event()
+        self._closing = False
+        self._supervisor: Optional[asyncio.Task] = None
+        self.rx_events = 0  # data_received 호출 횟수 (= RX 로 인한 wakeup)
+        self.connects = 0
+        self.reconnects = 0
+
+    def start(self) -> None:
+        """Start the supervisor; returns immediately."""
+        self._closing = False
+        if self._supervisor is None or self._supervisor.done():
+            self._supervisor = asyncio.get_running_loop().create_task(self._supervise())
+
+    async def _supervise(self) -> None:
+        delay_min, delay_max = self.reconnect_backoff
+        delay = delay_min
+        while not self._closing:
+            if await self.open():
+                delay = delay_min
+                await self._link_lost.wait()
+                if self._closing:
+                    break
+                self.reconnects += 1
+                wait = delay_min
+            else:
+                wait = delay
+                delay = min(delay * 2, delay_max)
+            wait *= random.uniform(1 - self.reconnect_jitter, 1 + self.reconnect_jitter)
+            LOGGER.info("Reconnecting in %.1f sec...", wait)
+            await asyncio.sleep(wait)
+
+    async def open(self) -> bool:
+        """Make one connection attempt; True once the link is up."""
+        loop = asyncio.get_running_loop()
+        self._link_lost.clear()
         try:
             if self.port is None:
-                self._reader, self._writer = await serial_asyncio.open_serial_connection(
-                    url=self.host, baudrate=self.serial_baud
+                await asyncio.wait_for(
+                    serial_asyncio.create_serial_connection(
+                        loop, lambda: _KocomProtocol(self), self.host, baudrate=self.serial_baud
+                    ),
+                    timeout=self.connect_timeout,
                 )
                 LOGGER.info("Connection opened for serial: %s", self.host)
             else:
-                self._reader, self._writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.host, self.port),
+                await asyncio.wait_for(
+                    loop.create_connection(lambda: _KocomProtocol(self), self.host, self.port),
                     timeout=self.connect_timeout,
                 )
                 LOGGER.info("Connection opened for socket: %s:%s", self.host, self.port)
-            self._connected = True
-            self._touch()
         except Exception as e:
             LOGGER.warning("Connection open failed: %r", e)
-            await self.reconnect()
+            return False
+        if self._transport is None:
+            # 연결 직후 끊긴 경우
+            return False
+        self.connects += 1
+        self._touch()
+        self._link_up.set()
+        return True
 
     async def close(self) -> None:
-        if self._writer is not None:
+        self._closing = True
+        self._link_lost.set()
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._supervisor
+            self._supervisor = None
+        if self._transport is not None:
             LOGGER.info("Closing connection")
-            self._writer.close()
-            try:
-                await self._writer.wait_closed()
-            except Exception:
-                pass
-            finally:
-                self._writer = None
-        self._reader = None
-        self._connected = False
+            self._transport.close()
+            self._transport = None
+        self._protocol = None
+        self._link_up.clear()
 
     def _is_connected(self) -> bool:
-        return self._connected
+        return self._link_up.is_set()
+
+    async def wait_connected(self, timeout: float | None = None) -> bool:
+        """Wait until the link is up; False on timeout."""
+        if self._link_up.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._link_up.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
     def _touch(self) -> None:
-        self._last_activity_mono = time.monotonic()
+        self.idle_gate.touch()
 
     def idle_since(self) -> float:
-        return max(0.0, time.monotonic() - self._last_activity_mono)
+        return self.idle_gate.idle_since()
+
+    def _on_connection_made(self, protocol: _KocomProtocol, transport: asyncio.BaseTransport) -> None:
+        self._protocol = protocol
+        self._transport = transport  # type: ignore[assignment]
+
+    def _on_data(self, data: bytes) -> None:
+        self.idle_gate.touch()
+        self.rx_events += 1
+        if self.on_data is not None:
+            self.on_data(data)
+
+    def _on_connection_lost(self, protocol: _KocomProtocol, exc: Exception | None) -> None:
+        if protocol is not self._protocol:
+            return
+        self._transport = None
+        self._protocol = None
+        self._link_up.clear()
+        if not self._closing:
+            LOGGER.warning("Connection lost: %r", exc)
+        self._link_lost.set()
+
+    def _drop(self) -> None:
+        """Close a broken link; the supervisor takes it from there."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        self._protocol = None
+        self._link_up.clear()
+        self._link_lost.set()
 
     async def send(self, data: bytes) -> int:
-        if not self._writer:
+        if self._transport is None:
             raise RuntimeError("connection not open")
         try:
             LOGGER.debug("Sending: %s", data.hex())
-            self._writer.write(data)
-            await self._writer.drain()
+            self._transport.write(data)
             self._touch()
             return len(data)
         except Exception as e:
             LOGGER.warning("Send failed: %r", e)
-            await self.reconnect()
+            self._drop()
             return 0
-
-    async def recv(self, nbytes: int, timeout: float = 0.05) -> bytes:
-        if not self._reader:
-            raise RuntimeError("connection not open")
-        try:
-            chunk = await asyncio.wait_for(self._reader.read(nbytes), timeout=timeout)
-        except asyncio.TimeoutError:
-            return b""
-        except Exception as e:
-            LOGGER.warning("Recv failed: %r", e)
-            await self.reconnect()
-            return b""
-        if chunk:
-            self._touch()
-        return chunk
-
-    async def reconnect(self) -> None:
-        self._connected = False
-        delay_min, delay_max = self.reconnect_backoff
-        if self._last_reconn_delay > 0.0:
-            delay = self._last_reconn_delay
-        else:
-            delay = delay_min
-
-        if self._writer is not None:
-            self._writer.close()
-            await self._writer.wait_closed()
-        
-        LOGGER.info("Connection lost. Reconnecting in %.1f sec...", delay)
-        await asyncio.sleep(delay)
-        self._last_reconn_delay = min(delay * 2, delay_max)
-        await self.open()
-
-        if self._is_connected():
-            LOGGER.info("Connection reconnected")
-            self._last_reconn_delay = delay_min